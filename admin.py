@@ -1,14 +1,26 @@
-from telegram import Update
+from telegram import Update, InlineQueryResultArticle, InputTextMessageContent
 from telegram.ext import ConversationHandler, ContextTypes
 import strings
 import keyboards
 import states
 import handlers
 from database import db
+import workers
 import logging
+import hashlib
+import os
+import export
+import importer
+import tempfile
+import schema
+from lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
+def escape_md(text):
+    """Escape special characters for Telegram Markdown (Legacy)"""
+    return str(text).replace('_', '\\_').replace('*', '\\*').replace('`', '\\`').replace('[', '\\[')
+
 # Helper to get lang (Admins might use local too)
 def get_user_lang(context: ContextTypes.DEFAULT_TYPE):
     return context.user_data.get('lang', strings.DEFAULT_LANG)
@@ -31,9 +43,25 @@ async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
     try:
         data = db.get_stats()
+        
+        programs = "\n".join(f"• {escape_md(prog.title())}: *{count}*" for prog, count in data['programs']) or "-"
+        
+        # Simple bar chart, scaled to the busiest week shown
+        peak = max([count for _, count in data['weekly']] + [1])
+        trend = "\n".join(
+            f"`{week.strftime('%d/%m')}` {'▇' * round(8 * count / peak) or '·'} {count}"
+            for week, count in data['weekly']
+        )
+        
         await update.message.reply_text(
             strings.get('ADMIN_STATS', lang).format(
-                total=data['total']
+                total=data['total'],
+                verified=data['verified'],
+                pending=data['pending'],
+                rejected=data['rejected'],
+                today=data['today'],
+                programs=programs,
+                trend=trend
             ), 
             parse_mode="Markdown",
             reply_markup=keyboards.get_admin_menu(lang)
@@ -75,30 +103,34 @@ async def back(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     return states.ADMIN_MANAGE
 
 # --- LIST MEMBERS ---
+MEMBERS_PAGE_SIZE = 15
+
+def render_member_page(page, lang):
+    """(text, inline pager) for one db.page_members() result."""
+    items = []
+    for i, row in enumerate(page["rows"], page["start"]):
+        # row[2]=Name, row[3]=Matric
+        name = row[2] if len(row) > 2 else "Unknown"
+        matric = row[3] if len(row) > 3 else "Unknown"
+        items.append(f"{i}. *{escape_md(name)}* (`{escape_md(matric)}`)")
+
+    text = strings.get('ADMIN_LIST_HEADER', lang).format(
+        start=page["start"], end=page["start"] + len(items) - 1, total=page["total"], items="\n\n".join(items)
+    )
+    return text, keyboards.get_pager("members", page["prev"], page["next"], lang)
+
 async def list_members(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
     loading = await update.message.reply_text(strings.get('ADMIN_SEARCHING', lang))
     
     try:
-        members = db.get_members(limit=30) # Safe limit for message size
+        page = await workers.sheets_read.run(db.page_members, None, MEMBERS_PAGE_SIZE)
         
-        if not members:
+        if not page["rows"]:
             await loading.edit_text(strings.get('ADMIN_LIST_EMPTY', lang), parse_mode="Markdown")
         else:
-            items = []
-            def esc(t): return str(t).replace('_', '\\_').replace('*', '\\*').replace('`', '\\`').replace('[', '\\[')
-            for i, row in enumerate(members, 1):
-                # row[2]=Name, row[3]=Matric
-                name = row[2] if len(row) > 2 else "Unknown"
-                matric = row[3] if len(row) > 3 else "Unknown"
-                items.append(f"{i}. *{esc(name)}* (`{esc(matric)}`)")
-            
-            msg_text = strings.get('ADMIN_LIST_HEADER', lang).format(limit=len(members), items="\n\n".join(items))
-            await loading.edit_text(msg_text, parse_mode="Markdown")
-
-    except Exception as e:
-        logger.error(e)
-        await loading.edit_text(strings.get('ERR_DB_CONNECTION', lang))
+            text, pager = render_member_page(page, lang)
+            await loading.edit_text(text, parse_mode="Markdown", reply_markup=pager)
 
     except Exception as e:
         logger.error(e)
@@ -106,6 +138,27 @@ async def list_members(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
     return states.ADMIN_MANAGE
 
+async def list_members_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Inline Prev/Next on the member list: edits the same message in place."""
+    query = update.callback_query
+    if not db.is_admin(update.effective_user.id):
+        await query.answer()
+        return
+    
+    lang = get_user_lang(context)
+    try:
+        _, direction, cursor = query.data.split(":")
+        page = await workers.sheets_read.run(db.page_members, int(cursor), MEMBERS_PAGE_SIZE, direction)
+        if not page["rows"]:
+            await query.answer(strings.get('ADMIN_LIST_EMPTY', lang))
+            return
+        await query.answer()
+        text, pager = render_member_page(page, lang)
+        await query.edit_message_text(text, parse_mode="Markdown", reply_markup=pager)
+    except Exception as e:
+        logger.error(f"Member Page Error: {e}")
+        await query.answer(strings.get('ERR_DB_CONNECTION', lang))
+
 # --- SEARCH MEMBERS ---
 async def search_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
@@ -127,6 +180,8 @@ async def receive_search_mode(update: Update, context: ContextTypes.DEFAULT_TYPE
     mode = "simple"
     if text in strings.get_all('BTN_SEARCH_DETAIL'):
         mode = "detail"
+    elif text in strings.get_all('BTN_SEARCH_FUZZY'):
+        mode = "fuzzy"
     elif text in strings.get_all('BTN_SEARCH_SIMPLE'):
         mode = "simple"
     else:
@@ -147,6 +202,111 @@ async def receive_search_mode(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
     return states.SEARCH_QUERY
 
+# Search sessions: results of one (query, cache version) kept for paging, shared by admins
+SEARCH_PAGE_SIZE = {"simple": 20, "detail": 5, "fuzzy": 20}
+SEARCH_SESSIONS = LRUCache(maxsize=64, ttl=15 * 60)
+
+def search_session(query, mode="simple"):
+    """Returns (token, results, scores), reusing cached results while the student cache
+    is unchanged. scores is None except for fuzzy mode. Blocking."""
+    db.refresh_student_cache()
+    kind = "fuzzy" if mode == "fuzzy" else "substring"
+    token = hashlib.sha1(f"{kind}\0{query.lower()}\0{db.student_version}".encode()).hexdigest()[:12]
+    session = SEARCH_SESSIONS.get(token)
+    if session is None:
+        if kind == "fuzzy":
+            ranked = db.fuzzy_search(query)
+            session = (query, [row for _, row in ranked], [score for score, _ in ranked])
+        else:
+            session = (query, db.search_members(query), None)
+        SEARCH_SESSIONS.put(token, session)
+    return token, session[1], session[2]
+
+def format_search_card(i, row, mode, score=None):
+    # row indexes: A=0, B=1, ...
+    # C=2 (Name), D=3 (Matric), E=4 (Prog), I=8 (USAS Email), J=9 (IC), N=13 (Date), P=15 (ID), Q=16 (Receipt), R=17 (Status)
+
+    name = row[2] if len(row) > 2 else "-"
+    matric = row[3] if len(row) > 3 else "-"
+
+    if mode in ('simple', 'fuzzy'):
+        prog = row[4] if len(row) > 4 else "-"
+        mem_id = row[15] if len(row) > 15 else "-" # P=15 is Membership ID
+
+        simple_card = (
+            f"{i}.\n"
+            f"🔑 ID: `{escape_md(mem_id)}`\n"
+            f"👤 *{escape_md(name)}*\n"
+            f"🆔 `{escape_md(matric)}`\n"
+            f"🎓 {escape_md(prog)}"
+        )
+        if score is not None:
+            simple_card += f"\n🎯 {score:.0%}" # Fuzzy match score
+        return simple_card
+    else:
+        def safe_get(idx): return escape_md(row[idx] if len(row) > idx else "-")
+
+        # Special handler for Receipt URL (Col S - Index 18)
+        raw_receipt = row[18] if len(row) > 18 else "-"
+        receipt_display = f"[Download PDF]({raw_receipt})" if raw_receipt.startswith("http") else escape_md(raw_receipt)
+
+        # Special handler for Proof URL (Col Q - Index 16)
+        # Convert drive 'open' links to 'download' links for better UX
+        raw_proof = row[16] if len(row) > 16 else "-"
+        if "drive.google.com" in raw_proof and "id=" in raw_proof:
+            raw_proof = raw_proof.replace("open?", "uc?export=download&")
+
+        proof_display = f"[Proof PDF]({raw_proof})" if raw_proof.startswith("http") else escape_md(raw_proof)
+
+        detail_card = (
+            f"👤 *{safe_get(2)}*\n" # C Name
+            f"🆔 `{safe_get(3)}`\n" # D Matric
+            f"🎓 Prog: {safe_get(4)} | Sem: {safe_get(5)}\n" # E, F
+            f"📞 {safe_get(6)}\n" # G Phone
+            f"📧 {safe_get(7)}\n" # H Personal Email
+            f"🏫 {safe_get(8)}\n" # I USAS Email
+            f"🪪 IC: {safe_get(9)}\n" # J IC
+            f"🎂 {safe_get(10)} ({safe_get(11)})\n" # K Birthday, L Place
+            f"🏠 {safe_get(12)}\n" # M Address
+            f"📅 Entry: {safe_get(13)}\n" # N Date Entry
+            f"⏱️ Min: {safe_get(14)}\n" # O Minute
+            f"🔑 ID: `{safe_get(15)}`\n" # P Membership ID
+            f"📄 Proof: {proof_display}\n" # Q Receipt Proof (Index 16)
+            f"🧾 Invoice: `{safe_get(19)}`\n" # T Invoice No (Index 19)
+            f"📎 Receipt: {receipt_display}\n" # S Receipt URL (Index 18)
+            f"✅ Status: {safe_get(17)}\n" # R Status
+        )
+        return detail_card
+
+def render_search_page(token, query, results, scores, mode, page, lang, rows=None):
+    """(text, inline pager) for one page of a search session.
+    rows: this page's rows when they differ from the cached results (see detail_rows)."""
+    size = SEARCH_PAGE_SIZE[mode]
+    start = page * size
+    chunk = results[start:start + size] if rows is None else rows
+    items = [
+        format_search_card(i, row, mode, scores[i - 1] if scores else None)
+        for i, row in enumerate(chunk, start + 1)
+    ]
+    text = strings.get('ADMIN_SEARCH_RESULT', lang).format(
+        mode=mode.upper(), query=query, start=start + 1, end=start + len(chunk), total=len(results), items="\n\n".join(items)
+    )
+    pager = keyboards.get_pager(
+        f"search:{token}:{mode[0]}",
+        page - 1 if page > 0 else None,
+        page + 1 if start + size < len(results) else None,
+        lang
+    )
+    return text, pager
+
+async def detail_rows(results, mode, page):
+    """Detail cards show every column, but the cache only holds the hot ones:
+    reads the page's full rows (1 call). None for the other modes."""
+    if mode != "detail":
+        return None
+    size = SEARCH_PAGE_SIZE[mode]
+    return await workers.sheets_read.run(db.member_details, results[page * size:(page + 1) * size])
+
 async def search_perform(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
     query = update.message.text.strip()
@@ -158,79 +318,15 @@ async def search_perform(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     loading = await update.message.reply_text(strings.get('ADMIN_SEARCHING', lang))
 
     try:
-        results = db.search_members(query)
+        pool = workers.cpu if mode == "fuzzy" else workers.sheets_read # Index builds are CPU work
+        token, results, scores = await pool.run(search_session, query, mode)
         
         if not results:
             await loading.edit_text(strings.get('ADMIN_SEARCH_EMPTY', lang).format(query=query), parse_mode="Markdown")
         else:
-            items = []
-            limit = 20 if mode == 'simple' else 5
-            
-            for i, row in enumerate(results[:limit], 1):
-                # row indexes: A=0, B=1, ...
-                # C=2 (Name), D=3 (Matric), E=4 (Prog), I=8 (USAS Email), J=9 (IC), N=13 (Date), P=15 (ID), Q=16 (Receipt), R=17 (Status)
-                
-                name = row[2] if len(row) > 2 else "-"
-                matric = row[3] if len(row) > 3 else "-"
-                
-                if mode == 'simple':
-                    prog = row[4] if len(row) > 4 else "-"
-                    mem_id = row[15] if len(row) > 15 else "-" # P=15 is Membership ID
-                    
-                    # Local escape helper (duplicated for scope safety or move it up - moving it up is better but hard with replace tool constraints)
-                    # Use simple replace here since function is defined lower down
-                    def esc(t): return str(t).replace('_', '\\_').replace('*', '\\*').replace('`', '\\`').replace('[', '\\[')
-
-                    simple_card = (
-                        f"{i}.\n"
-                        f"🔑 ID: `{esc(mem_id)}`\n"
-                        f"👤 *{esc(name)}*\n"
-                        f"🆔 `{esc(matric)}`\n"
-                        f"🎓 {esc(prog)}"
-                    )
-                    items.append(simple_card)
-                else:
-
-                    def escape_md(text):
-                        """Escape special characters for Telegram Markdown (Legacy)"""
-                        return str(text).replace('_', '\\_').replace('*', '\\*').replace('`', '\\`').replace('[', '\\[')
-
-                    def safe_get(idx): return escape_md(row[idx] if len(row) > idx else "-")
-                    
-                    # Special handler for Receipt URL (Col S - Index 18)
-                    raw_receipt = row[18] if len(row) > 18 else "-"
-                    receipt_display = f"[Download PDF]({raw_receipt})" if raw_receipt.startswith("http") else escape_md(raw_receipt)
-
-                    # Special handler for Proof URL (Col Q - Index 16)
-                    # Convert drive 'open' links to 'download' links for better UX
-                    raw_proof = row[16] if len(row) > 16 else "-"
-                    if "drive.google.com" in raw_proof and "id=" in raw_proof:
-                        raw_proof = raw_proof.replace("open?", "uc?export=download&")
-                    
-                    proof_display = f"[Proof PDF]({raw_proof})" if raw_proof.startswith("http") else escape_md(raw_proof)
-
-                    detail_card = (
-                        f"👤 *{safe_get(2)}*\n" # C Name
-                        f"🆔 `{safe_get(3)}`\n" # D Matric
-                        f"🎓 Prog: {safe_get(4)} | Sem: {safe_get(5)}\n" # E, F
-                        f"📞 {safe_get(6)}\n" # G Phone
-                        f"📧 {safe_get(7)}\n" # H Personal Email
-                        f"🏫 {safe_get(8)}\n" # I USAS Email
-                        f"🪪 IC: {safe_get(9)}\n" # J IC
-                        f"🎂 {safe_get(10)} ({safe_get(11)})\n" # K Birthday, L Place
-                        f"🏠 {safe_get(12)}\n" # M Address
-                        f"📅 Entry: {safe_get(13)}\n" # N Date Entry
-                        f"⏱️ Min: {safe_get(14)}\n" # O Minute
-                        f"🔑 ID: `{safe_get(15)}`\n" # P Membership ID
-                        f"📄 Proof: {proof_display}\n" # Q Receipt Proof (Index 16)
-                        f"🧾 Invoice: `{safe_get(19)}`\n" # T Invoice No (Index 19)
-                        f"📎 Receipt: {receipt_display}\n" # S Receipt URL (Index 18)
-                        f"✅ Status: {safe_get(17)}\n" # R Status
-                    )
-                    items.append(detail_card)
-
-            msg_text = strings.get('ADMIN_SEARCH_RESULT', lang).format(mode=mode.upper(), query=query, items="\n\n".join(items))
-            await loading.edit_text(msg_text, parse_mode="Markdown")
+            rows = await detail_rows(results, mode, 0)
+            text, pager = render_search_page(token, query, results, scores, mode, 0, lang, rows)
+            await loading.edit_text(text, parse_mode="Markdown", reply_markup=pager)
 
     except Exception as e:
         logger.error(e)
@@ -239,8 +335,233 @@ async def search_perform(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(strings.get('BTN_ADMIN_MANAGE', lang), reply_markup=keyboards.get_admin_manage_menu(lang))
     return states.ADMIN_MANAGE
 
+async def search_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Inline Prev/Next on search results: pages the cached session, no new search."""
+    query = update.callback_query
+    if not db.is_admin(update.effective_user.id):
+        await query.answer()
+        return
+    
+    lang = get_user_lang(context)
+    _, token, mode_key, _, page = query.data.split(":")
+    session = SEARCH_SESSIONS.get(token)
+    if session is None:
+        await query.answer(strings.get('ADMIN_SEARCH_EXPIRED', lang), show_alert=True)
+        return
+    
+    await query.answer()
+    mode = {"d": "detail", "f": "fuzzy"}.get(mode_key, "simple")
+    rows = await detail_rows(session[1], mode, int(page))
+    text, pager = render_search_page(token, session[0], session[1], session[2], mode, int(page), lang, rows)
+    try:
+        await query.edit_message_text(text, parse_mode="Markdown", reply_markup=pager)
+    except Exception as e:
+        logger.error(f"Search Page Error: {e}")
+
 
 
+
+# --- INLINE LOOKUP (@bot I2406 / @bot ahmad zul) ---
+INLINE_LIMIT = 20
+
+async def inline_lookup(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin-only inline query: live member cards from the in-memory prefix index (no Sheets I/O)."""
+    inline = update.inline_query
+    if not db.is_admin(inline.from_user.id):
+        await inline.answer([], cache_time=300, is_personal=True)
+        return
+    
+    query = inline.query.strip()
+    if not query:
+        await inline.answer([], cache_time=0, is_personal=True)
+        return
+    
+    try:
+        index = await workers.cpu.run(db.search_index, False) # Reuses the built index; rebuilds only if stale
+        rows = index.prefix(query, INLINE_LIMIT)
+    except Exception as e:
+        logger.error(f"Inline Lookup Error: {e}")
+        rows = []
+    
+    results = []
+    for row in rows:
+        name = row[2] if len(row) > 2 else "-"
+        matric = row[3] if len(row) > 3 else "-"
+        prog = row[4] if len(row) > 4 else "-"
+        mem_id = row[15] if len(row) > 15 else "-"
+        status = row[17] if len(row) > 17 and row[17] else "Pending"
+        card = (
+            f"👤 *{escape_md(name)}*\n"
+            f"🆔 `{escape_md(matric)}`\n"
+            f"🎓 {escape_md(prog)}\n"
+            f"🔑 ID: `{escape_md(mem_id)}`\n"
+            f"✅ Status: {escape_md(status)}"
+        )
+        results.append(InlineQueryResultArticle(
+            id=hashlib.sha1(matric.encode()).hexdigest()[:16],
+            title=f"{name} ({matric})",
+            description=f"{prog} | {status}",
+            input_message_content=InputTextMessageContent(card, parse_mode="Markdown"),
+        ))
+    # Personal + short cache: results depend on the admin and on live data
+    await inline.answer(results, cache_time=5, is_personal=True)
+
+# --- REVIEW QUEUE (bulk approve / reject) ---
+REVIEW_PAGE_SIZE = 8
+REVIEW_STATUS = {"A": schema.APPROVED, "R": schema.REJECTED}
+
+def render_review(review, lang):
+    queue, marks = review["queue"], review["marks"]
+    pages = max(1, -(-len(queue) // REVIEW_PAGE_SIZE))
+    page = min(review["page"], pages - 1)
+    start = page * REVIEW_PAGE_SIZE
+    items = [(pos, mat, name) for pos, (mat, name) in enumerate(queue[start:start + REVIEW_PAGE_SIZE], start)]
+    marked = list(marks.values())
+    text = strings.get('ADMIN_REVIEW_HEADER', lang).format(
+        total=len(queue), page=page + 1, pages=pages, approve=marked.count("A"), reject=marked.count("R")
+    )
+    return text, keyboards.get_review_menu(items, marks, page, pages, lang)
+
+async def review_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Opens the review queue (cached Pending members) as one inline message."""
+    lang = get_user_lang(context)
+    try:
+        pending = await workers.sheets_read.run(db.pending_members)
+    except Exception as e:
+        logger.error(f"Review Load Error: {e}")
+        await update.message.reply_text(strings.get('ERR_DB_CONNECTION', lang))
+        return states.ADMIN_MENU
+    
+    if not pending:
+        await update.message.reply_text(strings.get('ADMIN_REVIEW_EMPTY', lang))
+        return states.ADMIN_MENU
+    
+    review = {"queue": [(mat, schema.cell(row, schema.COL_NAME) or "-") for mat, row in pending], "marks": {}, "page": 0}
+    context.user_data['review'] = review
+    text, markup = render_review(review, lang)
+    await update.message.reply_text(text, parse_mode="Markdown", reply_markup=markup)
+    return states.ADMIN_MENU
+
+async def review_action(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """review:t:<pos> toggle | review:all:A|R mark page | review:p:<page> | review:commit | review:cancel"""
+    query = update.callback_query
+    if not db.is_admin(update.effective_user.id):
+        await query.answer()
+        return
+    
+    lang = get_user_lang(context)
+    review = context.user_data.get('review')
+    if not review:
+        await query.answer(strings.get('ADMIN_REVIEW_EXPIRED', lang), show_alert=True)
+        return
+    
+    parts = query.data.split(":")
+    action, marks, queue = parts[1], review["marks"], review["queue"]
+    
+    if action == "cancel":
+        context.user_data.pop('review', None)
+        await query.answer()
+        await query.edit_message_text(strings.get('ADMIN_REVIEW_CANCELLED', lang))
+        return
+    
+    if action == "commit":
+        if not marks:
+            await query.answer(strings.get('ADMIN_REVIEW_NOTHING', lang))
+            return
+        await query.answer()
+        decisions = {mat: REVIEW_STATUS[mark] for mat, mark in marks.items()}
+        written = await workers.sheets_write.run(db.set_statuses, decisions)
+        if not written:
+            await query.edit_message_text(strings.get('ERR_DB_CONNECTION', lang))
+            return
+        context.user_data.pop('review', None)
+        approved = sum(1 for m in marks.values() if m == "A")
+        await query.edit_message_text(
+            strings.get('ADMIN_REVIEW_DONE', lang).format(approved=approved, rejected=len(marks) - approved),
+            parse_mode="Markdown"
+        )
+        db.log_action(update.effective_user.first_name, "REVIEW", f"Approved {approved}, Rejected {len(marks) - approved} ({written} rows)")
+        return
+    
+    if action == "t":
+        pos = int(parts[2])
+        if pos < len(queue):
+            mat = queue[pos][0]
+            nxt = {None: "A", "A": "R"}.get(marks.get(mat)) # ✅ -> 🚫 -> unmarked
+            if nxt: marks[mat] = nxt
+            else: marks.pop(mat, None)
+    elif action == "all":
+        start = review["page"] * REVIEW_PAGE_SIZE
+        for mat, _ in queue[start:start + REVIEW_PAGE_SIZE]:
+            marks[mat] = parts[2]
+    elif action == "p":
+        review["page"] = int(parts[2])
+    
+    await query.answer()
+    text, markup = render_review(review, lang)
+    try:
+        await query.edit_message_text(text, parse_mode="Markdown", reply_markup=markup)
+    except Exception as e:
+        logger.error(f"Review Render Error: {e}")
+
+# --- EXPORT (/export [csv|xlsx] [approved|pending|rejected] [full] [program]) ---
+EXPORT_STATUSES = {"approved": schema.APPROVED, "pending": schema.PENDING, "rejected": schema.REJECTED}
+
+def parse_export_args(args):
+    """(fmt, status, program, full) from command words in any order; leftover words = program filter.
+    `full` opts in to every column (read from the sheet in chunks) instead of the cached ones."""
+    fmt, status, program, full = "csv", None, [], False
+    for word in args:
+        low = word.lower()
+        if low in export.FORMATS:
+            fmt = low
+        elif low in EXPORT_STATUSES:
+            status = EXPORT_STATUSES[low]
+        elif low == "full":
+            full = True
+        else:
+            program.append(word)
+    return fmt, status, " ".join(program) or None, full
+
+async def export_members(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Sends the member list as a CSV/XLSX document, built off the event loop.
+    Cached columns by default (no Sheets read); `full` reads every column in chunks."""
+    user = update.effective_user
+    if not db.is_admin(user.id):
+        return
+    
+    lang = get_user_lang(context)
+    fmt, status, program, full = parse_export_args(context.args or [])
+    loading = await update.message.reply_text(strings.get('ADMIN_EXPORT_WORKING', lang))
+    
+    path = None
+    try:
+        students = db.student_cache
+        if full: # Reads the sheet as it goes, so it runs on the Sheets pool
+            path, filename, count = await workers.sheets_read.run(export.build_export, students, fmt, status, program, db.iter_full_rows)
+        else:
+            path, filename, count = await workers.cpu.run(export.build_export, students, fmt, status, program)
+        if not count:
+            await loading.edit_text(strings.get('ADMIN_EXPORT_EMPTY', lang))
+            return
+        
+        with open(path, "rb") as f:
+            await context.bot.send_document(
+                chat_id=update.effective_chat.id,
+                document=f,
+                filename=filename,
+                caption=strings.get('ADMIN_EXPORT_DONE', lang).format(count=count),
+                read_timeout=120, write_timeout=120
+            )
+        await loading.delete()
+        db.log_action(user.first_name, "EXPORT", f"{filename} ({count} rows)")
+    except Exception as e:
+        logger.error(f"Export Error: {e}")
+        await loading.edit_text(strings.get('ERR_DB_CONNECTION', lang))
+    finally:
+        if path and os.path.exists(path):
+            os.remove(path)
+
 # --- DELETE MEMBER FLOW ---
 async def del_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
@@ -255,10 +576,10 @@ async def del_matric(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     loading = await update.message.reply_text(strings.get('ADMIN_SEARCHING', lang), parse_mode="Markdown")
     
     try:
-        success, row = db.delete_member(text)
+        success, row = await workers.sheets_write.run(db.delete_member, text) # Journal fsync + cache edit off the event loop
         if success:
             db.log_action(update.effective_user.first_name, "DELETE_MEMBER", f"Matric: {text} (Row {row})")
-            await loading.edit_text(strings.get('ADMIN_DEL_SUCCESS', lang).format(row=row), parse_mode="Markdown")
+            await loading.edit_text(strings.get('ADMIN_DEL_SUCCESS', lang).format(row=row or "-"), parse_mode="Markdown")
         else:
             await loading.edit_text(strings.get('ADMIN_DEL_NOT_FOUND', lang), parse_mode="Markdown")
     except Exception as e:
@@ -268,6 +589,63 @@ async def del_matric(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     await update.message.reply_text(strings.get('BTN_ADMIN_MANAGE', lang), reply_markup=keyboards.get_admin_manage_menu(lang))
     return states.ADMIN_MANAGE
 
+# --- IMPORT MEMBERS FLOW (CSV upload) ---
+IMPORT_MAX_BYTES = 20 * 1024 * 1024 # Bot API download limit
+
+async def import_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    lang = get_user_lang(context)
+    await update.message.reply_text(strings.get('ADMIN_IMPORT_PROMPT', lang), parse_mode="Markdown", reply_markup=keyboards.get_cancel_menu(lang))
+    return states.IMPORT_FILE
+
+def run_import(path):
+    """Parse + validate + write (blocking, on the Sheets write pool). Returns an ImportReport."""
+    db.refresh_student_cache() # Dedupe against a fresh matric index
+    report = importer.parse_members_csv(path, db.student_cache)
+    if report.rows:
+        report.written, report.write_error = db.bulk_add_members(report.rows)
+    return report
+
+async def import_file(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    lang = get_user_lang(context)
+    message = update.message
+    if message.text:
+        text = message.text.strip()
+        if text in strings.get_all('BTN_CANCEL') or text == "CANCEL": return await back(update, context)
+    
+    doc = message.document
+    if not doc or not (doc.file_name or "").lower().endswith(".csv") or (doc.file_size or 0) > IMPORT_MAX_BYTES:
+        await message.reply_text(strings.get('ADMIN_IMPORT_BAD_FILE', lang), parse_mode="Markdown", reply_markup=keyboards.get_cancel_menu(lang))
+        return states.IMPORT_FILE
+    
+    loading = await message.reply_text(strings.get('ADMIN_IMPORT_WORKING', lang))
+    fd, path = tempfile.mkstemp(suffix=".csv", prefix="stem-import-")
+    os.close(fd)
+    try:
+        tg_file = await doc.get_file()
+        await tg_file.download_to_drive(path)
+        report = await workers.sheets_write.run(run_import, path)
+        
+        msg = strings.get('ADMIN_IMPORT_REPORT', lang).format(
+            total=report.total, written=report.written, existing=report.existing,
+            file_dupes=report.file_dupes, invalid=report.invalid
+        )
+        if report.errors:
+            msg += "\n\n" + escape_md("\n".join(report.errors))
+        if report.write_error:
+            msg += "\n\n⚠️ " + escape_md(report.write_error)
+        await loading.edit_text(msg, parse_mode="Markdown")
+        db.log_action(update.effective_user.first_name, "IMPORT", f"{doc.file_name}: {report.written}/{report.total} added")
+    except ValueError as e:
+        await loading.edit_text(str(e)) # Bad header
+    except Exception as e:
+        logger.error(f"Import Error: {e}")
+        await loading.edit_text(strings.get('ERR_DB_CONNECTION', lang))
+    finally:
+        os.remove(path)
+    
+    await message.reply_text(strings.get('BTN_ADMIN_MANAGE', lang), reply_markup=keyboards.get_admin_manage_menu(lang))
+    return states.ADMIN_MANAGE
+
 async def back(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     lang = get_user_lang(context)
     await update.message.reply_text(strings.get('ERR_CANCEL', lang), reply_markup=keyboards.get_admin_menu(lang))
@@ -0,0 +1,181 @@
+# Database Hot-Path Benchmarks (Offline, against fake_sheets)
+#
+#   python benchmark.py                       # 1k / 10k / 100k rows -> bench_results.json
+#   python benchmark.py --save-baseline       # Store results as the baseline
+#   python benchmark.py --sizes 1000,10000    # Compare against bench_baseline.json (exit 1 on regression)
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import fake_sheets
+from database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+RESULTS_FILE = "bench_results.json"
+BASELINE_FILE = "bench_baseline.json"
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+def measure(fn, iterations, min_time):
+    """Runs fn until both `iterations` and `min_time` seconds are reached. Returns latencies (s)."""
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < iterations or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= iterations * 50: # Hard cap for very fast calls
+            break
+    return samples
+
+def peak_memory(fn):
+    """Peak bytes allocated during one call (separate pass: tracemalloc skews timings)."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def build_cases(db, rows, rng):
+    """{name: (callable, iterations)} for one data size."""
+    matrics = [r[3] for r in rows]
+    # Mix of name tokens, matric prefixes and IC fragments, like admin searches
+    queries = [w.lower() for r in rows[:200] for w in r[2].split()[:1]] + \
+              [m[:5] for m in matrics[:50]] + [r[9][-4:] for r in rows[:50]]
+    # Full names with a typo or swapped word order, like fuzzy searches
+    names = [r[2].replace("a", "e", 1) for r in rows[:100]] + [" ".join(r[2].split()[::-1]) for r in rows[100:200]]
+
+    def refresh(): db.refresh_student_cache(force=True)
+    def find(): db.find_member(rng.choice(matrics))
+    def find_miss(): db.find_member("X" + rng.choice(matrics))
+    def verify(): db.find_verification(rng.choice(matrics))
+    def search(): db.search_members(rng.choice(queries))
+    def fuzzy(): db.fuzzy_search(rng.choice(names))
+    def stats(): db.get_stats()
+    def members(): db.get_members(limit=30)
+    def unprocessed(): db.get_unprocessed_registrations()
+
+    return {
+        "refresh_student_cache": (refresh, 5),
+        "find_member": (find, 2000),
+        "find_member_miss": (find_miss, 2000),
+        "find_verification": (verify, 2000),
+        "search_members": (search, 20),
+        "fuzzy_search": (fuzzy, 500),
+        "get_stats": (stats, 500),
+        "get_members": (members, 50),
+        "get_unprocessed_registrations": (unprocessed, 5),
+    }
+
+def run_size(size, seed, min_time, only=None):
+    rows = fake_sheets.synthetic_registrations(size, seed=seed)
+    client = fake_sheets.FakeClient(fake_sheets.FakeSpreadsheet(registrations=rows))
+    db = Database(client=client)
+    db.refresh_student_cache(force=True) # Warm cache, as in production
+    db.search_index() # Built once per cache version, not per query
+    rng = random.Random(seed)
+
+    results = {}
+    for name, (fn, iterations) in build_cases(db, rows, rng).items():
+        if only and name not in only:
+            continue
+        samples = measure(fn, iterations, min_time)
+        results[name] = {
+            "iterations": len(samples),
+            "ops_per_sec": round(len(samples) / sum(samples), 2) if sum(samples) else None,
+            "p50_ms": round(percentile(samples, 50) * 1000, 4),
+            "p99_ms": round(percentile(samples, 99) * 1000, 4),
+            "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+            "peak_kib": round(peak_memory(fn) / 1024, 1),
+        }
+        print(f"  {name:<32} p50 {results[name]['p50_ms']:>10.3f} ms   p99 {results[name]['p99_ms']:>10.3f} ms"
+              f"   {results[name]['ops_per_sec'] or 0:>12.1f} op/s   peak {results[name]['peak_kib']:>10.1f} KiB")
+
+        # Refresh must not leave the cache cold for the next case
+        if name == "refresh_student_cache":
+            db.refresh_student_cache(force=True)
+            db.search_index()
+    return results
+
+def compare(current, baseline, threshold):
+    """Returns a list of (size, case, old_p50, new_p50) that got slower than `threshold`."""
+    regressions = []
+    for size, cases in current["results"].items():
+        for case, res in cases.items():
+            old = baseline.get("results", {}).get(size, {}).get(case)
+            if not old:
+                continue
+            # Ignore noise on sub-microsecond calls
+            if res["p50_ms"] > old["p50_ms"] * (1 + threshold) and res["p50_ms"] - old["p50_ms"] > 0.001:
+                regressions.append((size, case, old["p50_ms"], res["p50_ms"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Database hot paths against synthetic Registrations data.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma separated row counts")
+    parser.add_argument("--only", default="", help="Comma separated case names to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per case")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Also write results to the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING) # Keep Database info logs out of the report
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        print(f"\n📊 {size:,} rows")
+        report["results"][str(size)] = run_size(size, args.seed, args.min_time, only)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline} (run with --save-baseline to create one).")
+        return 0
+
+    regressions = compare(report, baseline, args.threshold)
+    if not regressions:
+        print(f"✅ No regressions vs baseline ({baseline['meta']['timestamp']}).")
+        return 0
+    for size, case, old, new in regressions:
+        print(f"❌ REGRESSION {case} @ {size} rows: p50 {old:.3f} ms -> {new:.3f} ms")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
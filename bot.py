@@ -3,6 +3,7 @@ import logging
 import asyncio
 import re
 import datetime
+import time
 from aiohttp import web, ClientSession
 from telegram import Update
 from telegram.ext import (
@@ -12,7 +13,8 @@ from telegram.ext import (
     ConversationHandler,
     filters,
     ContextTypes,
-    CallbackQueryHandler
+    CallbackQueryHandler,
+    InlineQueryHandler
 )
 
 # Import Modules
@@ -21,11 +23,14 @@ import states
 import handlers
 import admin
 import superadmin
+import workers
+from database import db
 
 # --- CONFIGURATION ---
 TOKEN = os.getenv("TELEGRAM_TOKEN")
 PORT = int(os.getenv("PORT", 10000))
 WEBHOOK_URL = os.getenv("RENDER_EXTERNAL_URL")
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL") # Optional: local Bot API stand-in (see fake_telegram.py)
 
 # Logging
 logging.basicConfig(
@@ -48,6 +53,26 @@ async def self_pinger():
              except Exception as e:
                  logger.error(f"⚠️ Self-Ping Failed: {e}")
 
+# --- BACKGROUND WARM-UP ---
+async def warm_up(attempts=5):
+    """Loads config, student cache and user registry concurrently, retrying failed parts."""
+    started = time.monotonic()
+    loaders = {
+        "config": lambda: db.refresh_system_config(force=True),
+        "students": lambda: db.refresh_student_cache(force=True),
+        "users": db.load_user_registry,
+        "archives": db.load_archives,
+    }
+    db.start_replayer() # Writes journaled by the last run go out as soon as Sheets answers
+    for attempt in range(attempts):
+        pending = [key for key in loaders if not db.ready[key]]
+        await asyncio.gather(*(workers.sheets_read.run(loaders[key]) for key in pending))
+        if all(db.ready.values()):
+            logger.info(f"🔥 Warm-up complete in {time.monotonic() - started:.1f}s")
+            return
+        await asyncio.sleep(2 ** attempt) # Backoff before retrying what failed
+    logger.error(f"⚠️ Warm-up incomplete after {attempts} attempts: {db.ready}")
+
 # --- HELPER FOR FILTERS ---
 def build_filter(key):
     """Builds a Regex filter that matches ANY language variation of a button"""
@@ -58,7 +83,11 @@ def build_filter(key):
 
 # --- WEBHOOK & MAIN ---
 async def main():
-    application = ApplicationBuilder().token(TOKEN).build()
+    builder = ApplicationBuilder().token(TOKEN)
+    if TELEGRAM_API_URL:
+        logger.warning(f"⚠️ Using Bot API at {TELEGRAM_API_URL}")
+        builder = builder.base_url(f"{TELEGRAM_API_URL}/bot").base_file_url(f"{TELEGRAM_API_URL}/file/bot")
+    application = builder.build()
 
     # Dynamic Filters (Multi-Language)
     filter_check = build_filter('BTN_CHECK')
@@ -74,10 +103,12 @@ async def main():
     # Admin Filters (Usually Admin is one lang, but we support all just in case)
     filter_admin_manage = build_filter('BTN_ADMIN_MANAGE')
     filter_admin_del = build_filter('BTN_ADMIN_DEL')
+    filter_admin_import = build_filter('BTN_ADMIN_IMPORT')
     filter_admin_list = build_filter('BTN_ADMIN_LIST')
     filter_admin_search = build_filter('BTN_ADMIN_SEARCH')
     filter_admin_broadcast = build_filter('BTN_ADMIN_BROADCAST')
     filter_admin_stats = build_filter('BTN_ADMIN_STATS')
+    filter_admin_review = build_filter('BTN_ADMIN_REVIEW')
     filter_admin_check_pending = build_filter('BTN_ADMIN_CHECK_PENDING') # Keeping for backward compat logic if needed
     
     filter_admin_exit = build_filter('BTN_ADMIN_EXIT')
@@ -154,17 +185,20 @@ async def main():
                 MessageHandler(filter_admin_broadcast, admin.broadcast_start),
                 MessageHandler(filter_admin_check_pending, admin.check_pending_click),
                 MessageHandler(filter_admin_stats, admin.stats),
+                MessageHandler(filter_admin_review, admin.review_start),
                 MessageHandler(filter_admin_exit, admin.exit),
                 CommandHandler("admin", admin.start) # Allow refresh
             ],
             states.ADMIN_MANAGE: [
                 MessageHandler(filter_admin_del, admin.del_start),
+                MessageHandler(filter_admin_import, admin.import_start),
                 MessageHandler(filter_admin_list, admin.list_members),
                 MessageHandler(filter_admin_search, admin.search_start),
                 MessageHandler(filter_back, admin.back_to_admin),
                 CommandHandler("admin", admin.back_to_admin) # Refresh to main admin
             ],
             states.DEL_MATRIC: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin.del_matric)],
+            states.IMPORT_FILE: [MessageHandler((filters.TEXT | filters.Document.ALL) & ~filters.COMMAND, admin.import_file)],
             states.SEARCH_MODE: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin.receive_search_mode)],
             states.SEARCH_QUERY: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin.search_perform)],
             states.BROADCAST_MSG: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin.broadcast_confirm)],
@@ -181,6 +215,12 @@ async def main():
     application.add_handler(CommandHandler("help", handlers.help_command))
     application.add_handler(CommandHandler("settings", handlers.settings_menu))
     application.add_handler(CommandHandler("check_pending", handlers.check_pending_now)) # Manual Trigger
+    application.add_handler(CommandHandler("export", admin.export_members)) # Admin only (checked in handler)
+    application.add_handler(CommandHandler("rollover", superadmin.rollover)) # Superadmin only (checked in handler)
+    application.add_handler(CallbackQueryHandler(admin.list_members_page, pattern=r"^members:(prev|next):\d+$"))
+    application.add_handler(CallbackQueryHandler(admin.review_action, pattern=r"^review:(t:\d+|all:[AR]|p:\d+|commit|cancel)$"))
+    application.add_handler(InlineQueryHandler(admin.inline_lookup)) # Admin-only (checked in handler)
+    application.add_handler(CallbackQueryHandler(admin.search_page, pattern=r"^search:[0-9a-f]+:[sdf]:(prev|next):\d+$"))
     
     application.add_handler(MessageHandler(filter_help, handlers.help_command))
     application.add_handler(MessageHandler(filter_settings, handlers.settings_menu))
@@ -199,6 +239,53 @@ async def main():
         # Daily Logs at 00:00 UTC (or server time)
         application.job_queue.run_daily(handlers.send_daily_logs, time=datetime.time(hour=0, minute=0, second=0))
     
+    # --- WEB SERVER FIRST ---
+    # Bind the port before any Telegram/Sheets I/O so health checks pass on slow boots.
+    async def telegram_webhook(request):
+        if not application.running:
+            # Still booting: a non-2xx makes Telegram redeliver the update later
+            return web.Response(status=503, text="Starting")
+        update_data = await request.json()
+        await application.process_update(Update.de_json(update_data, application.bot))
+        return web.Response(text="OK")
+
+    async def health(request): return web.Response(text="Alive")
+
+    async def ready(request):
+        """Readiness (warm caches + bot started), separate from liveness (/health)."""
+        state = dict(db.ready, bot=application.running)
+        is_ready = all(state.values())
+        return web.json_response(
+            {"ready": is_ready, **state, "student_records": len(db.student_cache),
+             "degraded": db.degraded, "data_age_s": round(db.data_age())},
+            status=200 if is_ready else 503
+        )
+
+    async def metrics(request):
+        """Worker pool queue depth / wait times (see workers.py), the Sheets circuit breaker
+        and the mutation journal's replay lag."""
+        return web.json_response({
+            **workers.metrics(),
+            "sheets_circuit": db.circuit_metrics(),
+            "journal": db.journal_metrics(),
+        })
+
+    app = web.Application()
+    app.router.add_post("/telegram", telegram_webhook)
+    app.router.add_get("/", health)
+    app.router.add_get("/health", health) # Dedicated endpoint for self-pinger
+    app.router.add_get("/ready", ready)
+    app.router.add_get("/metrics", metrics)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "0.0.0.0", PORT)
+    await site.start()
+    logger.info(f"🌐 Listening on port {PORT}")
+    
+    # Caches load in the background (config, students, users in parallel)
+    asyncio.create_task(warm_up())
+    
     webhook_path = f"{WEBHOOK_URL}/telegram" if WEBHOOK_URL else None
     
     if WEBHOOK_URL:
@@ -226,27 +313,10 @@ async def main():
         BotCommand("settings", "Open Settings"),
     ]
     await application.bot.set_my_commands(commands)
-
-    async def telegram_webhook(request):
-        update_data = await request.json()
-        await application.process_update(Update.de_json(update_data, application.bot))
-        return web.Response(text="OK")
-
-    async def health(request): return web.Response(text="Alive")
-
-    app = web.Application()
-    app.router.add_post("/telegram", telegram_webhook)
-    app.router.add_get("/", health)
-    app.router.add_get("/health", health) # Dedicated endpoint for self-pinger
     
     await application.initialize()
     await application.start()
     
-    runner = web.AppRunner(app)
-    await runner.setup()
-    site = web.TCPSite(runner, "0.0.0.0", PORT)
-    await site.start()
-    
     # Start Self Pinger
     asyncio.create_task(self_pinger())
     
@@ -0,0 +1,74 @@
+# Circuit Breaker For Google Sheets
+#
+# closed    - calls go through; `threshold` failures in a row open the circuit
+# open      - calls are skipped (callers serve what they have) until the next probe is due
+# half-open - one caller probes; success closes the circuit, failure re-opens it with
+#             the delay doubled (base_delay .. max_delay)
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+class CircuitBreaker:
+    def __init__(self, name, threshold=3, base_delay=5.0, max_delay=300.0):
+        self.name = name
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = CLOSED
+        self.failures = 0          # Consecutive failures
+        self.opened_at = None      # time.time() the current outage started
+        self.next_probe = 0.0
+        self.delay = base_delay
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.state != CLOSED
+
+    def allow(self):
+        """True if the caller may hit Sheets now (closed, or it's this caller's turn to probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.next_probe:
+                self.state = HALF_OPEN # Exactly one probe in flight
+                return True
+            return False
+
+    def success(self):
+        """Records a good call. Returns True if this ended an outage."""
+        with self._lock:
+            recovered = self.state != CLOSED
+            if recovered:
+                logger.info(f"✅ {self.name} recovered after {time.time() - self.opened_at:.0f}s")
+            self.state, self.failures, self.delay, self.opened_at = CLOSED, 0, self.base_delay, None
+            return recovered
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.delay = min(self.delay * 2, self.max_delay) # Probe failed: back off further
+            elif self.state == CLOSED and self.failures >= self.threshold:
+                self.trips += 1
+                self.opened_at = time.time()
+                logger.warning(f"⚠️ {self.name} circuit OPEN after {self.failures} failures")
+            else:
+                return
+            self.state = OPEN
+            self.next_probe = time.monotonic() + self.delay
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_s": round(time.time() - self.opened_at, 1) if self.opened_at else 0.0,
+                "next_probe_in_s": round(max(0.0, self.next_probe - time.monotonic()), 1) if self.state != CLOSED else 0.0,
+                "trips": self.trips,
+            }
@@ -2,34 +2,215 @@ import os
 import json
 import logging
 import time  # Imported time
+import gzip
 import gspread
 from google.oauth2.service_account import Credentials
 import traceback
+import hashlib
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from itertools import islice, takewhile
 from datetime import datetime
+from types import MappingProxyType
+import schema
+import workers
+from breaker import CircuitBreaker
+from journal import Journal
+from snapshot import SnapshotStore
+from search_index import SearchIndex
+from stats import MemberStats
 
 logger = logging.getLogger(__name__)
 
+# Roles in the permission map
+ROLE_SUPERADMIN = "superadmin"
+ROLE_ADMIN = "admin"
+
+# Mutation journal (see "Mutation Journal"): which cache each kind of entry touches
+STUDENT_OPS = ("status", "add_member", "delete_member")
+ADMIN_OPS = ("add_admin", "remove_admin")
+CONFIG_OPS = ("set_config",)
+JOURNAL_BATCH = 200 # Most status entries merged into one batch_update
+JOURNAL_POLL = 30   # Seconds the idle replayer sleeps between checks
+JOURNAL_COALESCE = 0.5 # Seconds the replayer lets a burst of writes gather before flushing
+EXPORT_CHUNK = 500 # Rows per batch_get when an export asks for every column
+
+# system_config keys: {key: (type, default)}. Unknown keys in the sheet are ignored.
+CONFIG_SCHEMA = {
+    "maintenance_mode": (bool, False),
+    "maintenance_message": (str, ""),   # Shown instead of the default maintenance notice
+    "student_cache_ttl": (int, 120),    # Seconds between change probes (full reload only if matrics/statuses changed)
+    "student_max_age": (int, 21600),    # Seconds before a full reload even if no change was seen (other columns)
+    "config_ttl": (int, 300),           # Seconds between system_config/system_admins reloads
+    "member_id_prefix": (str, schema.MEMBER_ID_PREFIX), # Current session's membership ID prefix
+}
+
+# Snapshot payloads (see snapshot.py). Every field is immutable once published.
+# students {matric: (row, idx)}, row_matric {idx: matric}, order: sorted tuple of row idx (sheet order), stats: StatsView,
+# verify {matric: schema.VerifyRecord} (precomputed answers for the IC check),
+# deleted: sorted tuple of base rows deleted since the last full load (see "Row Addressing")
+StudentData = namedtuple("StudentData", "students row_matric order stats verify deleted")
+AdminData = namedtuple("AdminData", "sheet_admins roles all_ids")     # tuple, {user_id: role}, frozenset
+
+class TrackedDict(dict):
+    """dict copy that records every key written or removed (see _edit_students)."""
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.touched = set()
+
+    def __setitem__(self, key, value):
+        self.touched.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.touched.add(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        self.touched.add(key)
+        return super().pop(key, *default)
+
+def is_transient(error):
+    """True for Sheets failures worth retrying: quota (429), server (5xx) and network errors.
+    Other API errors (4xx) and bad data won't succeed on a retry."""
+    if isinstance(error, gspread.exceptions.APIError):
+        code = getattr(error, "code", None) or 0
+        return code == 429 or code >= 500
+    return isinstance(error, OSError) # requests' ConnectionError/Timeout, ConnectionError above
+
+def default_config():
+    return {key: default for key, (_, default) in CONFIG_SCHEMA.items()}
+
+def parse_config_value(kind, raw, default):
+    """Converts a sheet cell to the schema type, falling back to the default."""
+    text = str(raw).strip()
+    if kind is bool:
+        return text.lower() in ("true", "1", "yes", "on")
+    if kind is int:
+        try:
+            return int(float(text))
+        except ValueError:
+            logger.warning(f"⚠️ Bad config value {raw!r}, using {default}")
+            return default
+    return text
+
 class Database:
-    def __init__(self):
+    def __init__(self, client=None):
         self.sheet_id = os.getenv("SHEET_ID")
         self.google_json = os.getenv("GOOGLE_CREDENTIALS")
+        
+        # Pluggable Sheets backend: any gspread-like client (e.g. fake_sheets.FakeClient).
+        # None = authorize against Google with the service account.
+        if client is None and os.getenv("SHEETS_BACKEND", "").lower() == "fake":
+            import fake_sheets
+            client = fake_sheets.from_env()
+            logger.warning("⚠️ Using in-process FAKE Google Sheets backend")
+        self.client = client
         self.superadmin_ids = self._parse_ids("SUPERADMIN_IDS")
         self.admin_ids = self._parse_ids("ADMIN_IDS")
         
+        # All caches live in immutable, versioned snapshots (students, admins, config, users).
+        # Reads are lock-free; every change is built + published on the store's owner thread.
+        self._store = SnapshotStore(
+            students=StudentData(MappingProxyType({}), MappingProxyType({}), (), MemberStats().freeze(), MappingProxyType({}), ()),
+            admins=AdminData((), MappingProxyType({}), frozenset()),
+            config=MappingProxyType(default_config()),
+            users=frozenset(), # User Log Cache (to avoid repeated writes)
+            archives=MappingProxyType({}), # {matric: VerifyRecord} of archived sessions (see load_archives)
+        )
+        self._stats = MemberStats() # Running counters, only touched on the owner thread
+        self._deleted = [] # Base rows deleted since the last full load (owner thread)
+        self._verify_prefix = None # ID prefix the published verify records were built with (owner thread)
+        
         # System Caches
-        self.cached_sheet_admins = [] 
-        self.maintenance_mode = False
         self.last_config_refresh = 0
+        self._config_hashes = {} # {tab: digest of raw values} to skip no-op rebuilds
+        self._spreadsheet = None # Opened once, reused by every get_sheet() call
+        
+        # Permission map {user_id: role}: rebuilt + swapped whenever an admin source changes
+        self._store.write(self._publish_admins, ())
         
         # Student Cache
-        self.student_cache = {} # {matric_str: [row_data]}
-        self.last_student_refresh = 0
-        self.CACHE_TTL = 600 # 10 Minutes
+        self.last_student_refresh = 0 # Last load OR unchanged probe (0 = reload on next read)
+        self.last_student_load = 0    # Last full download
+        self._refresh_queued = False  # A background refresh is already on workers.sheets_read
+        self._student_refresh_lock = threading.Lock() # One sheet reload at a time
+        
+        # Degraded mode: after repeated Sheets failures the breaker stops reload attempts
+        # (probing with backoff) and reads keep using the last good snapshot.
+        self.breaker = CircuitBreaker("Google Sheets")
+        self.snapshot_path = os.getenv("STUDENT_SNAPSHOT_FILE", "student_snapshot.json.gz")
+        self.students_as_of = 0          # When the served student data was read from the sheet
+        self._students_from_disk = False # Serving the local snapshot file (never reached Sheets)
+        self._saved_rows = None          # Rows last handed to _save_local_snapshot
+        self._snapshot_lock = threading.Lock()
         
-        # User Log Cache (to avoid repeated writes)
-        self.logged_users_cache = set()
+        # Mutations: journaled to disk + applied to the caches at once, replayed to Sheets
+        # by one background thread (see Mutation Journal below)
+        self.journal = Journal(os.getenv("JOURNAL_FILE", "mutations.journal"))
+        self._journal_wake = threading.Event()
+        self._replayer = None
+        self._replayer_lock = threading.Lock()
+        self._replay_single_until = 0 # Seq up to which status entries replay one at a time
+        # Separate breaker: a write backlog never puts reads into degraded mode
+        self.write_breaker = CircuitBreaker("Google Sheets writes")
+        self._search_index = None # SearchIndex of the latest student snapshot (built on demand)
+        self._index_lock = threading.Lock()
         
-        self.refresh_system_config()
+        # Warm-up state (served on /ready). Construction does NO I/O:
+        # bot.py loads these in the background once the web server is listening.
+        self.ready = {"config": False, "students": False, "users": False, "archives": False}
+
+    # --- Snapshot Views (read-only, lock-free) ---
+    @property
+    def student_cache(self):
+        return self._store.data("students").students # {matric_str: (row_data, row_index)}
+
+    @property
+    def row_matric(self):
+        return self._store.data("students").row_matric # {sheet_row: matric_str}
+
+    @property
+    def verify_records(self):
+        return self._store.data("students").verify # {matric_str: VerifyRecord}
+
+    @property
+    def stats(self):
+        return self._store.data("students").stats
+
+    @property
+    def student_version(self):
+        return self._store.version("students") # Bumped on every reload/edit
+
+    @property
+    def roles(self):
+        return self._store.data("admins").roles
+
+    @property
+    def all_admin_ids(self):
+        return self._store.data("admins").all_ids
+
+    @property
+    def cached_sheet_admins(self):
+        return self._store.data("admins").sheet_admins
+
+    @property
+    def config(self):
+        return self._store.data("config")
+
+    @property
+    def maintenance_mode(self):
+        return self.config["maintenance_mode"]
+
+    @property
+    def CACHE_TTL(self):
+        return self.config["student_cache_ttl"]
+
+    @property
+    def logged_users_cache(self):
+        return self._store.data("users")
 
     def _parse_ids(self, env_key):
         raw = os.getenv(env_key, "")
@@ -41,35 +222,50 @@ class Database:
                 logger.error(f"⚠️ Error parsing {env_key}")
         return ids
 
-    def get_sheet(self, sheet_name="Registrations"):
-        try:
-            scope = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+    def _authorize(self):
+        """Returns an authorized gspread client, or None if credentials are missing."""
+        if self.client:
+            return self.client
             
-            if not self.google_json:
-                # Fallback to local file if env var is missing
+        scope = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+        
+        if not self.google_json:
+            # Fallback to local file if env var is missing
+            if os.path.exists("service_account.json"):
+                with open("service_account.json") as f:
+                    creds_dict = json.load(f)
+            else:
+                logger.error("❌ CRITICAL: GOOGLE_CREDENTIALS missing!")
+                return None
+        else:
+            try:
+                creds_dict = json.loads(self.google_json)
+            except json.JSONDecodeError:
+                 # Fallback to local file on decode error
                 if os.path.exists("service_account.json"):
                     with open("service_account.json") as f:
                         creds_dict = json.load(f)
                 else:
-                    logger.error("❌ CRITICAL: GOOGLE_CREDENTIALS missing!")
+                    logger.error("❌ JSON Decode Error in Env")
                     return None
-            else:
-                try:
-                    creds_dict = json.loads(self.google_json)
-                except json.JSONDecodeError:
-                     # Fallback to local file on decode error
-                    if os.path.exists("service_account.json"):
-                        with open("service_account.json") as f:
-                            creds_dict = json.load(f)
-                    else:
-                        logger.error("❌ JSON Decode Error in Env")
-                        return None
-                 
-            creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-            client = gspread.authorize(creds)
-            
-            # Open Sheet
-            sh = client.open_by_key(self.sheet_id)
+             
+        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
+        return gspread.authorize(creds)
+
+    def _get_spreadsheet(self):
+        """Authorizes + opens the spreadsheet once; later calls reuse the handle."""
+        if self._spreadsheet is None:
+            client = self._authorize()
+            if not client:
+                return None
+            self._spreadsheet = client.open_by_key(self.sheet_id)
+        return self._spreadsheet
+
+    def get_sheet(self, sheet_name="Registrations"):
+        try:
+            sh = self._get_spreadsheet()
+            if not sh:
+                return None
             
             # Handle specific tabs vs default sheet1
             if sheet_name == "Registrations":
@@ -85,123 +281,655 @@ class Database:
                 elif sheet_name == "system_config":
                     ws.append_row(["Key", "Value"])
                     ws.append_row(["maintenance_mode", "False"])
+                elif sheet_name == "system_archives":
+                    ws.append_row(["Tab", "Label", "ID Prefix", "Rows", "Archived At"])
                 return ws
                 
         except Exception as e:
+            self._spreadsheet = None # Re-open next time (expired auth, deleted sheet...)
             logger.error(f"DB Connection Error ({sheet_name}): {e}")
             logger.error(traceback.format_exc())
             return None
 
+    def _fetch_system_tabs(self):
+        """Reads system_admins + system_config in ONE values_batch_get request."""
+        sh = self._get_spreadsheet()
+        if not sh:
+            return None
+        ranges = ["'system_admins'!A:C", "'system_config'!A:B"]
+        try:
+            resp = sh.values_batch_get(ranges)
+        except gspread.exceptions.APIError as e:
+            # Missing tab -> "Unable to parse range". Auto-heal via get_sheet, then retry once.
+            logger.warning(f"System tabs batch read failed ({e}), creating missing tabs")
+            self.get_sheet("system_admins")
+            self.get_sheet("system_config")
+            resp = sh.values_batch_get(ranges)
+        admins, config = (vr.get("values", []) for vr in resp.get("valueRanges", [{}, {}]))
+        return admins, config
+
+    def _tab_changed(self, tab, values):
+        digest = hashlib.sha1(json.dumps(values).encode()).hexdigest()
+        if self._config_hashes.get(tab) == digest:
+            return False
+        self._config_hashes[tab] = digest
+        return True
+
     def refresh_system_config(self, force=False):
-        """Reloads admins and config from sheet. Cached for 5 minutes."""
-        if not force and (time.time() - self.last_config_refresh < 300):
+        """Reloads admins and config from sheet (1 API call). Cached for `config_ttl` seconds."""
+        if not force and (time.time() - self.last_config_refresh < self.config["config_ttl"]):
             return
 
         try:
-            # 1. Load Admins
-            ws_admins = self.get_sheet("system_admins")
-            if ws_admins:
-                records = ws_admins.get_all_records()
-                self.cached_sheet_admins = [int(r['User ID']) for r in records if str(r['User ID']).isdigit()]
+            tabs = self._fetch_system_tabs()
+            if tabs is None: return
+            admin_rows, config_rows = tabs
             
-            # 2. Load Config
-            ws_config = self.get_sheet("system_config")
-            if ws_config:
-                records = ws_config.get_all_records()
-                for r in records:
-                    if r['Key'] == 'maintenance_mode':
-                        self.maintenance_mode = str(r['Value']).lower() == 'true'
+            # 1. Admins (Row 1 is header: User ID | Name | Added By)
+            if self._tab_changed("system_admins", admin_rows):
+                sheet_admins = tuple(int(r[0]) for r in admin_rows[1:] if r and str(r[0]).strip().isdigit())
+                self._store.write(self._publish_admins, sheet_admins)
+                self._reapply_journal(ADMIN_OPS) # Admin changes not in the sheet yet
+            
+            # 2. Config (Row 1 is header: Key | Value)
+            if self._tab_changed("system_config", config_rows):
+                config = default_config()
+                for r in config_rows[1:]:
+                    key = r[0].strip() if r else ""
+                    if key in CONFIG_SCHEMA:
+                        kind, default = CONFIG_SCHEMA[key]
+                        config[key] = parse_config_value(kind, r[1] if len(r) > 1 else "", default)
+                old_prefix = self.config["member_id_prefix"]
+                self._store.write(self._store.publish, "config", MappingProxyType(config))
+                self._reapply_journal(CONFIG_OPS) # Config changes not in the sheet yet
+                if self.config["member_id_prefix"] != old_prefix and self.student_cache:
+                    self._store.write(self._edit_students, lambda cache, row_matric: None) # Re-issue IDs
             
             self.last_config_refresh = time.time()
+            self.ready["config"] = True
             logger.info("System Config Refreshed (from Sheet)")
                         
         except Exception as e:
+            self._spreadsheet = None
             logger.error(f"System Config Load Fail: {e}")
 
+    def _publish_admins(self, sheet_admins):
+        """[owner] Builds a new frozen {user_id: role} map (Super > Env/Sheet Admin) and swaps it in."""
+        roles = {uid: ROLE_ADMIN for uid in sheet_admins}
+        roles.update((uid, ROLE_ADMIN) for uid in self.admin_ids)
+        roles.update((uid, ROLE_SUPERADMIN) for uid in self.superadmin_ids)
+        # One snapshot: readers see either the old or the new admin set, never a mix
+        self._store.publish("admins", AdminData(tuple(sheet_admins), MappingProxyType(roles), frozenset(roles)))
+
+    def role_of(self, user_id):
+        return self.roles.get(user_id)
+
     def is_superadmin(self, user_id):
-        return user_id in self.superadmin_ids
+        return self.roles.get(user_id) == ROLE_SUPERADMIN
 
     def is_admin(self, user_id):
-        # Superadmins + Env Admins + Sheet Admins
-        return (user_id in self.superadmin_ids or 
-                user_id in self.admin_ids or 
-                user_id in self.cached_sheet_admins)
+        # Superadmins + Env Admins + Sheet Admins (one dict lookup)
+        return user_id in self.roles
 
     def get_all_admin_ids(self):
-        """Returns a set of ALL admin IDs (Super + Env + Sheet)."""
-        return set(self.superadmin_ids) | set(self.admin_ids) | set(self.cached_sheet_admins)
+        """Returns a frozenset of ALL admin IDs (Super + Env + Sheet). Prebuilt, not copied."""
+        return self.all_admin_ids
 
     def set_maintenance(self, enabled: bool):
+        return self.set_config("maintenance_mode", enabled)
+
+    def set_config(self, key, value):
+        """Sets one config key (journaled, published at once). The system_config row is
+        written (appended if missing) by the replayer."""
         try:
-            ws = self.get_sheet("system_config")
-            cell = ws.find("maintenance_mode")
-            ws.update_cell(cell.row, cell.col + 1, str(enabled))
-            self.maintenance_mode = enabled
+            self._journal("set_config", key=key, value=value)
             return True
         except Exception as e:
-            logger.error(f"Set Maint Error: {e}")
+            logger.error(f"Set Config Error ({key}): {e}")
             return False
 
+    def _replay_set_config(self, key, value):
+        ws = self._require_sheet("system_config")
+        cell = ws.find(key, in_column=1)
+        if cell:
+            ws.update_cell(cell.row, 2, str(value))
+        else:
+            ws.append_row([key, str(value)])
+
+    def _set_config(self, key, value):
+        """[owner] Publishes a copy of the config with one key changed."""
+        config = dict(self.config)
+        config[key] = value
+        self._store.publish("config", MappingProxyType(config))
+
     def add_admin(self, user_id, name, added_by):
         try:
-            ws = self.get_sheet("system_admins")
-            ws.append_row([str(user_id), name, added_by])
-            self.refresh_system_config(force=True)
+            self._journal("add_admin", user_id=int(user_id), name=name, added_by=added_by)
             return True
         except Exception as e:
             logger.error(f"Add Admin Error: {e}")
             return False
 
     def remove_admin(self, user_id):
+        if int(user_id) not in self.cached_sheet_admins:
+            return False
         try:
-            ws = self.get_sheet("system_admins")
-            cell = ws.find(str(user_id))
-            ws.delete_rows(cell.row)
-            self.refresh_system_config(force=True)
+            self._journal("remove_admin", user_id=int(user_id))
             return True
         except Exception as e:
             logger.error(f"Del Admin Error: {e}")
             return False
 
+    def _replay_add_admin(self, user_id, name, added_by):
+        ws = self._require_sheet("system_admins")
+        if not ws.find(str(user_id), in_column=1): # Already there if a previous attempt landed
+            ws.append_row([str(user_id), name, added_by])
+
+    def _replay_remove_admin(self, user_id):
+        ws = self._require_sheet("system_admins")
+        cell = ws.find(str(user_id), in_column=1)
+        if cell:
+            ws.delete_rows(cell.row)
+
     def refresh_student_cache(self, force=False):
-        """Loads all students into memory. 0 API calls for subsequent reads."""
-        if not force and (time.time() - self.last_student_refresh < self.CACHE_TTL):
-            return
+        """Keeps all students in memory. 0 API calls for reads: an expired cache is checked
+        (and reloaded if needed) on workers.sheets_read while readers keep the current
+        snapshot. Blocks only when forced or before the first load (an empty sheet, e.g.
+        after a full rollover, counts as loaded)."""
+        if force or not self.ready["students"]:
+            return self._refresh_students(force)
+        if time.time() - self.last_student_refresh >= self.CACHE_TTL and not self._refresh_queued:
+            self._refresh_queued = True
+            workers.sheets_read.spawn(self._refresh_students, False)
 
+    def _refresh_students(self, force):
+        try:
+            with self._student_refresh_lock: # One reload at a time; a forced one always runs
+                if not force and (time.time() - self.last_student_refresh < self.CACHE_TTL):
+                    return # Reloaded while we waited for the lock
+                if not force and not self.breaker.allow():
+                    return # Sheets is down: keep serving the last good snapshot until the next probe
+                
+                # Cheap change probe (columns D and R only) before downloading the hot columns
+                if (not force and self.last_student_refresh
+                        and time.time() - self.last_student_load < self.config["student_max_age"]):
+                    digest = self._probe_students()
+                    if digest and digest == self._cached_digest():
+                        self.last_student_refresh = time.time()
+                        logger.debug("Student cache unchanged, reload skipped")
+                        self._sheets_ok()
+                        return
+                if self._load_students():
+                    self._sheets_ok()
+                else:
+                    self.breaker.failure()
+                    if not self.student_cache:
+                        self._load_local_snapshot() # Cold start during an outage
+        finally:
+            if not force:
+                self._refresh_queued = False
+
+    # --- Degraded Mode ---
+    @property
+    def degraded(self):
+        """True while answers come from a snapshot Sheets can't currently confirm."""
+        return self.breaker.is_open or self._students_from_disk
+
+    def data_age(self):
+        """Seconds since the served student data was read from the sheet."""
+        return time.time() - self.students_as_of if self.students_as_of else 0
+
+    def circuit_metrics(self):
+        return {**self.breaker.metrics(), "queued_writes": len(self.journal), "data_age_s": round(self.data_age())}
+
+    def _sheets_ok(self):
+        if self.breaker.success():
+            self._journal_wake.set() # Outage over: flush journaled writes now
+
+    # --- Mutation Journal ---
+    # Every write is appended to the local journal (fsync'd) and applied to the caches
+    # straight away; the caller never waits on Sheets. One replayer thread then writes the
+    # entries to Sheets strictly in order (consecutive status changes as ONE batch_update)
+    # and acks them. Each replay step checks before it writes (matric still at the row,
+    # admin/config row already there), so retrying after a failed call or a crash never
+    # doubles a write. Entries not yet in the sheet are re-applied on top of every reload.
+    def _journal(self, op, **args):
+        entry = self.journal.append(op, **args) # Durable first...
+        self._apply_entry(entry)                 # ...then visible
+        self.start_replayer()
+        self._journal_wake.set()
+        return entry
+
+    def _apply_entry(self, entry):
+        """Applies a journal entry to the in-memory caches."""
+        op, args = entry["op"], entry["args"]
+        if op == "status":
+            self._store.write(self._edit_students, self._status_edit(args["decisions"]))
+        elif op == "add_member":
+            self._store.write(self._edit_students, self._provisional_add(args["row"]))
+        elif op == "delete_member":
+            self._store.write(self._edit_students, self._drop_member(entry))
+        elif op == "add_admin":
+            if args["user_id"] not in self.cached_sheet_admins:
+                self._store.write(self._publish_admins, self.cached_sheet_admins + (args["user_id"],))
+        elif op == "remove_admin":
+            self._store.write(self._publish_admins, tuple(a for a in self.cached_sheet_admins if a != args["user_id"]))
+        elif op == "set_config":
+            self._store.write(self._set_config, args["key"], args["value"])
+
+    def _reapply_journal(self, ops):
+        """Re-applies pending entries of kinds `ops` after a reload replaced the caches."""
+        for entry in self.journal.pending():
+            if entry["op"] in ops:
+                self._apply_entry(entry)
+
+    def pending_overlay(self):
+        """({matric: status}, {deleted matric}) journaled but not in the sheet yet, for
+        code that reads the sheet directly."""
+        statuses, deleted = {}, set()
+        for entry in self.journal.pending():
+            if entry["op"] == "status":
+                statuses.update(entry["args"]["decisions"])
+            elif entry["op"] == "delete_member":
+                deleted.add(entry["args"]["matric"])
+        return statuses, deleted
+
+    def start_replayer(self):
+        """Starts the replay thread (once): bot warm-up, or the first journaled write."""
+        with self._replayer_lock:
+            if self._replayer is None:
+                self._replayer = threading.Thread(target=self._replay_loop, name="journal-replay", daemon=True)
+                self._replayer.start()
+
+    def _replay_loop(self):
+        while True:
+            if self._journal_wake.wait(timeout=JOURNAL_POLL):
+                time.sleep(JOURNAL_COALESCE) # e.g. a review page of decisions -> one batch_update
+            self._journal_wake.clear()
+            while len(self.journal):
+                if not self.write_breaker.allow():
+                    time.sleep(1) # Sheets is down: entries wait (on disk) for the next probe
+                    continue
+                try:
+                    self._replay_next()
+                    self.write_breaker.success()
+                except Exception as e:
+                    # Only transient errors get here (see _replay_next): retry the same entry
+                    logger.error(f"Journal Replay Error ({len(self.journal)} pending): {e}")
+                    self.write_breaker.failure()
+                    time.sleep(1)
+
+    def _replay_next(self):
+        """Writes the oldest pending entry (or run of status entries) to Sheets and acks it.
+        Transient errors are raised (retried); an entry Sheets rejects for good is moved to
+        the dead-letter file so it can't block the writes behind it."""
+        entries = self.journal.pending()
+        head = entries[0]
+        split = head["op"] == "status" and head["seq"] <= self._replay_single_until
+        batch = [head]
+        if head["op"] == "status" and not split:
+            batch = list(takewhile(lambda e: e["op"] == "status", entries))[:JOURNAL_BATCH]
+        try:
+            # Reloads wait for the write, so a load never publishes a sheet read taken just
+            # before an entry that then drops out of the journal
+            with self._student_refresh_lock:
+                if split:
+                    rejected, error = self._replay_statuses_one_by_one(head)
+                    if rejected:
+                        self._dead_letter({**head, "args": {**head["args"], "decisions": rejected}}, error)
+                        return
+                elif head["op"] == "status":
+                    self._replay_statuses(batch)
+                else:
+                    getattr(self, f"_replay_{head['op']}")(**head["args"])
+                self.journal.ack(batch[-1]["seq"])
+        except Exception as e:
+            if is_transient(e):
+                raise
+            if head["op"] == "status":
+                # Rejected status write: redo these entries one matric at a time, so only
+                # the bad cell is dead-lettered
+                self._replay_single_until = batch[-1]["seq"]
+                logger.warning(f"⚠️ Status batch of {len(batch)} rejected ({e}), retrying one by one")
+                return
+            self._dead_letter(head, e)
+        if head["op"] in ADMIN_OPS + CONFIG_OPS:
+            self.last_config_refresh = 0 # Pick the tab up again on the next read
+
+    def _dead_letter(self, entry, error):
+        self.journal.dead_letter(entry, str(error))
+        logger.critical(f"☠️ Journal entry {entry['seq']} ({entry['op']}) rejected by Sheets, moved to {self.journal.dead_path}: {error}")
+        self.log_action("Journal", "DEAD_LETTER", f"#{entry['seq']} {entry['op']} {entry['args']}: {error}", role="SYSTEM") # In the superadmins' daily log
+        # The cache still shows the rejected change: reload it from the sheet
+        self.last_student_refresh = 0
+        if entry["op"] in ADMIN_OPS + CONFIG_OPS:
+            # The tab itself never changed, so drop its digest or the reload is skipped
+            self._config_hashes.pop("system_admins" if entry["op"] in ADMIN_OPS else "system_config", None)
+            self.refresh_system_config(force=True)
+
+    def _require_sheet(self, name):
+        ws = self.get_sheet(name)
+        if not ws:
+            raise ConnectionError(f"{name} sheet unavailable") # Transient: retried
+        return ws
+
+    def journal_metrics(self):
+        return {**self.journal.metrics(), "writes_circuit": self.write_breaker.state}
+
+    def _save_local_snapshot(self, cache):
+        """Writes the loaded rows to disk (atomic replace) for cold starts during an outage.
+        Runs on workers.cpu, one save at a time."""
+        tmp = self.snapshot_path + ".tmp"
+        try:
+            with self._snapshot_lock, gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as f: # Speed over size
+                json.dump({"saved_at": time.time(), "rows": list(cache.values())}, f)
+            os.replace(tmp, self.snapshot_path)
+        except Exception as e:
+            logger.error(f"Snapshot Save Error: {e}")
+
+    def _load_local_snapshot(self):
+        try:
+            with gzip.open(self.snapshot_path, "rt", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Snapshot Load Error: {e}")
+            return False
+        cache = {str(row[schema.COL_MATRIC]).strip().upper(): (row, idx) for row, idx in saved["rows"]}
+        self._store.write(self._publish_students, cache)
+        self._reapply_journal(STUDENT_OPS) # Writes made after the save, not replayed yet
+        self.students_as_of = saved["saved_at"]
+        self._students_from_disk = True
+        self.ready["students"] = True # Degraded, but users get answers
+        logger.warning(f"⚠️ Serving {len(cache)} records from the local snapshot ({self.data_age() / 60:.0f} min old)")
+        return True
+
+    @staticmethod
+    def _student_digest(pairs):
+        """Fingerprint of (matric, status) pairs in sheet order."""
+        return hashlib.sha1("\n".join(f"{mat}\t{status}" for mat, status in pairs).encode()).hexdigest()
+
+    def _probe_students(self):
+        """Digest of Registrations columns D and R (one narrow read), or None. Moves when rows
+        are added, deleted or re-ordered and when a status changes; edits to the other columns
+        are picked up by the `student_max_age` reload. Matrics are de-duplicated like
+        _index_rows (last row wins), so a sheet in step with the cache gives _cached_digest()."""
         try:
             ws = self.get_sheet("Registrations")
-            if not ws: return
-            
-            # Fetch ALL values in one go (1 API Call)
-            all_rows = ws.get_all_values()
+            if not ws: return None
+            matrics, statuses = ws.batch_get(["D2:D", "R2:R"]) # Each trimmed of trailing blanks
+            latest = {}
+            for i, cells in enumerate(matrics):
+                mat = str(cells[0]).strip().upper() if cells else ""
+                if mat:
+                    latest.pop(mat, None) # Re-inserted: ordered by its last row
+                    latest[mat] = str(statuses[i][0]).strip() if i < len(statuses) and statuses[i] else ""
+            return self._student_digest(latest.items())
+        except Exception as e:
+            logger.warning(f"⚠️ Change probe failed, doing a full reload: {e}")
+            return None
+
+    def _cached_digest(self):
+        """_probe_students() digest of what the cache says the sheet holds, the bot's own
+        (replayed) writes included, so those never cause a reload. Writes still waiting in
+        the journal do (once), and are re-applied on top."""
+        data = self._store.data("students")
+        return self._student_digest(
+            (mat, str(schema.cell(data.students[mat][0], schema.COL_STATUS)).strip())
+            for mat in map(data.row_matric.__getitem__, data.order)
+        )
+
+    def _load_students(self):
+        try:
+            ws = self.get_sheet("Registrations")
+            if not ws: return False
             
-            # Headers are row 0
-            # Data starts row 1
-            cache = {}
-            for i, row in enumerate(all_rows[1:], start=2): # Start=2 matches Sheet Row Number
-                # New Mapping:
-                # A(0)=Time, B=Email, C=Name, D(3)=Matric, E=Courses, ... J(9)=IC, ... Q(16)=Receipt, R(17)=Status
-                
-                # Normalize matric (Col 3)
-                if len(row) > 3:
-                    mat = str(row[3]).strip().upper()
-                    if mat:
-                        cache[mat] = (row, i) # Store (Data, RowIndex)
+            # Hot columns only, in one go (1 API Call)
+            rows = self._read_registrations(ws)
+            cache = self._index_rows(rows)
             
-            self.student_cache = cache
-            self.last_student_refresh = time.time()
+            self._store.write(self._publish_students, cache)
+            self._reapply_journal(STUDENT_OPS) # Writes not in the sheet yet
+            self.last_student_refresh = self.last_student_load = self.students_as_of = time.time()
+            self._students_from_disk = False
+            self.ready["students"] = True
             logger.info(f"Student Cache Refreshed: {len(cache)} records.")
+            if cache != self._saved_rows: # Same rows as the file already holds: nothing to write
+                self._saved_rows = cache
+                workers.cpu.spawn(self._save_local_snapshot, cache) # Off the refresh lock
+            return True
             
         except Exception as e:
             logger.error(f"Cache Refresh Error: {e}")
+            return False
+
+    @staticmethod
+    def _read_registrations(ws):
+        """Data rows (sheet row 2 down) with only the schema.HOT_SPANS columns filled:
+        ONE batch_get of a few column ranges instead of every column."""
+        return schema.assemble_rows(ws.batch_get(schema.hot_ranges()))
+
+    @staticmethod
+    def _index_rows(rows):
+        """{matric: (row, sheet row)} from data rows starting at sheet row 2."""
+        cache = {}
+        for i, row in enumerate(rows, start=2): # Start=2 matches Sheet Row Number
+            # A(0)=Time, B=Email, C=Name, D(3)=Matric, E=Courses, ... J(9)=IC, ... Q(16)=Receipt, R(17)=Status
+            
+            # Normalize matric (Col 3)
+            if len(row) > 3:
+                mat = str(row[3]).strip().upper()
+                if mat:
+                    cache[mat] = (row, i) # Store (Data, RowIndex)
+        return cache
+
+    def _lives(self, rows):
+        """Live sheet row of each cached row (by matric), None if it left the cache."""
+        data = self._store.data("students")
+        lives = []
+        for row in rows:
+            hit = data.students.get(str(schema.cell(row, schema.COL_MATRIC)).strip().upper())
+            lives.append(self._live_row(data, hit[1]) if hit else None)
+        return lives
+
+    @staticmethod
+    def _read_full_rows(sheet, rows, lives):
+        """Full A-T rows for `rows` at live rows `lives` with ONE batch_get, consecutive
+        rows merged into one range. A row not read or no longer holding its matric stays as given."""
+        last_col = gspread.utils.rowcol_to_a1(1, len(schema.HEADERS))[:-1]
+        runs = [] # [first, last] live rows
+        for live in sorted(set(l for l in lives if l)):
+            if runs and live == runs[-1][1] + 1:
+                runs[-1][1] = live
+            else:
+                runs.append([live, live])
+        if not runs:
+            return list(rows)
+        
+        found = {}
+        for (first, last), values in zip(runs, sheet.batch_get([f"A{a}:{last_col}{b}" for a, b in runs])):
+            for live, full in enumerate(values, start=first):
+                found[live] = list(full)
+        details = []
+        for row, live in zip(rows, lives):
+            full = found.get(live, []) if live else []
+            same = schema.cell(full, schema.COL_MATRIC).strip().upper() == str(schema.cell(row, schema.COL_MATRIC)).strip().upper()
+            details.append(full if same else row)
+        return details
+
+    def member_details(self, rows):
+        """Full A-T rows for cached `rows` (detail cards), with ONE batch read of just those
+        rows. A row that can't be read or no longer holds its matric stays as cached."""
+        if not self.breaker.allow():
+            return list(rows) # Sheets is down: cached columns only
+        sheet = self.get_sheet("Registrations")
+        if not sheet:
+            self.breaker.failure()
+            return list(rows)
+        try:
+            details = self._read_full_rows(sheet, rows, self._lives(rows))
+            self._sheets_ok()
+            return details
+        except Exception as e:
+            logger.error(f"Member Details Error: {e}")
+            self.breaker.failure()
+            return list(rows)
+
+    def iter_full_rows(self, rows, chunk=EXPORT_CHUNK):
+        """Yields the full A-T row of each cached row (full exports), reading `chunk` rows per
+        batch_get instead of downloading the sheet. Raises if a chunk can't be read, so an
+        export never comes out half hot-columns only."""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, chunk))
+            if not batch:
+                return
+            if not self.breaker.allow():
+                raise ConnectionError("Google Sheets is unavailable")
+            try:
+                sheet = self._require_sheet("Registrations")
+                details = self._read_full_rows(sheet, batch, self._lives(batch))
+                self._sheets_ok()
+            except Exception:
+                self.breaker.failure()
+                raise
+            yield from details
+
+    def _publish_students(self, cache):
+        """[owner] Swaps in a freshly loaded {matric: (row, idx)} cache."""
+        # Apply only changed rows to the counters (no rescan)
+        current = self._store.data("students")
+        self._stats.sync(current.students, cache)
+        self._deleted = [] # Fresh rows: base = live again
+        row_matric = {idx: mat for mat, (_, idx) in cache.items()}
+        self._store.publish("students", StudentData(
+            MappingProxyType(cache), MappingProxyType(row_matric), tuple(sorted(row_matric)), self._stats.freeze(),
+            self._verify_records(current, cache), (),
+        ))
+
+    def _edit_students(self, edit):
+        """[owner] Copy-on-write edit: `edit(cache, row_matric)` mutates private copies,
+        returning False to publish nothing. Only the keys it touched are re-derived."""
+        current = self._store.data("students")
+        # .copy() of the proxied dicts: a plain dict copy (dict(proxy) walks it key by key)
+        cache, row_matric = TrackedDict(current.students.copy()), TrackedDict(current.row_matric.copy())
+        if edit(cache, row_matric) is False:
+            return
+        # Status edits keep the current order; adds/deletes/moves patch it in place
+        order = current.order
+        if row_matric.touched:
+            order = list(order)
+            for idx in row_matric.touched:
+                was, now = idx in current.row_matric, idx in row_matric
+                if was and not now:
+                    del order[bisect_left(order, idx)]
+                elif now and not was:
+                    insort(order, idx)
+            order = tuple(order)
+        deleted = current.deleted if len(self._deleted) == len(current.deleted) else tuple(self._deleted)
+        snap = self._store.publish("students", StudentData(
+            MappingProxyType(cache), MappingProxyType(row_matric), order, self._stats.freeze(),
+            self._verify_records(current, cache, cache.touched), deleted,
+        ))
+        self._advance_search_index(snap.version, {mat: cache[mat][0] if mat in cache else None for mat in cache.touched})
+
+    def _publish_deleted(self):
+        """[owner] Re-publishes the current students with only `deleted` changed."""
+        current = self._store.data("students")
+        snap = self._store.publish("students", current._replace(deleted=tuple(self._deleted)))
+        self._advance_search_index(snap.version, {})
+
+    def _advance_search_index(self, version, changes):
+        """[owner] Brings an index built for the previous version up to `version` in place
+        ({matric: row or None}). An older one is left to be rebuilt on demand (search_index)."""
+        index = self._search_index
+        if index is not None and index.version == version - 1:
+            index.update(changes, version)
+
+    def _verify_records(self, current, cache, touched=None):
+        """[owner] Read-only {matric: VerifyRecord} for `cache`. With `touched` (keys an edit
+        changed) only those are rebuilt; otherwise the current record of every unchanged
+        entry is reused. All are rebuilt when the session's ID prefix changed."""
+        prefix = self.config["member_id_prefix"]
+        if touched is not None and prefix == self._verify_prefix:
+            if not touched:
+                return current.verify
+            records, dates = current.verify.copy(), {}
+            for mat in touched:
+                entry = cache.get(mat)
+                if entry is None:
+                    records.pop(mat, None)
+                else:
+                    records[mat] = schema.verify_record(mat, entry[0], entry[1], dates, prefix)
+            return MappingProxyType(records)
+        old = current.students if prefix == self._verify_prefix else {}
+        self._verify_prefix = prefix
+        records, dates = {}, {}
+        for mat, entry in cache.items():
+            prev = old.get(mat)
+            if prev is not None and (prev is entry or prev == entry):
+                records[mat] = current.verify[mat]
+            else:
+                records[mat] = schema.verify_record(mat, entry[0], entry[1], dates, prefix)
+        return MappingProxyType(records)
+
+    # --- Row Addressing ---
+    # Cached idx values are "base" rows: sheet rows as of the last full load. Instead of
+    # reloading after every delete, the deleted base rows are kept (sorted) and the live
+    # row of a member is its base minus the deletions above it. Appends only ever land
+    # below every cached row. Writes re-check the matric at the live row before touching it.
+    @staticmethod
+    def _live_row(data, base):
+        return base - bisect_left(data.deleted, base)
+
+    @staticmethod
+    def _base_row(data, row):
+        """Inverse of _live_row: base row now sitting at live `row`."""
+        base = row
+        for gone in data.deleted: # Sorted: each deletion at/above `base` pushes it one down
+            if gone > base:
+                break
+            base += 1
+        return base
+
+    def sheet_row(self, matric):
+        """Live sheet row of a cached matric, or None."""
+        data = self._store.data("students")
+        hit = data.students.get(matric)
+        return self._live_row(data, hit[1]) if hit else None
+
+    def _check_rows(self, sheet, targets):
+        """{matric: live row} -> same, verified against column D with ONE batch read.
+        Rows that moved underneath the cache (manual sheet edits) are re-located with find()
+        and schedule a full reload; matrics no longer in the sheet are dropped."""
+        if not targets: return {}
+        # Rows past the grid (e.g. stale after a rollover) can't be read: re-locate those
+        limit = getattr(sheet, "row_count", None) or float("inf")
+        inside = [row for row in targets.values() if row <= limit]
+        found = iter(sheet.batch_get([gspread.utils.rowcol_to_a1(row, schema.COL_MATRIC + 1) for row in inside]) if inside else ())
+        checked = {}
+        for mat, row in targets.items():
+            values = next(found) if row <= limit else None
+            current = str(values[0][0]).strip().upper() if values and values[0] else ""
+            if current == mat:
+                checked[mat] = row
+                continue
+            logger.warning(f"⚠️ Row {row} holds {current or 'nothing'}, not {mat}: re-locating")
+            self.last_student_refresh = 0 # Cache is out of step with the sheet
+            cell = sheet.find(mat, in_column=schema.COL_MATRIC + 1)
+            if cell:
+                checked[mat] = cell.row
+        return checked
 
     def find_member(self, matric):
         # 1. Try Cache First (0 API Calls)
         self.refresh_student_cache() # Checks TTL internaly
         
-        if matric in self.student_cache:
+        hit = self.student_cache.get(matric) # One snapshot read
+        if hit:
             # Return tuple (row_data, row_index)
-            return self.student_cache[matric]
+            return hit
             
         # 2. Fallback to API (Slow) if not in cache? 
         # For High Concurrency mode, we TRUST the cache. 
@@ -213,60 +941,168 @@ class Database:
         # Safe bet: Return None. User can try again in 10 mins or Admin refreshes.
         return None, None
 
+    def find_verification(self, matric):
+        """Precomputed VerifyRecord for `matric`: current session first, then the archive
+        index (both in memory, like find_member). None if neither has it."""
+        self.refresh_student_cache() # Checks TTL internaly
+        data = self._store.data("students") # One snapshot
+        record = data.verify.get(matric)
+        if record is None:
+            return self._store.data("archives").get(matric)
+        base = data.students[matric][1]
+        live = self._live_row(data, base)
+        if live != base: # Records are built at base rows: rows deleted above moved this one up
+            record = schema.renumber(record, base, live)
+        return record
+
     def get_stats(self):
-        """Returns stats: Total, Verified, Pending."""
+        """Returns stats: Total, Verified, Pending, Rejected + program mix and weekly trend."""
         self.refresh_student_cache()
-        
-        total = 0
-        verified = 0
-        pending = 0
-        
-        for row, _ in self.student_cache.values():
-            total += 1
-            # Status is at index 17 (Col R).
-            status = row[17].strip().title() if len(row) > 17 else ""
-            
-            if status == "Approved":
-                verified += 1
-            elif not status or status == "Pending":
-                pending += 1
-                
-        return {
-            "total": total,
-            "verified": verified,
-            "pending": pending
-        }
+        # Counters are maintained on refresh/write, so this is O(1) in membership size
+        return self.stats.summary()
 
     def add_member(self, name, matric, ic, prog):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # New 18-col structure
+        # A=Time, B=Email, C=Name, D=Matric, E=Courses, F-I, J=IC, K-Q, R=Status
+        row = [""] * 18
+        row[0] = timestamp
+        row[1] = "bot_add"
+        row[2] = name
+        row[3] = matric
+        row[4] = prog # Courses
+        row[9] = ic   # IC Number
+        row[17] = "Approved" # Status
+        try:
+            self._journal("add_member", row=row) # Appended to the sheet by the replayer
+            return True
+        except Exception as e:
+            logger.error(f"Add Member Error: {e}")
+            return False
+
+    def _provisional_add(self, row):
+        """Edit that caches a journaled row right below the last cached row; the replayer
+        moves it to its real row once appended (_replay_add_member)."""
+        def add(cache, row_matric):
+            mat = str(row[schema.COL_MATRIC]).strip().upper()
+            if not mat or mat in cache:
+                return False
+            base = max(row_matric, default=1) + 1
+            cache[mat] = (schema.project(row), base)
+            row_matric[base] = mat
+            self._stats.add(cache[mat][0])
+        return add
+
+    def _replay_add_member(self, row):
+        sheet = self._require_sheet("Registrations")
+        mat = str(row[schema.COL_MATRIC]).strip().upper()
+        cell = sheet.find(mat, in_column=schema.COL_MATRIC + 1) # Landed on an earlier attempt?
+        live = cell.row if cell else self._first_appended_row(sheet.append_row(row))
+        if live is None:
+            self.last_student_refresh = 0 # Can't place the row, reload next time
+            return
+        
+        def place(cache, row_matric):
+            base = live + len(self._deleted)
+            if mat not in cache or cache[mat][1] == base:
+                return False
+            cached, old = cache[mat]
+            if row_matric.get(old) == mat:
+                del row_matric[old]
+            cache[mat] = (cached, base)
+            row_matric[base] = mat
+        self._store.write(self._edit_students, place)
+
+    def bulk_add_members(self, rows, chunk_size=500, pace=1.1, retries=5):
+        """Appends rows in chunks (one append_rows call each, >= `pace` seconds apart) and
+        merges them into the cache without a full reload. Backs off on 429 quota errors.
+        Returns (written, error or None)."""
         sheet = self.get_sheet("Registrations")
-        if sheet:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # New 18-col structure
-            # A=Time, B=Email, C=Name, D=Matric, E=Courses, F-I, J=IC, K-Q, R=Status
-            row = [""] * 18
-            row[0] = timestamp
-            row[1] = "bot_add"
-            row[2] = name
-            row[3] = matric
-            row[4] = prog # Courses
-            row[9] = ic   # IC Number
-            row[17] = "Approved" # Status
+        if not sheet:
+            return 0, "Registrations sheet unavailable"
+        
+        written = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if start:
+                time.sleep(pace) # Stay under the per-minute write quota
+            for attempt in range(retries):
+                try:
+                    # A journal replay (e.g. a delete) between the append and its merge would
+                    # shift the rows under the base rows the merge computes
+                    with self._student_refresh_lock:
+                        first_row = self._first_appended_row(sheet.append_rows(chunk))
+                        if first_row is not None:
+                            self._store.write(self._edit_students, self._merge_rows(chunk, first_row))
+                    break
+                except gspread.exceptions.APIError as e:
+                    if getattr(e, "code", None) != 429 or attempt == retries - 1:
+                        logger.error(f"Bulk Add Error after {written} rows: {e}")
+                        return written, str(e)
+                    wait = 2 ** attempt * 5
+                    logger.warning(f"⚠️ Sheets quota hit, retrying chunk in {wait}s")
+                    time.sleep(wait) # Outside the lock
             
-            sheet.append_row(row)
-            # Invalidate cache to force reload next time (simplest way to get correct row index)
-            self.last_student_refresh = 0
-            return True
-        return False
+            written += len(chunk)
+            if first_row is None:
+                self.last_student_refresh = 0 # Can't place the rows, reload next time
+        return written, None
+
+    @staticmethod
+    def _first_appended_row(resp):
+        """Sheet row of the first appended row, from updatedRange ("'Registrations'!A1001:T1500")."""
+        try:
+            updated = resp["updates"]["updatedRange"].split("!")[-1]
+            return int(re.match(r"[A-Z]+(\d+)", updated).group(1))
+        except (KeyError, TypeError, AttributeError):
+            return None
+
+    def _merge_rows(self, chunk, first_row):
+        """Edit that adds rows appended at live `first_row` onwards (below every cached row,
+        so each base row is the live row plus all deletions so far)."""
+        def merge(cache, row_matric):
+            first_base = first_row + len(self._deleted)
+            for offset, row in enumerate(chunk):
+                mat = str(row[schema.COL_MATRIC]).strip().upper()
+                if not mat or mat in cache:
+                    continue
+                row = schema.project(row) # Same shape as loaded rows
+                cache[mat] = (row, first_base + offset)
+                row_matric[first_base + offset] = mat
+                self._stats.add(row)
+        return merge
 
     def get_members(self, limit=50):
+        """Newest `limit` rows (first page of page_members)."""
+        return self.page_members(limit=limit)["rows"]
+
+    def page_members(self, cursor=None, limit=15, direction="next"):
+        """One page of members, newest first. O(log n + limit), no copy of the cache.
+
+        cursor: sheet row index of an edge item from the previous page (None = newest page).
+        direction: "next" = older than cursor, "prev" = newer than cursor.
+        Returns {"rows", "start" (1-based rank of the first row), "total", "next", "prev"};
+        next/prev are cursors for the neighbouring pages (None at either end)."""
         self.refresh_student_cache()
-        # Convert cache dict values to list of ROWS only
-        # cache values are (row, index)
-        all_values = [row for row, idx in self.student_cache.values()]
-        # Cache isn't ordered by time necessarily (dict is insertion ordered in Py3.7+ but depends on load)
-        # Actually sheet load order is preserved.
-        # Reverse
-        return all_values[::-1][:limit]
+        data = self._store.data("students") # One snapshot for the whole page
+        order, total = data.order, len(data.order)
+
+        # [lo, hi) slice of the ascending order that this page covers
+        if direction == "prev" and cursor is not None:
+            lo = bisect_right(order, cursor)
+            hi = min(total, lo + limit)
+        else:
+            hi = total if cursor is None else bisect_left(order, cursor)
+            lo = max(0, hi - limit)
+
+        rows = [data.students[data.row_matric[idx]][0] for idx in reversed(order[lo:hi])]
+        return {
+            "rows": rows,
+            "start": total - hi + 1,
+            "total": total,
+            "next": order[lo] if rows and lo > 0 else None,
+            "prev": order[hi - 1] if rows and hi < total else None,
+        }
 
     def search_members(self, query):
         self.refresh_student_cache()
@@ -282,24 +1118,186 @@ class Database:
                     matches.append(row)
         return matches
 
+    def search_index(self, refresh=True):
+        """SearchIndex for the current student snapshot. Edits keep it current in place
+        (_advance_search_index); it is rebuilt only after a reload. refresh=False never
+        touches Sheets (inline queries)."""
+        if refresh:
+            self.refresh_student_cache()
+        snap = self._store.get("students")
+        index = self._search_index
+        if index is None or index.version < snap.version: # Newer: an edit landed since `snap`
+            with self._index_lock:
+                index = self._search_index
+                if index is None or index.version < snap.version:
+                    index = SearchIndex(snap.data.students, snap.version)
+                    self._search_index = index
+        return index
+
+    def fuzzy_search(self, query, limit=50):
+        """Ranked [(score, row)] name matches, tolerant to typos, accents and word order."""
+        return self.search_index().fuzzy(query, limit)
+
     def delete_member(self, matric):
-        sheet = self.get_sheet("Registrations")
-        if sheet:
-            # Matric is Col D (4)
-            cell = sheet.find(matric, in_column=4)
-            if cell:
-                sheet.delete_rows(cell.row)
-                
-                # Update Cache Immediately
-                if matric in self.student_cache:
-                    del self.student_cache[matric]
-                
-                # Force full refresh next time to handle duplicates/consistency
-                self.last_student_refresh = 0
-                    
-                return True, cell.row
+        """Drops a cached member now; the sheet row is deleted by the replayer.
+        Returns (True, live row) or (False, None) if the matric isn't cached."""
+        self.refresh_student_cache()
+        row = self.sheet_row(matric)
+        if not row:
             return False, None
-        return None, None
+        self._journal("delete_member", matric=matric, base=None) # base: filled in by _drop_member
+        return True, row
+
+    def _drop_member(self, entry):
+        """Edit that drops a journaled delete's member and records its base row in the entry.
+        Rows below it keep their live position until the sheet row is really gone."""
+        args = entry["args"]
+        def drop(cache, row_matric):
+            args["base"] = None
+            if args["matric"] not in cache:
+                return False # Not in the sheet (any more)
+            old, idx = cache.pop(args["matric"])
+            row_matric.pop(idx, None)
+            args["base"] = idx
+            self._stats.remove(old)
+        return drop
+
+    def _replay_delete_member(self, matric, base):
+        sheet = self._require_sheet("Registrations")
+        live = self._live_row(self._store.data("students"), base) if base else None
+        if live:
+            row = self._check_rows(sheet, {matric: live}).get(matric)
+        else:
+            cell = sheet.find(matric, in_column=schema.COL_MATRIC + 1)
+            row = cell.row if cell else None
+        if not row:
+            return # Already gone (an earlier attempt, or a manual edit)
+        sheet.delete_rows(row)
+        if row != live:
+            self.last_student_refresh = 0 # Found elsewhere: cache is out of step, reload
+            return
+        
+        # Remember the base row so every later row's live position shifts up by one (no reload)
+        def shift():
+            insort(self._deleted, base)
+            self._publish_deleted()
+        self._store.write(shift)
+
+    # --- SESSION ARCHIVES ---
+    # Past academic sessions live in their own "Archive <label>" tabs (listed in the
+    # system_archives tab) so Registrations, and every reload of it, only holds the current
+    # session. Archived members still verify, with their session's ID prefix.
+    def archive_session(self, label, new_prefix, before=None, dry_run=False):
+        """Moves the leading Registrations rows (all of them, or those registered before the
+        date `before`) to a new "Archive <label>" tab, records it in system_archives and
+        switches member_id_prefix to `new_prefix`. Returns (rows, error or None);
+        with dry_run only counts. Blocking."""
+        sh = self._get_spreadsheet()
+        ws = self.get_sheet("Registrations")
+        if not sh or not ws:
+            return 0, "Registrations sheet unavailable"
+        tab = f"Archive {label}"
+        
+        try:
+            # Held from the read to the delete: the rows go by position, so no journal replay
+            # (e.g. a delete) may shift them in between
+            with self._student_refresh_lock:
+                count = self._archive_rows(sh, ws, tab, before, dry_run)
+        except Exception as e:
+            logger.error(f"Archive Session Error: {e}")
+            return 0, str(e)
+        if dry_run or not count:
+            return count, None
+        
+        # 3. Index last: if this fails the rows are still safe in their archive tab
+        error = None
+        try:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.get_sheet("system_archives").append_row([tab, label, self.config["member_id_prefix"], count, timestamp])
+        except Exception as e:
+            error = f"Rows moved to '{tab}', but it could not be added to system_archives: {e}"
+            logger.error(f"Archive Index Error: {error}")
+        
+        logger.info(f"📦 Archived {count} rows to '{tab}', new ID prefix {new_prefix}")
+        self.set_config("member_id_prefix", new_prefix)
+        self.refresh_student_cache(force=True) # Blocks until the reload has run
+        self.load_archives()
+        return count, error
+
+    def _archive_rows(self, sh, ws, tab, before, dry_run):
+        """[refresh lock] Copies the leading rows to `tab` and deletes them from Registrations.
+        Returns the row count; raises (after removing `tab` again) if they couldn't be moved."""
+        all_rows = ws.get_all_values() # Every column: archives keep the full record
+        header, data = all_rows[0], all_rows[1:]
+        count = len(data)
+        if before:
+            # Rows are in registration order: stop at the first one of the new session
+            count = 0
+            for row in data:
+                day = schema.parse_entry_date(schema.cell(row, schema.COL_TIMESTAMP))
+                if day is None or day >= before:
+                    break
+                count += 1
+        if dry_run or not count:
+            return count
+        
+        try:
+            sh.worksheet(tab)
+            raise ValueError(f"Tab '{tab}' already exists")
+        except gspread.WorksheetNotFound:
+            pass
+        
+        # 1. Copy (same row positions, so archived IDs don't change)
+        archive = sh.add_worksheet(title=tab, rows=count + 1, cols=len(header))
+        try:
+            archive.append_rows([header] + data[:count])
+            # 2. Delete, once the last archived row is still where it was read (a manual edit
+            # in the sheet could have moved it). A sheet must keep one row below its frozen
+            # header (Form responses freeze it), so a spare blank row goes in first when
+            # every row is archived
+            last = ws.batch_get([gspread.utils.rowcol_to_a1(count + 1, schema.COL_MATRIC + 1)])[0]
+            now = str(last[0][0]).strip() if last and last[0] else ""
+            if now != str(schema.cell(data[count - 1], schema.COL_MATRIC)).strip():
+                raise ValueError("Registrations changed while archiving, nothing was moved. Try again")
+            if count == len(data):
+                ws.add_rows(1)
+            ws.delete_rows(2, count + 1)
+        except Exception:
+            try:
+                sh.del_worksheet(archive) # Roll back: the rows are still (only) in Registrations
+            except Exception as e:
+                logger.error(f"Archive Rollback Error, remove the '{tab}' tab by hand: {e}")
+            raise
+        return count
+
+    def load_archives(self):
+        """Builds the archive lookup {matric: VerifyRecord} from every tab listed in
+        system_archives (hot columns only). Archives never change, so this runs at warm-up
+        and after a rollover. Blocking."""
+        try:
+            index = self.get_sheet("system_archives")
+            sh = self._get_spreadsheet()
+            if not index or not sh: return
+            
+            records, dates, tabs = {}, {}, 0
+            for entry in index.get_all_values()[1:]: # Oldest first: later sessions win on repeats
+                tab = schema.cell(entry, 0).strip()
+                if not tab: continue
+                prefix = schema.cell(entry, 2).strip() or schema.MEMBER_ID_PREFIX
+                try:
+                    rows = self._read_registrations(sh.worksheet(tab))
+                except gspread.WorksheetNotFound:
+                    logger.warning(f"⚠️ Archive tab '{tab}' is listed but missing")
+                    continue
+                for mat, (row, idx) in self._index_rows(rows).items():
+                    records[mat] = schema.verify_record(mat, row, idx, dates, prefix)
+                tabs += 1
+            
+            self._store.write(self._store.publish, "archives", MappingProxyType(records))
+            self.ready["archives"] = True
+            logger.info(f"Archive Index Loaded: {len(records)} records from {tabs} tabs.")
+        except Exception as e:
+            logger.error(f"Archive Load Error: {e}")
 
     # --- USER TRACKING FOR BROADCAST ---
     def get_users_sheet(self):
@@ -325,7 +1323,9 @@ class Database:
             return # Already logged this run
             
         try:
-            self.logged_users_cache.add(user_id) # Mark as logged immediately
+            # Mark as logged immediately (check-and-add on the owner, so two threads can't both log)
+            if not self._store.write(self._add_users, (user_id,)):
+                return
             
             sheet = self.get_users_sheet()
             if not sheet: return
@@ -340,6 +1340,28 @@ class Database:
         except Exception as e:
             logger.error(f"Log User Error: {e}")
 
+    def _add_users(self, user_ids):
+        """[owner] Publishes users + `user_ids`. Returns True if any were new."""
+        current = self.logged_users_cache
+        users = current.union(user_ids)
+        if len(users) == len(current):
+            return False
+        self._store.publish("users", users)
+        return True
+
+    def load_user_registry(self):
+        """Seeds logged_users_cache from the Users sheet so a restart doesn't re-log known users."""
+        sheet = self.get_users_sheet()
+        if not sheet: return
+        
+        try:
+            ids = sheet.col_values(1)[1:] # Skip header
+            self._store.write(self._add_users, [int(x) for x in ids if str(x).isdigit()])
+            self.ready["users"] = True
+            logger.info(f"User Registry Loaded: {len(self.logged_users_cache)} users.")
+        except Exception as e:
+            logger.error(f"Load Users Error: {e}")
+
     def get_all_users(self):
         """Returns unique list of all user IDs from the log sheet."""
         sheet = self.get_users_sheet()
@@ -379,32 +1401,23 @@ class Database:
 
     # --- APPROVAL WORKFLOW ---
     def get_unprocessed_registrations(self):
-        """Finds rows where Resit (Col 8) is present but Status (Col 9) is Empty."""
-        sheet = self.get_sheet("Registrations")
-        if not sheet: return []
-        try:
-            all_values = sheet.get_all_values()
-            unprocessed = []
-            
-            # Start from row 2 (index 1) to skip header
-            for i, row in enumerate(all_values[1:], start=2):
-                # We need Col Q (index 16) for Receipt.
-                if len(row) <= 16: continue 
-                
-                receipt = row[16].strip()
-                # Status is Col R (index 17).
-                status = row[17].strip() if len(row) > 17 else ""
-                
-                if receipt and not status:
-                    # Valid registration needing approval
-                    unprocessed.append({
-                        'row': i,
-                        'data': row
-                    })
-            return unprocessed
-        except Exception as e:
-            logger.error(f"Error fetching members: {e}")
-            return []
+        """Finds rows where Receipt (Col Q) is present but Status (Col R) is Empty.
+        Scans the student snapshot (0 API calls; journaled writes already applied): new form
+        rows reach it through the change probe of refresh_student_cache."""
+        self.refresh_student_cache()
+        data = self._store.data("students") # One snapshot for the whole scan
+        unprocessed = []
+        for base in data.order:
+            row = data.students[data.row_matric[base]][0]
+            receipt = schema.cell(row, schema.COL_RECEIPT).strip()
+            status = schema.cell(row, schema.COL_STATUS).strip()
+            if receipt and not status:
+                # Valid registration needing approval
+                unprocessed.append({
+                    'row': self._live_row(data, base),
+                    'data': row
+                })
+        return unprocessed
 
     def get_members_by_filter(self, status_filter):
         """Get members filtered by Status (Col I)."""
@@ -412,13 +1425,17 @@ class Database:
         if not sheet: return []
         
         try:
-            rows = sheet.get_all_values()
+            rows = self._read_registrations(sheet) # Hot columns cover Name/Matric/IC/Prog/Status
+            statuses, deleted = self.pending_overlay() # Journaled, not in the sheet yet
             filtered = []
-            # Skip header (row 1)
-            for i, row in enumerate(rows[1:], start=2):
+            # Data starts at row 2 (header skipped by the read)
+            for i, row in enumerate(rows, start=2):
+                matric = str(row[3]).strip().upper() if len(row) > 3 else ""
+                if matric in deleted: continue
                 # Ensure row has enough columns (Col R is index 17)
                 # Status is Col R (index 17)
-                status = row[17].strip().title() if len(row) > 17 else ""
+                status = statuses.get(matric) or (row[17].strip() if len(row) > 17 else "")
+                status = status.strip().title()
                 
                 # Normalize '✓' to 'Approved' for filtering
                 if status == "✓": 
@@ -441,17 +1458,99 @@ class Database:
             logger.error(f"Error filtering members: {e}")
             return []
 
-    def update_status(self, row_index, status):
-        """Updates Column I (9) with status."""
-        sheet = self.get_sheet("Registrations")
-        if not sheet: return False
+    def update_status(self, row_index, status, matric=None):
+        """Sets Column R (18) of live row `row_index` to status (journaled, cached at once).
+        The replayer checks the row still holds `matric` (looked up from the cache if not
+        given) and re-locates it if it moved."""
+        if matric:
+            matric = str(matric).strip().upper()
+        else:
+            data = self._store.data("students")
+            matric = data.row_matric.get(self._base_row(data, row_index))
+            if not matric:
+                logger.error(f"Update Status Error: row {row_index} is not cached")
+                return False
         try:
-            # Update Cell (Row, Col 18 (R))
-            sheet.update_cell(row_index, 18, status)
+            self._journal("status", decisions={matric: status}, hints={matric: row_index})
             return True
         except Exception as e:
             logger.error(f"Update Status Error: {e}")
             return False
 
+    def pending_members(self):
+        """[(matric, row)] still waiting for a decision in the cache (Pending, or ✓ once the
+        poller told admins), oldest first (review queue)."""
+        self.refresh_student_cache()
+        return [
+            (mat, row) for mat, (row, _) in self.student_cache.items()
+            if schema.decision(schema.normalize_status(schema.cell(row, schema.COL_STATUS))) == schema.PENDING
+        ]
+
+    def set_statuses(self, decisions):
+        """Sets {matric: status} for cached members in ONE journal entry (replayed as one
+        batch_update). Returns the number of members changed."""
+        cached = self.student_cache
+        decisions = {mat: status for mat, status in decisions.items() if mat in cached}
+        if not decisions: return 0
+        try:
+            self._journal("status", decisions=decisions)
+            return len(decisions)
+        except Exception as e:
+            logger.error(f"Batch Status Error: {e}")
+            return 0
+
+    def _status_edit(self, decisions):
+        """Edit that applies {matric: status} to cached rows + counters."""
+        def apply(cache, row_matric):
+            for mat, status in decisions.items():
+                if mat not in cache:
+                    continue
+                row, idx = cache[mat]
+                new_row = list(row) + [""] * (schema.ROW_WIDTH - len(row))
+                new_row[schema.COL_STATUS] = status
+                self._stats.replace(row, new_row)
+                cache[mat] = (new_row, idx)
+        return apply
+
+    def _replay_statuses_one_by_one(self, entry):
+        """Replays one status entry a matric at a time. Returns ({matric: status}, last error)
+        of the writes Sheets rejected (empty if none); transient errors are raised."""
+        rejected, error = {}, None
+        for mat, status in entry["args"]["decisions"].items():
+            single = {**entry, "args": {"decisions": {mat: status}, "hints": entry["args"].get("hints", {})}}
+            try:
+                self._replay_statuses([single])
+            except Exception as e:
+                if is_transient(e):
+                    raise
+                rejected[mat], error = status, e
+        return rejected, error
+
+    def _replay_statuses(self, batch):
+        """Writes a run of status entries: ONE batch read checking the rows, ONE batch_update.
+        Re-writing a status that already landed is harmless, so retries are safe."""
+        decisions, hints = {}, {}
+        for entry in batch:
+            decisions.update(entry["args"]["decisions"]) # Later entries win
+            hints.update(entry["args"].get("hints", {}))
+        sheet = self._require_sheet("Registrations")
+        
+        data = self._store.data("students")
+        targets = {}
+        for mat in decisions:
+            hit = data.students.get(mat)
+            row = self._live_row(data, hit[1]) if hit else hints.get(mat) # Not cached yet: row it was seen at
+            if row:
+                targets[mat] = row
+        targets = self._check_rows(sheet, targets) # One read: every row still holds its matric
+        missing = decisions.keys() - targets.keys()
+        if missing:
+            logger.warning(f"⚠️ Status replay: {', '.join(sorted(missing))} no longer in the sheet")
+        if targets:
+            sheet.batch_update([
+                {"range": gspread.utils.rowcol_to_a1(row, schema.COL_STATUS + 1), "values": [[decisions[mat]]]} # R<row>
+                for mat, row in targets.items()
+            ])
+
 # Singleton instance
 db = Database()
@@ -0,0 +1,89 @@
+# Member Export (CSV / XLSX)
+#
+# Streams rows from the student cache ({matric: (row, idx)}) straight into a temp file, so
+# the output never sits in memory. By default only the cached (hot) columns are exported,
+# with no Sheets read; a full export passes `expand` (Database.iter_full_rows), which reads
+# every column in bounded chunks. Blocking: run it on workers.cpu (full: workers.sheets_read).
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import datetime
+import schema
+
+FORMATS = ("csv", "xlsx")
+GZIP_OVER_BYTES = 5 * 1024 * 1024 # CSVs bigger than this are sent as .csv.gz
+ALL_COLUMNS = list(range(len(schema.HEADERS)))
+HOT_COLUMNS = [idx for lo, hi in schema.HOT_SPANS for idx in range(lo, hi + 1)]
+
+def iter_members(students, status=None, program=None):
+    """Yields cached rows (sheet order), optionally filtered.
+    status: Approved / Pending (✓ rows included) / Rejected. program: case-insensitive substring."""
+    program = program.upper() if program else None
+    for row, _ in students.values():
+        if status and schema.decision(schema.normalize_status(schema.cell(row, schema.COL_STATUS))) != status:
+            continue
+        if program and program not in schema.normalize_program(schema.cell(row, schema.COL_PROGRAM)):
+            continue
+        yield row
+
+def _picked(rows, columns):
+    for row in rows:
+        yield [schema.cell(row, idx) for idx in columns]
+
+def write_csv(rows, path, columns=ALL_COLUMNS):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f: # BOM so Excel reads UTF-8
+        writer = csv.writer(f)
+        writer.writerow([schema.HEADERS[idx] for idx in columns])
+        for row in _picked(rows, columns):
+            writer.writerow(row)
+            count += 1
+    return count
+
+def write_xlsx(rows, path, columns=ALL_COLUMNS):
+    from openpyxl import Workbook # Imported on demand (only exports need it)
+    wb = Workbook(write_only=True) # Rows are flushed to disk as they are appended
+    ws = wb.create_sheet("Members")
+    ws.append([schema.HEADERS[idx] for idx in columns])
+    count = 0
+    for row in _picked(rows, columns):
+        ws.append(row)
+        count += 1
+    wb.save(path)
+    return count
+
+def gzip_file(path):
+    """Compresses `path` to `path`.gz in chunks and removes the original."""
+    with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.remove(path)
+    return path + ".gz"
+
+def build_export(students, fmt="csv", status=None, program=None, expand=None):
+    """Writes matching members to a temp file. Returns (path, filename, count).
+    expand: rows -> full rows, for an every-column export (else the hot columns only).
+    The caller sends the file and removes it afterwards."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    stamp = datetime.now().strftime("%Y%m%d_%H%M")
+    parts = ["members", status, program.replace(" ", "_") if program else None, "full" if expand else None, stamp]
+    filename = "_".join(p for p in parts if p) + f".{fmt}"
+
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix="stem-export-")
+    os.close(fd)
+    try:
+        rows = iter_members(students, status, program)
+        columns = ALL_COLUMNS if expand else HOT_COLUMNS
+        if expand:
+            rows = expand(rows)
+        count = write_xlsx(rows, path, columns) if fmt == "xlsx" else write_csv(rows, path, columns)
+        if fmt == "csv" and os.path.getsize(path) > GZIP_OVER_BYTES:
+            path = gzip_file(path)
+            filename += ".gz"
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return path, filename, count
@@ -0,0 +1,356 @@
+# In-Process Google Sheets Stand-In (Offline Load/Latency Testing)
+#
+# Implements the subset of the gspread Client / Spreadsheet / Worksheet API that
+# database.py uses, so `Database(client=FakeClient(...))` runs with no network.
+# Enable for the whole bot with SHEETS_BACKEND=fake (see from_env()).
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+import gspread
+from gspread.cell import Cell
+
+REGISTRATION_HEADERS = [
+    "Timestamp", "Email Address", "Name", "Matrics Number", "Courses", "Semester",
+    "Phone Number", "Personal Email", "USAS Email", "IC Number", "Birthday",
+    "Birth Place", "Address", "Date of Entry", "Minute Number", "Membership Number",
+    "Receipt Proof", "Status", "Payment Receipt", "Invoice No"
+]
+
+PROGRAMS = [
+    "DIPLOMA TEKNOLOGI MAKLUMAT",
+    "DIPLOMA MULTIMEDIA DENGAN DAKWAH",
+    "IJAZAH SARJANA MUDA SAINS KOMPUTER",
+    "IJAZAH SARJANA MUDA MULTIMEDIA KREATIF",
+    "IJAZAH SARJANA MUDA PERTANIAN",
+    "IJAZAH SARJANA MUDA SENI BINA LANDSKAP",
+]
+
+FIRST_NAMES = [
+    "Muhammad", "Ahmad", "Nur", "Siti", "Aisyah", "Aiman", "Hakim", "Farah", "Nurul",
+    "Amir", "Irfan", "Hafiz", "Syafiqah", "Zulaikha", "Danial", "Iman", "Adam", "Balqis",
+]
+LAST_NAMES = [
+    "Abdullah", "Ismail", "Hassan", "Rahman", "Ibrahim", "Yusof", "Othman", "Salleh",
+    "Zakaria", "Hamzah", "Razak", "Aziz", "Kamal", "Harun", "Mokhtar", "Sulaiman",
+]
+PLACES = ["Kuala Lumpur", "Shah Alam", "Kuantan", "Ipoh", "Kota Bharu", "Johor Bahru"]
+
+# Status mix of a real intake: mostly approved, some seen ('✓'), pending, rejected
+STATUS_WEIGHTS = [("Approved", 70), ("✓", 10), ("", 15), ("Rejected", 5)]
+
+def synthetic_registrations(n, seed=0, start=None):
+    """Deterministic fake Registrations rows (A-T). Same seed -> same rows,
+    so a load generator can rebuild the matric/IC pairs the backend was seeded with."""
+    rng = random.Random(seed)
+    start = start or datetime(2024, 9, 1, 8, 0, 0)
+    statuses = [s for s, _ in STATUS_WEIGHTS]
+    weights = [w for _, w in STATUS_WEIGHTS]
+    rows = []
+    for i in range(n):
+        ts = start + timedelta(minutes=7 * i + rng.randint(0, 6))
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} Bin {rng.choice(LAST_NAMES)}"
+        matric = f"I{ts.year % 100:02d}{i:06d}"
+        birth = datetime(2003, 1, 1) + timedelta(days=rng.randint(0, 1500))
+        ic = f"{birth:%y%m%d}-{rng.randint(1, 16):02d}-{rng.randint(0, 9999):04d}"
+        status = rng.choices(statuses, weights)[0]
+        receipt = f"https://drive.google.com/open?id=fake{i}" if status or rng.random() < 0.8 else ""
+        rows.append([
+            ts.strftime("%Y-%m-%d %H:%M:%S"),
+            f"{matric.lower()}@example.com",
+            name,
+            matric,
+            rng.choice(PROGRAMS),
+            str(rng.randint(1, 8)),
+            f"01{rng.randint(10000000, 99999999)}",
+            f"{matric.lower()}@mail.example.com",
+            f"{matric.lower()}@student.usas.edu.my",
+            ic,
+            birth.strftime("%d/%m/%Y"),
+            rng.choice(PLACES),
+            f"No {rng.randint(1, 99)}, Jalan {rng.choice(LAST_NAMES)}, {rng.choice(PLACES)}",
+            ts.strftime("%d/%m/%Y"),
+            str(i + 1),
+            f"STEM(25/26){i + 1:04d}",
+            receipt,
+            status,
+            f"https://drive.google.com/open?id=rcpt{i}" if status == "Approved" else "",
+            f"INV{i + 1:06d}",
+        ])
+    return rows
+
+class _FakeResponse:
+    """Just enough of requests.Response for gspread.exceptions.APIError."""
+    def __init__(self, code, message, status):
+        self.status_code = code
+        self.text = message
+        self._error = {"code": code, "message": message, "status": status}
+
+    def json(self):
+        return {"error": self._error}
+
+def api_error(code, message, status):
+    return gspread.exceptions.APIError(_FakeResponse(code, message, status))
+
+class FakeBackend:
+    """Shared fault model for every worksheet of a spreadsheet.
+    latency: seconds added to every call (+ uniform `jitter`).
+    error_rate: probability of a 500 on any call.
+    quota_per_minute: sliding window like Sheets' per-user quota; excess -> 429."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, quota_per_minute=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.calls = Counter() # {method: count}, for benchmarks
+        self._rng = random.Random(seed)
+        self._window = deque()
+        self._lock = threading.Lock()
+
+    def call(self, method):
+        """Accounts one API request; sleeps/raises according to the fault model."""
+        with self._lock:
+            self.calls[method] += 1
+            now = time.monotonic()
+            if self.quota_per_minute:
+                while self._window and now - self._window[0] > 60:
+                    self._window.popleft()
+                if len(self._window) >= self.quota_per_minute:
+                    raise api_error(429, "Quota exceeded for quota metric 'Read requests'", "RESOURCE_EXHAUSTED")
+                self._window.append(now)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise api_error(500, "Internal error encountered.", "INTERNAL")
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, rows=None, frozen_rows=0):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.frozen_rows = frozen_rows # Form response sheets freeze their header row
+        self._rows = [[str(v) for v in r] for r in (rows or [])]
+        self._spare = 0 # Blank grid rows below the data (add_rows)
+        self._lock = threading.RLock()
+
+    def _call(self, method):
+        self.spreadsheet.backend.call(method)
+
+    @property
+    def row_count(self):
+        """Grid height: the data rows plus any blank rows added below them."""
+        with self._lock:
+            return len(self._rows) + self._spare
+
+    def _range(self, row, width):
+        return f"'{self.title}'!A{row}:{gspread.utils.rowcol_to_a1(row, max(width, 1))}"
+
+    # --- Reads ---
+    def get_all_values(self):
+        self._call("get_all_values")
+        with self._lock:
+            width = max((len(r) for r in self._rows), default=0)
+            return [r + [""] * (width - len(r)) for r in self._rows]
+
+    def get_all_records(self, head=1):
+        self._call("get_all_records")
+        with self._lock:
+            if len(self._rows) < head:
+                return []
+            keys = self._rows[head - 1]
+            records = []
+            for r in self._rows[head:]:
+                values = [gspread.utils.numericise(v) for v in r] + [""] * (len(keys) - len(r))
+                records.append(dict(zip(keys, values)))
+            return records
+
+    def col_values(self, col):
+        self._call("col_values")
+        with self._lock:
+            values = [r[col - 1] if len(r) >= col else "" for r in self._rows]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def find(self, query, in_row=None, in_column=None, case_sensitive=True):
+        self._call("find")
+        query = str(query)
+        with self._lock:
+            for r, row in enumerate(self._rows, start=1):
+                if in_row and r != in_row:
+                    continue
+                for c, value in enumerate(row, start=1):
+                    if in_column and c != in_column:
+                        continue
+                    if value == query or (not case_sensitive and value.lower() == query.lower()):
+                        return Cell(r, c, value)
+        return None
+
+    def _slice(self, a1):
+        """Values in an A1 range (no sheet prefix), trimmed like the Values API does."""
+        grid = gspread.utils.a1_range_to_grid_range(a1)
+        r0, r1 = grid.get("startRowIndex", 0), grid.get("endRowIndex")
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        with self._lock:
+            values = [r[c0:c1] for r in self._rows[r0:r1]]
+        for row in values:
+            while row and row[-1] == "":
+                row.pop()
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def batch_get(self, ranges, **kwargs):
+        """[values of each A1 range] in ONE call, like Worksheet.batch_get."""
+        self._call("batch_get")
+        for a1 in ranges:
+            start = gspread.utils.a1_range_to_grid_range(a1).get("startRowIndex", 0)
+            if start >= self.row_count:
+                raise api_error(400, f"Range ('{self.title}'!{a1}) exceeds grid limits. Max rows: {self.row_count}", "INVALID_ARGUMENT")
+        return [self._slice(a1) for a1 in ranges]
+
+    # --- Writes ---
+    def append_row(self, values, **kwargs):
+        return self.append_rows([values], **kwargs)
+
+    def append_rows(self, values, **kwargs):
+        self._call("append_rows")
+        with self._lock:
+            first = len(self._rows) + 1
+            width = 0
+            for v in values:
+                self._rows.append([str(x) for x in v])
+                width = max(width, len(v))
+            last = len(self._rows)
+            self._spare = max(0, self._spare - len(values)) # Appends fill blank grid rows first
+        updated = f"'{self.title}'!A{first}:{gspread.utils.rowcol_to_a1(last, max(width, 1))}"
+        return {"updates": {"updatedRange": updated, "updatedRows": len(values)}}
+
+    def update_cell(self, row, col, value):
+        self._call("update_cell")
+        with self._lock:
+            while len(self._rows) < row:
+                self._rows.append([])
+            target = self._rows[row - 1]
+            if len(target) < col:
+                target.extend([""] * (col - len(target)))
+            target[col - 1] = str(value)
+        return {"updatedRange": self._range(row, col)}
+
+    def batch_update(self, data, **kwargs):
+        """[{"range": "R5", "values": [[...]]}, ...] in ONE call, like Worksheet.batch_update."""
+        self._call("batch_update")
+        with self._lock:
+            for item in data:
+                grid = gspread.utils.a1_range_to_grid_range(item["range"].split("!")[-1])
+                top, left = grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0)
+                for r, values in enumerate(item["values"], start=top):
+                    while len(self._rows) <= r:
+                        self._rows.append([])
+                    target = self._rows[r]
+                    for c, value in enumerate(values, start=left):
+                        if len(target) <= c:
+                            target.extend([""] * (c + 1 - len(target)))
+                        target[c] = str(value)
+        return {"totalUpdatedCells": sum(len(v) for item in data for v in item["values"])}
+
+    def add_rows(self, rows):
+        self._call("add_rows")
+        with self._lock:
+            self._spare += rows
+
+    def delete_rows(self, start_index, end_index=None):
+        self._call("delete_rows")
+        end_index = end_index or start_index
+        with self._lock:
+            if len(self._rows) + self._spare - (end_index - start_index + 1) <= self.frozen_rows:
+                raise api_error(400, "Invalid requests[0].deleteDimension: You can't delete all the rows on the sheet.", "INVALID_ARGUMENT")
+            del self._rows[start_index - 1:end_index]
+        return {}
+
+class FakeSpreadsheet:
+    def __init__(self, backend=None, registrations=None):
+        self.backend = backend or FakeBackend()
+        self.id = "fake-sheet"
+        self._sheets = {}
+        self._order = []
+        self._lock = threading.Lock()
+        self._add("Registrations", [REGISTRATION_HEADERS] + list(registrations or []), frozen_rows=1)
+
+    def _add(self, title, rows=None, frozen_rows=0):
+        ws = FakeWorksheet(self, title, rows, frozen_rows)
+        self._sheets[title] = ws
+        self._order.append(ws)
+        return ws
+
+    @property
+    def sheet1(self):
+        return self._order[0]
+
+    def worksheet(self, title):
+        self.backend.call("worksheet")
+        with self._lock:
+            if title not in self._sheets:
+                raise gspread.WorksheetNotFound(title)
+            return self._sheets[title]
+
+    def values_batch_get(self, ranges, params=None):
+        """One request for several ranges, e.g. ["'system_admins'!A:C", "'system_config'!A:B"]."""
+        self.backend.call("values_batch_get")
+        value_ranges = []
+        for rng in ranges:
+            title, _, a1 = rng.rpartition("!")
+            title = title.strip("'") or self.sheet1.title
+            with self._lock:
+                ws = self._sheets.get(title)
+            if ws is None:
+                raise api_error(400, f"Unable to parse range: {rng}", "INVALID_ARGUMENT")
+            entry = {"range": rng, "majorDimension": "ROWS"}
+            values = ws._slice(a1)
+            if values:
+                entry["values"] = values # The API omits empty ranges entirely
+            value_ranges.append(entry)
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def add_worksheet(self, title, rows=100, cols=10):
+        self.backend.call("add_worksheet")
+        with self._lock:
+            return self._add(title)
+
+    def del_worksheet(self, worksheet):
+        self.backend.call("del_worksheet")
+        with self._lock:
+            del self._sheets[worksheet.title]
+            self._order.remove(worksheet)
+
+class FakeClient:
+    """Drop-in for gspread.Client: every key opens the same in-memory spreadsheet."""
+    def __init__(self, spreadsheet=None):
+        self.spreadsheet = spreadsheet or FakeSpreadsheet()
+
+    def open_by_key(self, key):
+        self.spreadsheet.backend.call("open_by_key")
+        return self.spreadsheet
+
+def make_client(rows=0, seed=0, **fault_model):
+    """FakeClient seeded with `rows` synthetic registrations."""
+    backend = FakeBackend(seed=seed, **fault_model)
+    spreadsheet = FakeSpreadsheet(backend, synthetic_registrations(rows, seed=seed))
+    return FakeClient(spreadsheet)
+
+def from_env():
+    """Builds the fake from FAKE_SHEETS_* env vars (used when SHEETS_BACKEND=fake)."""
+    quota = int(os.getenv("FAKE_SHEETS_QUOTA", "0"))
+    return make_client(
+        rows=int(os.getenv("FAKE_SHEETS_ROWS", "1000")),
+        seed=int(os.getenv("FAKE_SHEETS_SEED", "0")),
+        latency=float(os.getenv("FAKE_SHEETS_LATENCY_MS", "0")) / 1000,
+        jitter=float(os.getenv("FAKE_SHEETS_JITTER_MS", "0")) / 1000,
+        error_rate=float(os.getenv("FAKE_SHEETS_ERROR_RATE", "0")),
+        quota_per_minute=quota or None,
+    )
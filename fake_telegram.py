@@ -0,0 +1,257 @@
+# Local Telegram Bot API Stand-In
+#
+# Answers the Bot API methods this project calls and records every call, so the
+# bot can run offline against it: set TELEGRAM_API_URL=http://127.0.0.1:8081
+#
+#   python fake_telegram.py --port 8081 --latency-ms 40 --retry-after-rate 0.02 --forbidden 111,222
+#
+# GET /_calls?method=sendMessage   -> recorded calls (JSON);  DELETE /_calls -> reset
+# POST /_updates  (Update JSON)    -> queued for getUpdates (polling mode)
+# PUT /_files/{file_id}  (bytes)   -> served to getFile + download (document uploads)
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+BOT_USER = {"id": 100000001, "is_bot": True, "first_name": "Fake STEM Bot", "username": "fake_stem_bot"}
+
+# Parameters PTB sends JSON-encoded inside form fields
+JSON_PARAMS = {"reply_markup", "entities", "commands", "allowed_updates", "link_preview_options", "results"}
+
+# Methods that deliver something to a chat (subject to flood limits / blocked users)
+SEND_METHODS = {"sendmessage", "senddocument", "sendphoto", "editmessagetext", "copymessage", "forwardmessage"}
+
+class FakeTelegram:
+    """In-memory Bot API: every request is appended to `calls` as
+    {"method", "params", "at", "status"} and sent texts are kept per chat for quick checks.
+
+    latency / jitter: seconds added to every call.
+    retry_after_rate: chance a send method answers 429 (PTB raises RetryAfter).
+    global_rate: sends/sec allowed across all chats (Telegram ~30); excess -> 429.
+    forbidden: chat ids that "blocked the bot" -> 403 (PTB raises Forbidden).
+    log_path: optional JSONL file that mirrors the call log."""
+
+    def __init__(self, latency=0.0, jitter=0.0, retry_after_rate=0.0, retry_after=1,
+                 global_rate=None, forbidden=None, log_path=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.retry_after_rate = retry_after_rate
+        self.retry_after = retry_after
+        self.global_rate = global_rate
+        self.forbidden = set(forbidden or [])
+        self.log_path = log_path
+
+        self.calls = []
+        self.sent = defaultdict(list) # {chat_id: [text, ...]}
+        self.webhook_url = ""
+        self.updates = deque() # Pending updates for getUpdates
+        self.files = {} # {file_id: bytes} downloadable via getFile
+        self._message_id = 0
+        self._send_window = deque()
+        self._rng = random.Random(seed)
+
+    # --- Request Parsing ---
+    @staticmethod
+    async def _params(request):
+        if request.content_type == "application/json":
+            return await request.json()
+        params = {}
+        form = await request.post()
+        for key, value in form.items():
+            if isinstance(value, web.FileField):
+                params[key] = {"filename": value.filename, "size": len(value.file.read())}
+            elif key in JSON_PARAMS:
+                params[key] = json.loads(value)
+            else:
+                params[key] = value
+        for key in ("chat_id", "message_id"):
+            if str(params.get(key, "")).lstrip("-").isdigit():
+                params[key] = int(params[key])
+        return params
+
+    def _message(self, chat_id, message_id=None, **extra):
+        if message_id is None:
+            self._message_id += 1
+            message_id = self._message_id
+        msg = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+        }
+        msg.update(extra)
+        return msg
+
+    # --- Fault Injection ---
+    def _fault(self, method, params):
+        """Returns an error payload (Bot API shape) or None."""
+        if method not in SEND_METHODS:
+            return None
+        if params.get("chat_id") in self.forbidden:
+            return {"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"}
+
+        if self.retry_after_rate and self._rng.random() < self.retry_after_rate:
+            return self._flood()
+        if self.global_rate:
+            now = time.monotonic()
+            while self._send_window and now - self._send_window[0] > 1:
+                self._send_window.popleft()
+            if len(self._send_window) >= self.global_rate:
+                return self._flood()
+            self._send_window.append(now)
+        return None
+
+    def _flood(self):
+        return {
+            "ok": False,
+            "error_code": 429,
+            "description": f"Too Many Requests: retry after {self.retry_after}",
+            "parameters": {"retry_after": self.retry_after},
+        }
+
+    # --- Bot API Methods ---
+    def dispatch(self, method, params):
+        chat_id = params.get("chat_id")
+
+        if method == "getme":
+            return BOT_USER
+        if method == "sendmessage":
+            self.sent[chat_id].append(params.get("text", ""))
+            return self._message(chat_id, text=params.get("text", ""))
+        if method == "editmessagetext":
+            if params.get("inline_message_id"):
+                return True
+            return self._message(chat_id, params.get("message_id"), text=params.get("text", ""))
+        if method == "senddocument":
+            doc = params.get("document")
+            name = doc.get("filename") if isinstance(doc, dict) else "document"
+            self.sent[chat_id].append(f"[document] {name}")
+            return self._message(chat_id, document={"file_id": f"doc{self._message_id}", "file_unique_id": "u", "file_name": name})
+        if method == "getfile":
+            file_id = params.get("file_id", "")
+            data = self.files.get(file_id, b"")
+            return {"file_id": file_id, "file_unique_id": file_id, "file_size": len(data), "file_path": f"documents/{file_id}"}
+        if method == "setwebhook":
+            self.webhook_url = params.get("url", "")
+            return True
+        if method == "deletewebhook":
+            self.webhook_url = ""
+            if str(params.get("drop_pending_updates", "")).lower() == "true":
+                self.updates.clear()
+            return True
+        if method == "getwebhookinfo":
+            return {"url": self.webhook_url, "has_custom_certificate": False, "pending_update_count": len(self.updates)}
+        if method == "getupdates":
+            offset = int(params.get("offset", 0) or 0)
+            while self.updates and self.updates[0]["update_id"] < offset:
+                self.updates.popleft() # Confirmed by the client
+            return list(self.updates)
+        return True # setMyCommands, answerCallbackQuery, ...
+
+    async def handle(self, request):
+        method = request.match_info["method"].lower()
+        params = await self._params(request)
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if method == "getupdates" and not self.updates:
+            # Behave like a long poll with no updates instead of spinning the poller
+            await asyncio.sleep(min(float(params.get("timeout", 0) or 0), 1.0))
+
+        error = self._fault(method, params)
+        body = error or {"ok": True, "result": self.dispatch(method, params)}
+        self._record(request.match_info["method"], params, 200 if body["ok"] else body["error_code"])
+        return web.json_response(body, status=200 if body["ok"] else body["error_code"])
+
+    def _record(self, method, params, status):
+        call = {"method": method, "params": params, "at": time.time(), "status": status}
+        self.calls.append(call)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(call, ensure_ascii=False, default=str) + "\n")
+
+    # --- Control Endpoints ---
+    def push_update(self, update):
+        """Queues an Update for getUpdates (assigns update_id if missing)."""
+        if "update_id" not in update:
+            last = self.updates[-1]["update_id"] if self.updates else 0
+            update["update_id"] = last + 1
+        self.updates.append(update)
+
+    async def put_file(self, request):
+        self.files[request.match_info["file_id"]] = await request.read()
+        return web.json_response({"ok": True})
+
+    async def download(self, request):
+        data = self.files.get(request.match_info["file_id"])
+        if data is None:
+            return web.Response(status=404)
+        return web.Response(body=data)
+
+    async def list_calls(self, request):
+        method = request.query.get("method", "").lower()
+        calls = [c for c in self.calls if not method or c["method"].lower() == method]
+        return web.json_response({"count": len(calls), "calls": calls}, dumps=lambda o: json.dumps(o, default=str))
+
+    async def reset_calls(self, request):
+        self.calls.clear()
+        self.sent.clear()
+        return web.json_response({"ok": True})
+
+    async def post_update(self, request):
+        self.push_update(await request.json())
+        return web.json_response({"ok": True, "pending": len(self.updates)})
+
+    def make_app(self):
+        app = web.Application(client_max_size=50 * 1024 * 1024) # Bot API upload limit (sendDocument)
+        app.router.add_get("/_calls", self.list_calls)
+        app.router.add_delete("/_calls", self.reset_calls)
+        app.router.add_post("/_updates", self.post_update)
+        app.router.add_put("/_files/{file_id}", self.put_file)
+        app.router.add_get("/file/bot{token}/documents/{file_id}", self.download)
+        app.router.add_route("*", "/bot{token}/{method}", self.handle)
+        return app
+
+    async def start(self, host="127.0.0.1", port=8081):
+        """Starts serving in the running loop. Returns the AppRunner (call .cleanup() to stop)."""
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Fake Telegram API listening on http://{host}:{port}")
+        return runner
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Telegram Bot API stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--retry-after-rate", type=float, default=0, help="Chance of a 429 per send")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after seconds in 429 replies")
+    parser.add_argument("--global-rate", type=int, default=0, help="Sends/sec before 429 (0 = unlimited)")
+    parser.add_argument("--forbidden", default="", help="Comma separated chat ids that blocked the bot")
+    parser.add_argument("--log", default=None, help="Append calls to this JSONL file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+    api = FakeTelegram(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        retry_after_rate=args.retry_after_rate,
+        retry_after=args.retry_after,
+        global_rate=args.global_rate or None,
+        forbidden={int(x) for x in args.forbidden.split(",") if x.strip()},
+        log_path=args.log,
+    )
+    web.run_app(api.make_app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
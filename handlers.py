@@ -4,11 +4,13 @@ import strings
 import keyboards
 import states
 from database import db
+import schema
+import workers
 import logging
 import re
-import asyncio
 import os
 from datetime import datetime
+from lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,38 @@ async def check_keywords(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if text in strings.get_all('BTN_BACK'): return await start(update, context) # Default back to main, but sub-menus might handle back differently
     return None
 
+# Rendered verification replies: {(matric, lang): (VerifyRecord, text)}. A stale entry is
+# spotted by comparing records (usually the same object; renumbered ones are equal copies).
+VERIFY_REPLIES = LRUCache(maxsize=20000)
+
+def render_verification(record, lang):
+    """Reply text for a record whose IC already matched (memoized per member + language)."""
+    key = (record.matric, lang)
+    hit = VERIFY_REPLIES.get(key)
+    if hit is not None and (hit[0] is record or hit[0] == record):
+        return hit[1]
+    
+    if record.status in (schema.APPROVED, schema.NOTIFIED): # ✓ answers as Approved, like the original check
+        msg = strings.get('VERIFICATION_SUCCESS', lang).format(
+            membership_id=record.member_id,
+            name=record.name,
+            matric=record.matric,
+            program=record.program,
+            date=record.date
+        )
+    elif record.status == schema.REJECTED:
+        msg = strings.get('STATUS_REJECT', lang)
+    else:
+        # Explicit Pending, or empty/unknown status (waiting for an admin)
+        msg = strings.get('STATUS_PENDING', lang)
+    VERIFY_REPLIES.put(key, (record, msg))
+    return msg
+
+def format_age(seconds):
+    """'7 min' / '2 h 5 min' for stale-data notices."""
+    minutes = max(1, int(seconds // 60))
+    return f"{minutes // 60} h {minutes % 60} min" if minutes >= 60 else f"{minutes} min"
+
 # --- HANDLERS ---
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     context.user_data.setdefault('lang', strings.DEFAULT_LANG) # Init lang if missing
@@ -38,7 +72,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     
     # Maintenance Check
     if db.maintenance_mode and not db.is_admin(user.id):
-        await update.message.reply_text("🚧 *System Under Maintenance*\nPlease try again later.", parse_mode="Markdown")
+        notice = db.config.get("maintenance_message") or "🚧 *System Under Maintenance*\nPlease try again later."
+        await update.message.reply_text(notice, parse_mode="Markdown")
         return ConversationHandler.END
 
     # Log user for broadcast
@@ -50,8 +85,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     # Log user for broadcast (Done in background to improve speed)
     try:
-        loop = asyncio.get_running_loop()
-        loop.run_in_executor(None, db.log_user, user.id, user.first_name)
+        workers.sheets_write.spawn(db.log_user, user.id, user.first_name)
     except Exception as e:
         logger.error(f"Log user fail: {e}")
     return ConversationHandler.END
@@ -183,99 +217,37 @@ async def receive_ic(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     # loading_msg = await update.message.reply_text(strings.get('PROMPT_LOADING', lang), parse_mode="Markdown")
     
     user_matric = context.user_data['matric']
-    user_ic_last4 = text
     msg = strings.get('ERR_DB_CONNECTION', lang)
     
+    if not db.ready["students"]:
+        # Still warming up: a lookup now would reload the sheet on the event loop
+        await update.message.reply_text(strings.get('ERR_NOT_READY', lang), reply_markup=keyboards.get_main_menu(lang))
+        return ConversationHandler.END
+    
     try:
-        row_values, row_index = db.find_member(user_matric)
+        # Precomputed on cache refresh (IC last 4, normalized status, ID, date), reply memoized
+        record = db.find_verification(user_matric)
         
-        if row_values:
-            if len(row_values) > 9: # Need at least up to IC (Index 9)
-                # Gspread List 0-index values: A=0(Timestamp), C=2(Name), D=3(Matric), E=4(Courses/Prog)
-                # J=9(IC), Q=16(Receipt), R=17(Status)
-                db_timestamp = row_values[0]
-                db_name = row_values[2] 
-                db_ic = str(row_values[9]).strip().replace(" ", "") # J is 9
-                db_prog = row_values[4] # E is 4
-                # Col Q (index 16) is Receipt, Col R (index 17) is Status
-                db_resit = str(row_values[16]).strip() if len(row_values) > 16 else ""
-                db_status = str(row_values[17]).strip().title() if len(row_values) > 17 else ""
-                
-                # 1. If Status is explicit "Pending" or "Rejected" -> Use that.
-                # 2. If Status is "Approved" or "✓" -> Approved.
-                # 3. If Status is Empty -> Pending (Waiting for admin/bot).
-                
-                final_status = "Pending" # Default to Pending for safety
-                
-                if db_status in ["Pending", "Rejected"]:
-                    final_status = db_status
-                elif db_status in ["Approved", "✓"]:
-                    final_status = "Approved"
-                else:
-                    # Status is empty or unknown. Check Resit? 
-                    # User says: "if user row didnt have '✓' so it will notified to admin"
-                    # So treat as Pending.
-                    final_status = "Pending"
-
-                if db_ic.endswith(user_ic_last4):
-                    if final_status == "Approved": 
-                        # Generate Membership ID using Row Index (1-based from sheet, so ID 1 is Row 2)
-                        # We used len(row_values) > 9 check earlier, but row_index comes from find_member
-                        # row_values is now just the list, row_index is the int
-                        
-                        # Calculate ID: Row 2 -> 0001. So ID = Row - 1
-                        mem_id_num = row_index - 1 if row_index else 0
-                        membership_id = f"STEM(25/26){mem_id_num:04d}"
-                        
-                        # Format Date: 12/20/2025 (from db_timestamp)
-                        # db_timestamp is usually "2025-12-20 18:50:22" or similar depending on sheet locale
-                        # Let's try to parse and reformat, or just use date part if space split
-                        date_of_entry = db_timestamp.split(' ')[0]
-                        # If date is YYYY-MM-DD, change to MM/DD/YYYY? User requested 12/20/2025
-                        try:
-                            # Try standard formats
-                            dt = None
-                            if '-' in date_of_entry:
-                                dt = datetime.strptime(date_of_entry, "%Y-%m-%d")
-                            elif '/' in date_of_entry:
-                                # Often Sheets gives MM/DD/YYYY. Try parsing that.
-                                try:
-                                    dt = datetime.strptime(date_of_entry, "%m/%d/%Y")
-                                except ValueError:
-                                     # If that fails, try DD/MM/YYYY
-                                    dt = datetime.strptime(date_of_entry, "%d/%m/%Y")
-                            
-                            if dt:
-                                date_of_entry = dt.strftime("%d/%m/%y") # DD/MM/YY Format
-                        except ValueError:
-                            pass # Use raw string if parse fails
-
-                        msg = strings.get('VERIFICATION_SUCCESS', lang).format(
-                            membership_id=membership_id,
-                            name=db_name,
-                            matric=user_matric,
-                            program=db_prog,
-                            date=date_of_entry
-                        )
-                    elif final_status == "Pending":
-                        msg = strings.get('STATUS_PENDING', lang)
-                    elif final_status == "Rejected":
-                         msg = strings.get('STATUS_REJECT', lang)
-                    else:
-                         msg = strings.get('STATUS_PENDING', lang) # Fallback
-                else:
-                     # Specific localized error construction if needed, or simple string
-                     msg = "*Verification Failed*\nMatric found, but IC digits do not match." 
-                     if lang == 'MS': msg = "*Pengesahan Gagal*\nMatrik dijumpai, tetapi digit IC tidak sepadan."
-            else:
-                    msg = "Record found but data is incomplete."
-                    if lang == 'MS': msg = "Rekod dijumpai tetapi data tidak lengkap."
-        else:
+        if record is None:
             msg = strings.get('ERR_NOT_FOUND', lang)
+        elif record.status is None:
+            # Row stops before the IC column (J)
+            msg = "Record found but data is incomplete."
+            if lang == 'MS': msg = "Rekod dijumpai tetapi data tidak lengkap."
+        elif record.ic_last4 != text:
+            # Specific localized error construction if needed, or simple string
+            msg = "*Verification Failed*\nMatric found, but IC digits do not match." 
+            if lang == 'MS': msg = "*Pengesahan Gagal*\nMatrik dijumpai, tetapi digit IC tidak sepadan."
+        else:
+            msg = render_verification(record, lang)
                 
     except Exception as e:
         logger.error(e)
 
+    # Degraded mode: answered from the last good snapshot, say how old it is
+    if db.degraded and msg != strings.get('ERR_DB_CONNECTION', lang):
+        msg += strings.get('MSG_STALE_DATA', lang).format(age=format_age(db.data_age()))
+
     # AUTO DELETE LOADING MESSAGE
     # AUTO DELETE LOADING MESSAGE (Removed for speed cleanup)
     # try:
@@ -311,7 +283,7 @@ async def check_pending_now(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def check_registrations(context: ContextTypes.DEFAULT_TYPE):
     """Job to check for new unprocessed registrations."""
     try:
-        new_regs = db.get_unprocessed_registrations()
+        new_regs = await workers.sheets_read.run(db.get_unprocessed_registrations)
         if not new_regs: return
         
         # Notify ALL Admins (Super + Env + Sheet)
@@ -360,7 +332,7 @@ async def check_registrations(context: ContextTypes.DEFAULT_TYPE):
             
             # Mark as '✓' (Seen by Bot) to avoid spamming. 
             # Admin still needs to /approve or /reject later.
-            db.update_status(row_idx, "✓")
+            await workers.sheets_write.run(db.update_status, row_idx, "✓", matric)
             
     except Exception as e:
         logger.error(f"Check Regs Error: {e}")
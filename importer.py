@@ -0,0 +1,92 @@
+# Bulk Member Import (CSV)
+#
+# Reads an uploaded CSV one line at a time, maps its header onto the Registrations
+# layout (schema.HEADERS, plus a few common aliases) and keeps only valid rows whose
+# matric is new to both the cache and the file. Writing is Database.bulk_add_members().
+import csv
+import re
+from datetime import datetime
+import schema
+
+# Alternative header titles -> column index (HEADERS titles are always accepted)
+HEADER_ALIASES = {
+    "nama": schema.COL_NAME, "full name": schema.COL_NAME,
+    "matric no": schema.COL_MATRIC, "matric number": schema.COL_MATRIC, "no matrik": schema.COL_MATRIC,
+    "course": schema.COL_PROGRAM, "courses": schema.COL_PROGRAM, "programme": schema.COL_PROGRAM,
+    "ic number": schema.COL_IC, "ic no": schema.COL_IC, "no ic": schema.COL_IC,
+}
+MATRIC_RE = re.compile(r"^[A-Z0-9]{4,20}$")
+MAX_REPORTED_ERRORS = 10
+
+class ImportReport:
+    def __init__(self):
+        self.rows = []          # Valid new rows, ready for append_rows
+        self.total = 0          # Data lines read
+        self.existing = 0       # Matric already in the cache
+        self.file_dupes = 0     # Matric repeated inside the file
+        self.invalid = 0
+        self.errors = []        # First few "Line N: reason"
+        self.written = 0
+        self.write_error = None
+
+    def reject(self, line, reason):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line}: {reason}")
+
+def map_header(header):
+    """{csv column position: sheet column index} for recognised titles."""
+    titles = {t.lower(): i for i, t in enumerate(schema.HEADERS)}
+    titles.update(HEADER_ALIASES)
+    mapping = {}
+    for pos, title in enumerate(header):
+        idx = titles.get(title.strip().lower())
+        if idx is not None and idx not in mapping.values():
+            mapping[pos] = idx
+    return mapping
+
+def build_row(values, mapping, timestamp):
+    row = [""] * len(schema.HEADERS)
+    for pos, idx in mapping.items():
+        if pos < len(values):
+            row[idx] = values[pos].strip()
+    row[schema.COL_MATRIC] = row[schema.COL_MATRIC].upper().replace(" ", "")
+    # Same defaults as Database.add_member
+    row[schema.COL_TIMESTAMP] = row[schema.COL_TIMESTAMP] or timestamp
+    row[schema.COL_EMAIL] = row[schema.COL_EMAIL] or "bot_import"
+    row[schema.COL_STATUS] = row[schema.COL_STATUS] or schema.APPROVED
+    # Trim trailing empties past R (the structure the bot writes)
+    while len(row) > schema.ROW_WIDTH and not row[-1]:
+        row.pop()
+    return row
+
+def parse_members_csv(path, existing_matrics):
+    """Streams the CSV at `path`. existing_matrics: container of cached matrics.
+    Returns an ImportReport (raises ValueError if the header lacks Name/Matric)."""
+    report = ImportReport()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    seen = set()
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        mapping = map_header(next(reader, []))
+        if schema.COL_NAME not in mapping.values() or schema.COL_MATRIC not in mapping.values():
+            raise ValueError("CSV header needs at least 'Name' and 'Matric' columns")
+
+        for line, values in enumerate(reader, start=2):
+            if not any(v.strip() for v in values):
+                continue # Blank line
+            report.total += 1
+            row = build_row(values, mapping, timestamp)
+            matric = row[schema.COL_MATRIC]
+            if not row[schema.COL_NAME]:
+                report.reject(line, "missing name")
+            elif not MATRIC_RE.match(matric):
+                report.reject(line, f"invalid matric '{matric}'")
+            elif matric in existing_matrics:
+                report.existing += 1
+            elif matric in seen:
+                report.file_dupes += 1
+            else:
+                seen.add(matric)
+                report.rows.append(row)
+    return report
@@ -0,0 +1,105 @@
+# Write-Ahead Mutation Journal
+#
+# Every admin/bot mutation is appended here (fsync'd) BEFORE it touches the in-memory
+# caches; Database's replayer thread then writes the entries to Google Sheets in order
+# and acks them. Un-acked entries survive restarts and are replayed on the next run.
+#
+# File format (JSON lines): {"seq": 7, "ts": ..., "op": "status", "args": {...}} per entry,
+# {"ack": 7} once everything up to seq 7 is in Sheets. Emptied when nothing is pending.
+# Entries Sheets rejects for good (4xx) go to `<path>.dead` instead, with the error.
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.dead_path = path + ".dead"
+        self._lock = threading.Lock()
+        self._pending = deque() # Entries not yet in Sheets, oldest first
+        self._seq = 0
+        self.replayed = 0
+        self.last_replay = None # time.time() of the last ack
+        self.dead = 0           # Entries dead-lettered this run
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        entries, acked = [], 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Torn last line from a crash mid-write
+                if "ack" in record:
+                    acked = max(acked, record["ack"])
+                else:
+                    entries.append(record)
+                    self._seq = max(self._seq, record["seq"])
+        self._pending.extend(e for e in entries if e["seq"] > acked)
+        if self._pending:
+            logger.warning(f"⚠️ Journal: {len(self._pending)} mutations from the last run still to replay")
+
+    def _write(self, record, path=None):
+        with open(path or self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno()) # Durable before the caller is told it worked
+
+    def append(self, op, **args):
+        """Durably records one mutation. Returns the entry (args may be updated in memory)."""
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "ts": time.time(), "op": op, "args": args}
+            self._write(entry)
+            self._pending.append(entry)
+            return entry
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def ack(self, seq):
+        """Marks every entry up to `seq` as written to Sheets."""
+        with self._lock:
+            self.replayed += self._drop_through(seq)
+            self.last_replay = time.time()
+
+    def dead_letter(self, entry, error):
+        """Moves the oldest pending entry (rejected by Sheets) to the dead-letter file."""
+        with self._lock:
+            self._write({**entry, "error": error, "dead_at": time.time()}, self.dead_path)
+            self.dead += self._drop_through(entry["seq"])
+
+    def _drop_through(self, seq):
+        """[locked] Removes pending entries up to `seq` and records that on disk."""
+        done = 0
+        while self._pending and self._pending[0]["seq"] <= seq:
+            self._pending.popleft()
+            done += 1
+        if self._pending:
+            self._write({"ack": seq})
+        else:
+            open(self.path, "w").close() # All caught up: start the file afresh
+        return done
+
+    def __len__(self):
+        return len(self._pending)
+
+    def metrics(self):
+        with self._lock:
+            oldest = self._pending[0]["ts"] if self._pending else None
+            return {
+                "pending": len(self._pending),
+                "lag_s": round(time.time() - oldest, 1) if oldest else 0.0, # Age of the oldest unreplayed write
+                "replayed": self.replayed,
+                "dead_letters": self.dead,
+                "last_replay_s_ago": round(time.time() - self.last_replay, 1) if self.last_replay else None,
+            }
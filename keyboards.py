@@ -1,4 +1,4 @@
-from telegram import ReplyKeyboardMarkup
+from telegram import ReplyKeyboardMarkup, InlineKeyboardMarkup, InlineKeyboardButton
 import strings
 
 def get_main_menu(lang='EN'):
@@ -46,13 +46,14 @@ def get_admin_menu(lang='EN'):
     return ReplyKeyboardMarkup([
         [strings.get('BTN_ADMIN_MANAGE', lang)],
         [strings.get('BTN_ADMIN_BROADCAST', lang), strings.get('BTN_ADMIN_STATS', lang)],
+        [strings.get('BTN_ADMIN_REVIEW', lang)],
         [strings.get('BTN_ADMIN_EXIT', lang)]
     ], resize_keyboard=True, one_time_keyboard=False)
 
 def get_admin_manage_menu(lang='EN'):
     return ReplyKeyboardMarkup(
         [
-            [strings.get('BTN_ADMIN_DEL', lang)],
+            [strings.get('BTN_ADMIN_DEL', lang), strings.get('BTN_ADMIN_IMPORT', lang)],
             [strings.get('BTN_ADMIN_LIST', lang), strings.get('BTN_ADMIN_SEARCH', lang)],
             [strings.get('BTN_BACK', lang)]
         ],
@@ -65,6 +66,7 @@ def get_search_mode_menu(lang='EN'):
         [
             [strings.get('BTN_SEARCH_SIMPLE', lang)],
             [strings.get('BTN_SEARCH_DETAIL', lang)],
+            [strings.get('BTN_SEARCH_FUZZY', lang)],
             [strings.get('BTN_CANCEL', lang)]
         ],
         resize_keyboard=True,
@@ -93,3 +95,38 @@ def get_program_menu(lang='EN'):
         ],
         resize_keyboard=True
     )
+
+def get_pager(prefix, prev_cursor, next_cursor, lang='EN'):
+    """Inline Prev/Next row. callback_data = "<prefix>:prev|next:<cursor>". None if single page."""
+    buttons = []
+    if prev_cursor is not None:
+        buttons.append(InlineKeyboardButton(strings.get('BTN_PAGE_PREV', lang), callback_data=f"{prefix}:prev:{prev_cursor}"))
+    if next_cursor is not None:
+        buttons.append(InlineKeyboardButton(strings.get('BTN_PAGE_NEXT', lang), callback_data=f"{prefix}:next:{next_cursor}"))
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+REVIEW_MARKS = {"A": "✅", "R": "🚫"}
+
+def get_review_menu(items, marks, page, pages, lang='EN'):
+    """Inline review queue. items: [(queue position, matric, name)] on this page;
+    marks: {matric: "A" | "R"}. Tapping a member cycles ✅ -> 🚫 -> unmarked."""
+    rows = [
+        [InlineKeyboardButton(f"{REVIEW_MARKS.get(marks.get(mat), '▫️')} {name} ({mat})", callback_data=f"review:t:{pos}")]
+        for pos, mat, name in items
+    ]
+    rows.append([
+        InlineKeyboardButton(strings.get('BTN_REVIEW_PAGE_APPROVE', lang), callback_data="review:all:A"),
+        InlineKeyboardButton(strings.get('BTN_REVIEW_PAGE_REJECT', lang), callback_data="review:all:R"),
+    ])
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton(strings.get('BTN_PAGE_PREV', lang), callback_data=f"review:p:{page - 1}"))
+    if page < pages - 1:
+        nav.append(InlineKeyboardButton(strings.get('BTN_PAGE_NEXT', lang), callback_data=f"review:p:{page + 1}"))
+    if nav:
+        rows.append(nav)
+    rows.append([
+        InlineKeyboardButton(strings.get('BTN_REVIEW_COMMIT', lang).format(count=len(marks)), callback_data="review:commit"),
+        InlineKeyboardButton(strings.get('BTN_CANCEL', lang), callback_data="review:cancel"),
+    ])
+    return InlineKeyboardMarkup(rows)
@@ -0,0 +1,289 @@
+# End-to-End Webhook Load Generator
+#
+#   python loadtest.py --rate 50 --duration 30 --users 100
+#
+# Starts a local fake Telegram API (fake_telegram.py), spawns bot.py against it with
+# the fake Sheets backend, then replays synthetic conversations through POST /telegram
+# at a target rate and reports latency percentiles / error rates per conversation step.
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from aiohttp import ClientSession, ClientTimeout
+import fake_sheets
+import strings
+from fake_telegram import FakeTelegram
+
+logger = logging.getLogger(__name__)
+
+USER_ID_BASE = 500000000
+ADMIN_ID_BASE = 900000000
+
+# --- Update Payloads ---
+class UpdateFactory:
+    """Builds Bot API `Update` JSON the way Telegram posts it to a webhook."""
+
+    def __init__(self):
+        self.update_id = 0
+        self.message_id = 0
+
+    def message(self, user_id, text):
+        self.update_id += 1
+        self.message_id += 1
+        sender = {"id": user_id, "is_bot": False, "first_name": f"Load{user_id % 10000}", "language_code": "en"}
+        msg = {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private", "first_name": sender["first_name"]},
+            "from": sender,
+            "text": text,
+        }
+        if text.startswith("/"):
+            msg["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return {"update_id": self.update_id, "message": msg}
+
+# --- Conversations: [(step, text), ...] ---
+def verify_steps(row):
+    return [
+        ("start", "/start"),
+        ("check", strings.get('BTN_CHECK')),
+        ("matric", row[3]),
+        ("ic", row[9][-4:]),
+    ]
+
+def menu_steps():
+    return [
+        ("start", "/start"),
+        ("help", strings.get('BTN_HELP')),
+        ("settings", strings.get('BTN_SETTINGS')),
+        ("languages", strings.get('BTN_LANGUAGES')),
+        ("lang_ms", strings.get('BTN_LANG_MS')),
+        ("lang_en", strings.get('BTN_LANG_EN')),
+        ("back", strings.get('BTN_BACK')),
+    ]
+
+def admin_search_steps(query):
+    return [
+        ("admin", "/admin"),
+        ("manage", strings.get('BTN_ADMIN_MANAGE')),
+        ("search", strings.get('BTN_ADMIN_SEARCH')),
+        ("mode", strings.get('BTN_SEARCH_SIMPLE')),
+        ("query", query),
+        ("back", strings.get('BTN_BACK')),
+        ("exit", strings.get('BTN_ADMIN_EXIT')),
+    ]
+
+class Pacer:
+    """Spaces requests evenly so the whole run posts at `rate` updates/sec."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            self.next_at = max(self.next_at + self.interval, now)
+            delay = self.next_at - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+# --- Runner ---
+class LoadTest:
+    def __init__(self, args, api):
+        self.args = args
+        self.api = api
+        self.updates = UpdateFactory()
+        self.rng = random.Random(args.seed)
+        self.rows = fake_sheets.synthetic_registrations(args.rows, seed=args.seed)
+        self.queries = sorted({r[2].split()[-1] for r in self.rows[:500]})
+        self.attempts = defaultdict(int) # {"scenario.step": n}
+        self.latency = defaultdict(list) # {"scenario.step": [seconds]}
+        self.errors = defaultdict(lambda: defaultdict(int)) # {"scenario.step": {kind: n}}
+
+    def pick(self, user_id, is_admin):
+        if is_admin:
+            return "admin_search", admin_search_steps(self.rng.choice(self.queries))
+        roll = self.rng.random()
+        if roll < self.args.verify_share:
+            return "verify", verify_steps(self.rng.choice(self.rows))
+        return "menu", menu_steps()
+
+    async def post(self, session, pacer, user_id, scenario, step, text):
+        key = f"{scenario}.{step}"
+        await pacer.wait()
+        self.attempts[key] += 1
+        before = len(self.api.sent[user_id])
+        t0 = time.perf_counter()
+        try:
+            async with session.post(self.args.target + "/telegram", json=self.updates.message(user_id, text)) as resp:
+                await resp.read()
+                status = resp.status
+        except asyncio.TimeoutError:
+            self.errors[key]["timeout"] += 1
+            return
+        except Exception as e:
+            self.errors[key][type(e).__name__] += 1
+            return
+        self.latency[key].append(time.perf_counter() - t0)
+
+        if status != 200:
+            self.errors[key][f"http_{status}"] += 1
+        elif len(self.api.sent[user_id]) == before:
+            # Webhook returns after processing, so a reply must already be recorded
+            self.errors[key]["no_reply"] += 1
+
+    async def virtual_user(self, session, pacer, user_id, is_admin, deadline):
+        while time.monotonic() < deadline:
+            scenario, steps = self.pick(user_id, is_admin)
+            for step, text in steps:
+                if time.monotonic() >= deadline:
+                    return
+                await self.post(session, pacer, user_id, scenario, step, text)
+
+    async def run(self):
+        pacer = Pacer(self.args.rate)
+        deadline = time.monotonic() + self.args.duration
+        timeout = ClientTimeout(total=self.args.timeout)
+        started = time.monotonic()
+        async with ClientSession(timeout=timeout) as session:
+            tasks = [
+                self.virtual_user(session, pacer, USER_ID_BASE + i, False, deadline)
+                for i in range(self.args.users)
+            ] + [
+                self.virtual_user(session, pacer, ADMIN_ID_BASE + i, True, deadline)
+                for i in range(self.args.admins)
+            ]
+            await asyncio.gather(*tasks)
+        return time.monotonic() - started
+
+    def report(self, elapsed):
+        total = sum(self.attempts.values())
+        result = {"elapsed_s": round(elapsed, 2), "requests": total,
+                  "achieved_rate": round(total / elapsed, 2) if elapsed else 0, "steps": {}}
+
+        print(f"\n{'step':<24}{'count':>7}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for key in sorted(self.attempts):
+            samples = self.latency.get(key, [])
+            errors = sum(self.errors[key].values()) if key in self.errors else 0
+            row = {
+                "count": self.attempts[key],
+                "errors": dict(self.errors.get(key, {})),
+                "error_rate": round(errors / self.attempts[key], 4),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+                "max_ms": round(max(samples, default=0) * 1000, 2),
+            }
+            result["steps"][key] = row
+            print(f"{key:<24}{row['count']:>7}{row['error_rate'] * 100:>7.1f}%{row['p50_ms']:>10.1f}"
+                  f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+
+        methods = defaultdict(int)
+        for call in self.api.calls:
+            methods[call["method"]] += 1
+        result["bot_api_calls"] = dict(methods)
+        print(f"\n{total} updates in {elapsed:.1f}s ({result['achieved_rate']}/s, target {self.args.rate}/s)")
+        print("Bot API calls: " + ", ".join(f"{m}={n}" for m, n in sorted(methods.items())))
+        return result
+
+# --- Bot Process ---
+def spawn_bot(args, workdir):
+    env = dict(os.environ)
+    env.update({
+        "TELEGRAM_TOKEN": "123456:LOADTEST",
+        "TELEGRAM_API_URL": f"http://127.0.0.1:{args.api_port}",
+        "RENDER_EXTERNAL_URL": args.target,
+        "PORT": str(args.port),
+        "SHEETS_BACKEND": "fake",
+        "FAKE_SHEETS_ROWS": str(args.rows),
+        "FAKE_SHEETS_SEED": str(args.seed),
+        "FAKE_SHEETS_LATENCY_MS": str(args.sheets_latency_ms),
+        "ADMIN_IDS": ",".join(str(ADMIN_ID_BASE + i) for i in range(args.admins)),
+    })
+    bot_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+    log = open(os.path.join(workdir, "bot.log"), "w")
+    # cwd is a scratch dir so admin_actions.log from the run stays out of the repo
+    return subprocess.Popen([sys.executable, bot_py], cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+async def wait_ready(url, timeout):
+    deadline = time.monotonic() + timeout
+    async with ClientSession(timeout=ClientTimeout(total=2)) as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + "/ready") as resp:
+                    if resp.status == 200:
+                        return True
+            except Exception:
+                pass
+            await asyncio.sleep(0.25)
+    return False
+
+async def amain(args):
+    api = FakeTelegram(latency=args.api_latency_ms / 1000, retry_after_rate=args.api_retry_after_rate, seed=args.seed)
+    runner = await api.start(port=args.api_port)
+    bot = None
+    try:
+        if args.spawn:
+            workdir = tempfile.mkdtemp(prefix="stem-loadtest-")
+            print(f"🚀 Spawning bot ({args.rows:,} fake rows), logs in {workdir}/bot.log")
+            bot = spawn_bot(args, workdir)
+        if not await wait_ready(args.target, args.startup_timeout):
+            print(f"❌ Bot at {args.target} did not become healthy in {args.startup_timeout}s")
+            return 1
+
+        print(f"🔥 {args.users} users + {args.admins} admins @ {args.rate}/s for {args.duration}s")
+        test = LoadTest(args, api)
+        result = test.report(await test.run())
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"Saved results to {args.output}")
+        return 0
+    finally:
+        if bot:
+            bot.terminate()
+            bot.wait(timeout=10)
+        await runner.cleanup()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay synthetic Telegram updates against the bot's /telegram webhook.")
+    parser.add_argument("--rate", type=float, default=20, help="Target updates per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent student conversations")
+    parser.add_argument("--admins", type=int, default=2, help="Concurrent admin search conversations")
+    parser.add_argument("--verify-share", type=float, default=0.8, help="Share of user conversations that verify (rest: menus)")
+    parser.add_argument("--rows", type=int, default=10000, help="Fake Registrations rows (must match the bot's)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sheets-latency-ms", type=float, default=0, help="Latency for the spawned bot's fake Sheets")
+    parser.add_argument("--api-latency-ms", type=float, default=0, help="Latency of the fake Telegram API")
+    parser.add_argument("--api-retry-after-rate", type=float, default=0, help="Chance of a 429 from the fake Telegram API")
+    parser.add_argument("--port", type=int, default=10000, help="Port for the spawned bot")
+    parser.add_argument("--api-port", type=int, default=8081, help="Port for the fake Telegram API")
+    parser.add_argument("--target", default=None, help="Bot base URL (default http://127.0.0.1:PORT)")
+    parser.add_argument("--no-spawn", dest="spawn", action="store_false",
+                        help="Use an already running bot (pointed at --api-port via TELEGRAM_API_URL)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout (s)")
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--output", default="", help="Write JSON results here")
+    args = parser.parse_args(argv)
+    args.target = (args.target or f"http://127.0.0.1:{args.port}").rstrip("/")
+
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(amain(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# Registrations Sheet Layout (A-T) & Row Helpers
+from collections import namedtuple
+from datetime import datetime
+from gspread.utils import rowcol_to_a1
+
+# 0-based column indexes into a gspread row (see INSTALLATION.md)
+COL_TIMESTAMP = 0   # A
+COL_EMAIL = 1       # B
+COL_NAME = 2        # C
+COL_MATRIC = 3      # D
+COL_PROGRAM = 4     # E (Courses)
+COL_IC = 9          # J
+COL_MEMBER_ID = 15  # P
+COL_RECEIPT = 16    # Q (Receipt Proof)
+COL_STATUS = 17     # R
+
+ROW_WIDTH = 18      # A-R, the structure the bot writes
+
+# Column spans (inclusive) kept in the student cache: all that verify, stats, search and
+# the member lists read. Loads fetch only these ranges; the personal columns (phone,
+# emails, birthday, address...) are read per member on demand.
+HOT_SPANS = ((COL_TIMESTAMP, COL_PROGRAM), (COL_IC, COL_IC), (COL_MEMBER_ID, COL_STATUS)) # A-E, J, P-R
+
+# Column titles A-T (as filled by the registration form), used for exports
+HEADERS = [
+    "Timestamp", "Email", "Name", "Matric", "Program", "Semester", "Phone", "Personal Email",
+    "USAS Email", "IC", "Birthday", "Birth Place", "Address", "Entry Date", "Minute",
+    "Membership ID", "Receipt Proof", "Status", "Receipt URL", "Invoice No",
+]
+
+MEMBER_ID_PREFIX = "STEM(25/26)" # Default session prefix (system_config member_id_prefix): ID = prefix + (sheet row - 1)
+
+def hot_ranges(first_row=2):
+    """A1 ranges of HOT_SPANS from `first_row` down, e.g. ["A2:E", "J2:J", "P2:R"]."""
+    col = lambda idx: rowcol_to_a1(1, idx + 1)[:-1]
+    return [f"{col(lo)}{first_row}:{col(hi)}" for lo, hi in HOT_SPANS]
+
+def assemble_rows(value_ranges):
+    """Stitches the hot_ranges() results back into ROW_WIDTH rows, blanks elsewhere.
+    The Values API trims trailing empty cells and rows, so every span is padded."""
+    rows = [[""] * ROW_WIDTH for _ in range(max((len(v) for v in value_ranges), default=0))]
+    for (lo, hi), values in zip(HOT_SPANS, value_ranges):
+        for row, cells in zip(rows, values):
+            row[lo:lo + len(cells)] = cells[:hi - lo + 1]
+    return rows
+
+def project(row):
+    """Full row -> the cached (hot columns only) shape."""
+    out = [""] * ROW_WIDTH
+    for lo, hi in HOT_SPANS:
+        for idx in range(lo, min(hi + 1, len(row))):
+            out[idx] = str(row[idx])
+    return out
+
+# Normalized statuses
+APPROVED = "Approved"
+PENDING = "Pending"
+REJECTED = "Rejected"
+NOTIFIED = "✓" # Written by the registration poller: admins were told, no decision yet
+
+def cell(row, idx, default=""):
+    """Safe column access for short rows."""
+    return row[idx] if len(row) > idx else default
+
+def normalize_status(raw):
+    """Maps a raw Status cell to Approved / Pending / Rejected / ✓ (NOTIFIED).
+    Empty or unknown values are still waiting for an admin, so Pending."""
+    status = str(raw).strip().title()
+    if status in (APPROVED, REJECTED, NOTIFIED):
+        return status
+    return PENDING
+
+def decision(status):
+    """A normalized status as an admin decision: NOTIFIED rows still wait for one (Pending)."""
+    return PENDING if status == NOTIFIED else status
+
+def normalize_program(raw):
+    prog = str(raw).strip().upper()
+    return prog or "UNKNOWN"
+
+def parse_entry_date(raw):
+    """Parses the date part of a sheet timestamp. Returns a date or None.
+    Sheets gives 'YYYY-MM-DD ...' or, depending on locale, 'MM/DD/YYYY ...'."""
+    text = str(raw).strip().split(' ')[0]
+    if '-' in text:
+        formats = ("%Y-%m-%d",)
+    elif '/' in text:
+        formats = ("%m/%d/%Y", "%d/%m/%Y")
+    else:
+        return None
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def format_entry_date(raw):
+    """Timestamp cell -> 'DD/MM/YY' for member cards (the raw date part if unparseable)."""
+    parsed = parse_entry_date(raw)
+    return parsed.strftime("%d/%m/%y") if parsed else str(raw).strip().split(' ')[0]
+
+def member_id(prefix, row):
+    """Membership ID of the member at sheet `row`: prefix + (row - 1), e.g. STEM(25/26)0061."""
+    return f"{prefix}{(row - 1 if row else 0):04d}"
+
+def renumber(record, old_row, row):
+    """`record` (built at sheet `old_row`) with the ID of `row`, same session prefix."""
+    prefix = record.member_id[:len(record.member_id) - len(member_id("", old_row))]
+    return record._replace(member_id=member_id(prefix, row))
+
+# Everything the verify path needs, precomputed once per row on cache refresh.
+# status is APPROVED / PENDING / REJECTED / NOTIFIED, or None when the row stops before the IC column.
+VerifyRecord = namedtuple("VerifyRecord", "ic_last4 status member_id name matric program date")
+
+def verify_record(matric, row, idx, dates=None, prefix=MEMBER_ID_PREFIX):
+    """Builds the VerifyRecord of a cached matric -> (row, idx). `dates` memoizes format_entry_date
+    across a refresh (many rows share a registration day); `prefix` is the session's ID prefix."""
+    if len(row) <= COL_IC:
+        return VerifyRecord(None, None, None, row[COL_NAME], matric, "", "")
+    ic = str(row[COL_IC]).strip().replace(" ", "")
+    day = str(row[COL_TIMESTAMP]).strip().split(' ')[0]
+    if dates is None:
+        date = format_entry_date(day)
+    else:
+        date = dates.get(day)
+        if date is None:
+            date = dates[day] = format_entry_date(day)
+    return VerifyRecord(
+        ic[-4:] if len(ic) >= 4 else None,
+        normalize_status(cell(row, COL_STATUS)),
+        member_id(prefix, idx),
+        row[COL_NAME], matric, row[COL_PROGRAM], date,
+    )
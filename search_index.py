@@ -0,0 +1,218 @@
+# In-Memory Member Search Index
+#
+# Built from one student snapshot (see database.py). Single-member edits are applied in
+# place by the cache owner thread (update); a full reload makes the Database build a fresh
+# one. Queries never lock: every in-place change is an item assignment, an append or a
+# rebound array, so a concurrent query sees each member either before or after the edit.
+#   fuzzy(query)  -> ranked (score, row) matches on names: typos, word order, accents
+#   prefix(query) -> rows whose matric or name words start with what was typed (inline mode)
+import heapq
+from bisect import bisect_left, insort
+import re
+import unicodedata
+from collections import defaultdict
+
+FUZZY_MIN_SIMILARITY = 0.45  # Trigram Dice score for a query token to match a name token
+FUZZY_MAX_CANDIDATES = 2000  # Name signatures scored per query (best anchor tokens first)
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation: "Nur 'Aishah Bt. Zulkeflï" -> "nur aishah bt zulkefli"."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+def tokens(text):
+    return normalize(text).split()
+
+def _name(row):
+    return row[2] if len(row) > 2 else ""
+
+def _matric_key(row):
+    return normalize(row[3]).replace(" ", "") if len(row) > 3 else ""
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    def __init__(self, students, version=None):
+        """students: {matric: (row, idx)} snapshot."""
+        self.version = version
+        self.rows = []            # member id -> row (None once removed by update)
+        self.members = {}         # matric -> member id
+        self.vocab = []           # token id -> token
+        self.vocab_grams = []     # token id -> number of trigrams
+        self.gram_tokens = defaultdict(list) # trigram -> [token id, ...]
+        # Members with the same set of name tokens score identically, so fuzzy
+        # matching works on these "signatures" and expands to members at the end.
+        self.signatures = []      # signature id -> tuple of token ids
+        self.sig_members = []     # signature id -> [member id, ...]
+        self.postings = []        # token id -> [signature id, ...]
+        self._token_ids, self._sig_ids = {}, {}
+
+        for mat, (row, _) in students.items():
+            self._add(mat, row)
+
+        # Prefix lookups: sorted arrays searched with bisect
+        self.matric_keys = sorted((_matric_key(row), m) for m, row in enumerate(self.rows) if len(row) > 3)
+        self.sorted_vocab = sorted((tok, tid) for tid, tok in enumerate(self.vocab))
+
+    def _add(self, mat, row):
+        member = len(self.rows)
+        ids = tuple(sorted({self._token_id(tok) for tok in tokens(_name(row))}))
+        sig = self._sig_ids.get(ids)
+        if sig is None:
+            sig = len(self.signatures)
+            self.signatures.append(ids)
+            self.sig_members.append([])
+            for tid in ids:
+                self.postings[tid].append(sig)
+            self._sig_ids[ids] = sig
+        self.rows.append(row)
+        self.sig_members[sig].append(member)
+        self.members[mat] = member
+        return member
+
+    def update(self, changes, version):
+        """[cache owner] Applies one edit's {matric: row, or None if removed} in place and
+        moves the index on to `version`. A row keeping its name and matric (e.g. a status
+        change) is swapped in its slot; otherwise the old slot is emptied and a new one added."""
+        vocab_size, matric_keys = len(self.vocab), None
+        for mat, row in changes.items():
+            member = self.members.get(mat)
+            if member is not None:
+                old = self.rows[member]
+                if row is not None and _name(old) == _name(row) and _matric_key(old) == _matric_key(row):
+                    self.rows[member] = row
+                    continue
+                self.rows[member] = None # Queries skip empty slots
+                del self.members[mat]
+            if row is not None:
+                member = self._add(mat, row)
+                if len(row) > 3:
+                    matric_keys = matric_keys if matric_keys is not None else list(self.matric_keys)
+                    insort(matric_keys, (_matric_key(row), member))
+        if matric_keys is not None:
+            self.matric_keys = matric_keys # Rebound, never sorted in place under a query
+        if len(self.vocab) > vocab_size:
+            sorted_vocab = list(self.sorted_vocab)
+            for tid in range(vocab_size, len(self.vocab)):
+                insort(sorted_vocab, (self.vocab[tid], tid))
+            self.sorted_vocab = sorted_vocab
+        self.version = version
+
+    def _token_id(self, tok):
+        token_ids = self._token_ids
+        tid = token_ids.get(tok)
+        if tid is None:
+            tid = token_ids[tok] = len(self.vocab)
+            grams = trigrams(tok)
+            self.postings.append([])
+            self.vocab_grams.append(len(grams))
+            self.vocab.append(tok) # Last: a query only reaches `tid` through gram_tokens
+            for g in grams:
+                self.gram_tokens[g].append(tid)
+        return tid
+
+    def similar_tokens(self, token):
+        """{token id: Dice similarity} for vocabulary tokens close to `token`."""
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for g in grams:
+            for tid in self.gram_tokens.get(g, ()):
+                shared[tid] += 1
+        out = {}
+        for tid, count in shared.items():
+            score = 2 * count / (len(grams) + self.vocab_grams[tid])
+            if score >= FUZZY_MIN_SIMILARITY:
+                out[tid] = score
+        return out
+
+    def fuzzy(self, query, limit=50):
+        """Top `limit` (score 0-1, row) by name similarity. Each query word scores its best
+        matching name word (mean over the query, so word order doesn't matter); names
+        with fewer unmatched words rank slightly higher."""
+        query_tokens = list(dict.fromkeys(tokens(query)))
+        if not query_tokens:
+            return []
+        matches = [self.similar_tokens(q) for q in query_tokens]
+
+        # Anchor on the query word whose matches cover the fewest names, strongest tokens first
+        anchor = min(matches, key=lambda m: sum(len(self.postings[t]) for t in m))
+        candidates = set()
+        for tid in sorted(anchor, key=anchor.get, reverse=True):
+            candidates.update(self.postings[tid])
+            if len(candidates) >= FUZZY_MAX_CANDIDATES:
+                break
+
+        scored = []
+        for sig in candidates:
+            owned = self.signatures[sig]
+            total, used = 0.0, set()
+            for m in matches:
+                best, hit = 0.0, None
+                for t in owned:
+                    score = m.get(t, 0.0)
+                    if score > best:
+                        best, hit = score, t
+                total += best
+                used.add(hit)
+            used.discard(None)
+            scored.append((0.9 * total / len(matches) + 0.1 * len(used) / len(owned), sig))
+
+        results = []
+        for score, sig in heapq.nlargest(limit, scored):
+            for member in self.sig_members[sig]:
+                row = self.rows[member]
+                if row is None:
+                    continue
+                results.append((round(score, 3), row))
+                if len(results) >= limit:
+                    return results
+        return results
+
+    # --- Prefix Lookup ---
+    @staticmethod
+    def _range(keys, prefix):
+        """Yields entries of a sorted [(key, value)] list whose key starts with `prefix`."""
+        for i in range(bisect_left(keys, (prefix,)), len(keys)):
+            if not keys[i][0].startswith(prefix):
+                return
+            yield keys[i]
+
+    def prefix(self, query, limit=20):
+        """Rows whose matric starts with the query, then rows where every query word
+        starts a word of the name ("ahm zul" -> "Ahmad Zulaikha ..."). At most `limit`."""
+        words = tokens(query)
+        if not words:
+            return []
+        results, seen = [], set()
+
+        # 1. Matric prefix (single word, e.g. "I2406")
+        if len(words) == 1:
+            for _, member in self._range(self.matric_keys, words[0]):
+                if self.rows[member] is None:
+                    continue
+                seen.add(member)
+                results.append(self.rows[member])
+                if len(results) >= limit:
+                    return results
+
+        # 2. Name word prefixes: signatures holding a match for every query word
+        wanted = [{tid for _, tid in self._range(self.sorted_vocab, w)} for w in words]
+        if not all(wanted):
+            return results
+        anchor = min(wanted, key=len)
+        sigs = {sig for tid in anchor for sig in self.postings[tid]}
+        for sig in sorted(sigs):
+            owned = self.signatures[sig]
+            if all(any(t in w for t in owned) for w in wanted):
+                for member in self.sig_members[sig]:
+                    if member not in seen and self.rows[member] is not None:
+                        seen.add(member)
+                        results.append(self.rows[member])
+                        if len(results) >= limit:
+                            return results
+        return results
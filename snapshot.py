@@ -0,0 +1,56 @@
+# Immutable Versioned Cache Snapshots
+#
+# Every Database cache (students, admins, config, users) is published as a frozen
+# Snapshot and replaced by swapping one reference. Readers never lock: they grab the
+# current snapshot and get a consistent view for as long as they hold it.
+# Writers never touch a published snapshot; they run on ONE owner thread, build the
+# next version and publish it, so concurrent writes can't interleave.
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+Snapshot = namedtuple("Snapshot", "version data created_at")
+
+class SnapshotStore:
+    def __init__(self, **initial):
+        now = time.time()
+        self._current = MappingProxyType({name: Snapshot(0, data, now) for name, data in initial.items()})
+        self._owner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-owner")
+        self._owner_thread = None
+
+    # --- Reads (lock-free, any thread) ---
+    def get(self, name):
+        return self._current[name]
+
+    def data(self, name):
+        return self._current[name].data
+
+    def version(self, name):
+        return self._current[name].version
+
+    # --- Writes (owner thread only) ---
+    def _is_owner(self):
+        return threading.current_thread() is self._owner_thread
+
+    def publish(self, name, data):
+        """Swaps in the next version of one cache. Must run inside write()."""
+        if not self._is_owner():
+            raise RuntimeError(f"Snapshot '{name}' published outside the cache owner thread")
+        snap = Snapshot(self._current[name].version + 1, data, time.time())
+        current = dict(self._current)
+        current[name] = snap
+        self._current = MappingProxyType(current) # Single reference swap
+        return snap
+
+    def write(self, fn, *args, **kwargs):
+        """Runs fn on the owner thread (serializing every cache write) and returns its result.
+        Re-entrant: a write issued from inside another write runs inline."""
+        if self._is_owner():
+            return fn(*args, **kwargs)
+        return self._owner.submit(self._run, fn, args, kwargs).result()
+
+    def _run(self, fn, args, kwargs):
+        self._owner_thread = threading.current_thread()
+        return fn(*args, **kwargs)
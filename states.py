@@ -12,5 +12,6 @@
     SUPER_MENU,
     SUPER_ADMIN_MANAGE,
     SUPER_ADD_ID,
-    SUPER_DEL_ID
-) = range(13)
+    SUPER_DEL_ID,
+    IMPORT_FILE
+) = range(14)
@@ -0,0 +1,95 @@
+# Incremental Membership Statistics
+from collections import Counter, namedtuple
+from datetime import date, timedelta
+import schema
+
+class MemberStats:
+    """Running counters over the student cache.
+    Rows are added/removed one at a time (on cache diff or local write),
+    so reading the numbers never walks the membership list."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_status = Counter()
+        self.by_program = Counter()
+        self.by_day = Counter()   # {date: registrations}
+        self.by_week = Counter()  # {monday date: registrations}
+
+    @staticmethod
+    def _keys(row):
+        status = schema.normalize_status(schema.cell(row, schema.COL_STATUS))
+        prog = schema.normalize_program(schema.cell(row, schema.COL_PROGRAM))
+        day = schema.parse_entry_date(schema.cell(row, schema.COL_TIMESTAMP))
+        return status, prog, day
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key] # Keep counters small (no zero buckets)
+
+    def _apply(self, row, delta):
+        status, prog, day = self._keys(row)
+        self.total += delta
+        self._bump(self.by_status, status, delta)
+        self._bump(self.by_program, prog, delta)
+        if day:
+            self._bump(self.by_day, day, delta)
+            self._bump(self.by_week, day - timedelta(days=day.weekday()), delta)
+
+    def add(self, row):
+        self._apply(row, 1)
+
+    def remove(self, row):
+        self._apply(row, -1)
+
+    def replace(self, old_row, new_row):
+        if old_row is not None:
+            self.remove(old_row)
+        if new_row is not None:
+            self.add(new_row)
+
+    def sync(self, old_cache, new_cache):
+        """Applies only the rows that changed between two {matric: (row, idx)} caches."""
+        for mat, (row, _) in old_cache.items():
+            new = new_cache.get(mat)
+            if new is None or new[0] != row:
+                self.remove(row)
+        for mat, (row, _) in new_cache.items():
+            old = old_cache.get(mat)
+            if old is None or old[0] != row:
+                self.add(row)
+
+    def freeze(self):
+        """Copies the counters into an immutable StatsView (safe to share across threads)."""
+        return StatsView(self.total, Counter(self.by_status), Counter(self.by_program),
+                         Counter(self.by_day), Counter(self.by_week))
+
+    def summary(self, weeks=8, top_programs=6, today=None):
+        return summarize(self, weeks, top_programs, today)
+
+class StatsView(namedtuple("StatsView", "total by_status by_program by_day by_week")):
+    """Read-only copy of MemberStats published with each student snapshot. Never mutated."""
+    __slots__ = ()
+
+    def summary(self, weeks=8, top_programs=6, today=None):
+        return summarize(self, weeks, top_programs, today)
+
+def summarize(stats, weeks=8, top_programs=6, today=None):
+    """Cheap read: cost depends on `weeks`/`top_programs`, not on membership size."""
+    today = today or date.today()
+    this_week = today - timedelta(days=today.weekday())
+    trend = []
+    for i in range(weeks - 1, -1, -1):
+        week = this_week - timedelta(weeks=i)
+        trend.append((week, stats.by_week.get(week, 0)))
+
+    return {
+        "total": stats.total,
+        "verified": stats.by_status.get(schema.APPROVED, 0),
+        "pending": stats.by_status.get(schema.PENDING, 0) + stats.by_status.get(schema.NOTIFIED, 0), # Awaiting a decision
+        "rejected": stats.by_status.get(schema.REJECTED, 0),
+        "today": stats.by_day.get(today, 0),
+        "programs": stats.by_program.most_common(top_programs),
+        "weekly": trend,
+    }
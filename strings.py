@@ -31,6 +31,8 @@ STRINGS = {
         'ERR_INVALID_IC': "*Invalid IC!*\nPlease enter exactly 4 digits.",
         'ERR_DB_CONNECTION': "System Error: Database unavailable.",
         'ERR_NOT_FOUND': "*Not Found*\nMatric Number not in records.",
+        'ERR_NOT_READY': "⏳ The bot is still starting up. Please try again in a minute.",
+        'MSG_STALE_DATA': "\n\n_⏳ Records as of {age} ago (the member sheet is temporarily unreachable)._",
         'ERR_CANCEL': "Oh okay cancelled.",
         'ERR_ACCESS_DENIED': "*Access Denied*\nYou are not an admin.",
         
@@ -63,6 +65,10 @@ STRINGS = {
         'ADMIN_STATS': (
             "*Member Statistics*\n\n"
             "Total Members: *{total}*\n"
+            "Approved: *{verified}* | Pending: *{pending}* | Rejected: *{rejected}*\n"
+            "New Today: *{today}*\n\n"
+            "*Program Mix*\n{programs}\n\n"
+            "*Registrations per Week*\n{trend}\n\n"
             "Data synced with Google Sheets"
         ),
 
@@ -72,13 +78,24 @@ STRINGS = {
         'ADMIN_SAVING': "Saving...",
         'ADMIN_SEARCHING': "Searching...",
         'ADMIN_EXIT': "Exiting Admin Mode.",
-        'ADMIN_LIST_HEADER': "*Member List* (Top {limit}):\n\n{items}",
+        'ADMIN_LIST_HEADER': "*Member List* ({start}-{end} of {total}):\n\n{items}",
+        'BTN_PAGE_PREV': "⬅️ Prev",
+        'BTN_PAGE_NEXT': "Next ➡️",
         'ADMIN_LIST_EMPTY': "No members found.",
         'ADMIN_SEARCH_PROMPT': "Enter *Name*, *Matric*, or *IC* to search:",
         'ADMIN_SEARCH_MODE_PROMPT': "Select Search View:",
         'BTN_SEARCH_SIMPLE': "Simple View",
         'BTN_SEARCH_DETAIL': "Detailed View",
-        'ADMIN_SEARCH_RESULT': "*Search Results* ({mode}) for '{query}':\n\n{items}",
+        'BTN_SEARCH_FUZZY': "Fuzzy Name Search",
+        'ADMIN_SEARCH_RESULT': "*Search Results* ({mode}) for '{query}' ({start}-{end} of {total}):\n\n{items}",
+        'ADMIN_SEARCH_EXPIRED': "This search has expired. Please search again.",
+        'ADMIN_EXPORT_WORKING': "Preparing export...",
+        'ADMIN_EXPORT_DONE': "📦 Member export ({count} rows)",
+        'ADMIN_EXPORT_EMPTY': "No members match this export.",
+        'ADMIN_IMPORT_PROMPT': "*Import Members*\nSend a `.csv` file. The first row must be a header with at least *Name* and *Matric* (optional: Program, IC, Status, ...).",
+        'ADMIN_IMPORT_BAD_FILE': "Please send a `.csv` file (max 20 MB).",
+        'ADMIN_IMPORT_WORKING': "Importing...",
+        'ADMIN_IMPORT_REPORT': "*Import Finished*\nRows read: {total}\nAdded: {written}\nAlready registered: {existing}\nDuplicates in file: {file_dupes}\nInvalid: {invalid}",
         'ADMIN_SEARCH_EMPTY': "No matches found for '{query}'.",
         'ADMIN_SEARCH_EMPTY': "No matches found for '{query}'.",
         'BROADCAST_TITLE': "📢 *Admin Announcement*\n\n{msg}",
@@ -92,6 +109,17 @@ STRINGS = {
         'BTN_STATUS_REJECTED': "Rejected",
         'BTN_ADMIN_CHECK_PENDING': "Check Pending",
         'BTN_ADMIN_DEL': "Delete Member",
+        'BTN_ADMIN_IMPORT': "Import CSV",
+        'BTN_ADMIN_REVIEW': "Review Pending 📝",
+        'BTN_REVIEW_PAGE_APPROVE': "✅ Page",
+        'BTN_REVIEW_PAGE_REJECT': "🚫 Page",
+        'BTN_REVIEW_COMMIT': "💾 Save ({count})",
+        'ADMIN_REVIEW_HEADER': "*Review Pending* ({total} pending) - Page {page}/{pages}\nMarked: ✅ {approve} | 🚫 {reject}\nTap a member to cycle ✅ → 🚫 → none, then Save.",
+        'ADMIN_REVIEW_EMPTY': "No pending registrations. 🎉",
+        'ADMIN_REVIEW_DONE': "*Review Saved*\n✅ Approved: {approved}\n🚫 Rejected: {rejected}",
+        'ADMIN_REVIEW_NOTHING': "Nothing marked yet.",
+        'ADMIN_REVIEW_CANCELLED': "Review cancelled. Nothing was changed.",
+        'ADMIN_REVIEW_EXPIRED': "This review has expired. Open Review Pending again.",
         
         'BTN_SA_MAINTENANCE': "Maintenance Mode",
         'BTN_SA_ADMINS': "Manage Admins",
@@ -167,6 +195,8 @@ STRINGS = {
         'ERR_INVALID_IC': "*IC Tidak Sah!*\nSila masukkan tepat 4 digit.",
         'ERR_DB_CONNECTION': "Ralat Sistem: Pangkalan data tidak tersedia.",
         'ERR_NOT_FOUND': "*Tidak Dijumpai*\nNombor Matrik tiada dalam rekod.",
+        'ERR_NOT_READY': "⏳ Bot sedang dimulakan. Sila cuba semula sebentar lagi.",
+        'MSG_STALE_DATA': "\n\n_⏳ Rekod setakat {age} yang lalu (helaian ahli tidak dapat dicapai buat sementara)._",
         'ERR_CANCEL': "Oh okay dibatalkan.",
         'ERR_ACCESS_DENIED': "*Akses Ditolak*\nAnda bukan admin.",
         
@@ -199,6 +229,10 @@ STRINGS = {
         'ADMIN_STATS': (
             "*Statistik Ahli*\n\n"
             "Jumlah Ahli: {total}\n"
+            "Lulus: *{verified}* | Diproses: *{pending}* | Ditolak: *{rejected}*\n"
+            "Baru Hari Ini: *{today}*\n\n"
+            "*Pecahan Program*\n{programs}\n\n"
+            "*Pendaftaran Mingguan*\n{trend}\n\n"
             "Data disegerakkan dengan Google Sheets"
         ),
 
@@ -208,13 +242,24 @@ STRINGS = {
         'ADMIN_SAVING': "Menyimpan...",
         'ADMIN_SEARCHING': "Mencari...",
         'ADMIN_EXIT': "Keluar Mod Admin.",
-        'ADMIN_LIST_HEADER': "*Senarai Ahli* (Top {limit}):\n\n{items}",
+        'ADMIN_LIST_HEADER': "*Senarai Ahli* ({start}-{end} daripada {total}):\n\n{items}",
+        'BTN_PAGE_PREV': "⬅️ Sebelum",
+        'BTN_PAGE_NEXT': "Seterusnya ➡️",
         'ADMIN_LIST_EMPTY': "Tiada ahli dijumpai.",
         'ADMIN_SEARCH_PROMPT': "Masukkan *Nama*, *Matrik*, atau *IC* untuk carian:",
         'ADMIN_SEARCH_MODE_PROMPT': "Pilih Paparan Carian:",
         'BTN_SEARCH_SIMPLE': "Paparan Ringkas",
         'BTN_SEARCH_DETAIL': "Paparan Terperinci",
-        'ADMIN_SEARCH_RESULT': "*Keputusan Carian* ({mode}) untuk '{query}':\n\n{items}",
+        'BTN_SEARCH_FUZZY': "Carian Nama Anggaran",
+        'ADMIN_SEARCH_RESULT': "*Keputusan Carian* ({mode}) untuk '{query}' ({start}-{end} daripada {total}):\n\n{items}",
+        'ADMIN_SEARCH_EXPIRED': "Carian ini telah tamat tempoh. Sila cari semula.",
+        'ADMIN_EXPORT_WORKING': "Menyediakan eksport...",
+        'ADMIN_EXPORT_DONE': "📦 Eksport ahli ({count} baris)",
+        'ADMIN_EXPORT_EMPTY': "Tiada ahli sepadan untuk eksport ini.",
+        'ADMIN_IMPORT_PROMPT': "*Import Ahli*\nHantar fail `.csv`. Baris pertama mesti pengepala dengan sekurang-kurangnya *Name* dan *Matric* (pilihan: Program, IC, Status, ...).",
+        'ADMIN_IMPORT_BAD_FILE': "Sila hantar fail `.csv` (maksimum 20 MB).",
+        'ADMIN_IMPORT_WORKING': "Sedang import...",
+        'ADMIN_IMPORT_REPORT': "*Import Selesai*\nBaris dibaca: {total}\nDitambah: {written}\nSudah berdaftar: {existing}\nPendua dalam fail: {file_dupes}\nTidak sah: {invalid}",
         'ADMIN_SEARCH_EMPTY': "Tiada padanan untuk '{query}'.",
         'ADMIN_SEARCH_EMPTY': "Tiada padanan untuk '{query}'.",
         'BROADCAST_TITLE': "📢 *Pengumuman Admin*\n\n{msg}",
@@ -226,6 +271,17 @@ STRINGS = {
         'BTN_STATUS_REJECTED': "Ditolak",
         'BTN_ADMIN_ADD': "Tambah Ahli",
         'BTN_ADMIN_DEL': "Padam Ahli",
+        'BTN_ADMIN_IMPORT': "Import CSV",
+        'BTN_ADMIN_REVIEW': "Semak Permohonan 📝",
+        'BTN_REVIEW_PAGE_APPROVE': "✅ Halaman",
+        'BTN_REVIEW_PAGE_REJECT': "🚫 Halaman",
+        'BTN_REVIEW_COMMIT': "💾 Simpan ({count})",
+        'ADMIN_REVIEW_HEADER': "*Semak Permohonan* ({total} tertunda) - Halaman {page}/{pages}\nDitanda: ✅ {approve} | 🚫 {reject}\nTekan ahli untuk tukar ✅ → 🚫 → tiada, kemudian Simpan.",
+        'ADMIN_REVIEW_EMPTY': "Tiada permohonan tertunda. 🎉",
+        'ADMIN_REVIEW_DONE': "*Semakan Disimpan*\n✅ Diluluskan: {approved}\n🚫 Ditolak: {rejected}",
+        'ADMIN_REVIEW_NOTHING': "Belum ada yang ditanda.",
+        'ADMIN_REVIEW_CANCELLED': "Semakan dibatalkan. Tiada perubahan.",
+        'ADMIN_REVIEW_EXPIRED': "Semakan ini telah tamat tempoh. Buka Semak Permohonan semula.",
         'BTN_ADMIN_LIST': "Senarai Ahli",
         'BTN_ADMIN_SEARCH': "Cari Ahli",
         'BTN_ADMIN_CHECK_PENDING': "Semak Tertunda ⏳",
@@ -4,10 +4,11 @@ import strings
 import keyboards
 import states
 from database import db
+import workers
 import psutil
 import time
 import logging
-import asyncio
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +44,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     # Actually, asyncio.to_thread is good for Py3.9+.
     # Since we want speed, let's skip the forced refresh here and rely on the background job?
     # But we don't have a background job for config refresh yet (only check_registrations).
-    # Let's add loop.run_in_executor.
-    loop = asyncio.get_running_loop()
-    loop.run_in_executor(None, db.refresh_system_config)
+    # Let's refresh on the Sheets read pool (tracked, so failures get logged).
+    workers.sheets_read.spawn(db.refresh_system_config)
     
     lang = get_user_lang(context)
     status = "ON" if db.maintenance_mode else "OFF"
@@ -104,6 +104,64 @@ async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         await update.message.reply_text("❌ Error reading logs.")
     return states.SUPER_MENU
 
+# --- SESSION ROLLOVER (/rollover) ---
+ROLLOVER_USAGE = (
+    "*Session Rollover*\n"
+    "`/rollover <label> <new ID prefix> [YYYY-MM-DD]`\n\n"
+    "Moves last session's rows (all, or those registered before the date) to an `Archive <label>` tab "
+    "and starts new membership IDs with the new prefix.\n"
+    "Example: `/rollover 25/26 STEM(26/27) 2026-09-01`"
+)
+
+async def rollover(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Previews the rollover; the same command ending in `confirm` performs it."""
+    user = update.effective_user
+    if not db.is_superadmin(user.id):
+        return # Silent fail, like /superadmin
+    
+    args = list(context.args or [])
+    confirm = bool(args) and args[-1].lower() == "confirm"
+    if confirm:
+        args.pop()
+    before = None
+    if len(args) == 3:
+        try:
+            before = datetime.strptime(args[2], "%Y-%m-%d").date()
+        except ValueError:
+            args = []
+    if len(args) not in (2, 3):
+        await update.message.reply_text(ROLLOVER_USAGE, parse_mode="Markdown")
+        return
+    label, prefix = args[0], args[1]
+    
+    if not confirm:
+        count, error = await workers.sheets_read.run(db.archive_session, label, prefix, before, True)
+        if error:
+            await update.message.reply_text(f"❌ {error}")
+            return
+        await update.message.reply_text(
+            f"*Session Rollover (preview)*\n\n"
+            f"Rows to archive: *{count}* -> `Archive {label}`\n"
+            f"Archived IDs keep `{db.config['member_id_prefix']}`, new ones start with `{prefix}`.\n\n"
+            f"Send the same command ending with `confirm` to proceed.",
+            parse_mode="Markdown"
+        )
+        return
+    
+    loading = await update.message.reply_text("📦 Archiving session...")
+    count, error = await workers.sheets_write.run(db.archive_session, label, prefix, before)
+    if error and not count:
+        await loading.edit_text(f"❌ Rollover failed: {error}")
+        return
+    db.log_action(user.first_name, "ROLLOVER", f"{count} rows -> Archive {label}, new prefix {prefix}", role="SUPERADMIN")
+    if error: # Rows moved, but the archive index needs a manual fix
+        await loading.edit_text(f"⚠️ Archived {count} rows. {error}")
+        return
+    await loading.edit_text(
+        f"✅ Archived *{count}* rows to `Archive {label}`.\nNew membership IDs: `{prefix}0001`...",
+        parse_mode="Markdown"
+    )
+
 # --- ADMIN MANAGEMENT ---
 # --- MENUS ---
 def get_manage_admins_menu(lang='EN'):
@@ -0,0 +1,41 @@
+# Shared fixtures: a Database on the in-process fake Sheets backend (fake_sheets.py).
+# The journal replayer thread is not started; tests call replay_all() to flush writes.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_sheets
+from database import Database
+
+@pytest.fixture
+def make_db(tmp_path, monkeypatch):
+    """make_db(rows=50, client=None) -> loaded Database. Journal, snapshot and admin log in tmp_path."""
+    monkeypatch.chdir(tmp_path) # admin_actions.log
+    monkeypatch.setenv("JOURNAL_FILE", str(tmp_path / "mutations.journal"))
+    monkeypatch.setenv("STUDENT_SNAPSHOT_FILE", str(tmp_path / "student_snapshot.json.gz"))
+
+    def make(rows=50, client=None, load=True):
+        db = Database(client=client or fake_sheets.make_client(rows=rows, seed=1))
+        db.start_replayer = lambda: None # Writes stay in the journal until replay_all()
+        if load:
+            db.refresh_system_config(force=True)
+            db.refresh_student_cache(force=True)
+        return db
+    return make
+
+def replay_all(db):
+    """Writes every pending journal entry to the fake sheet, like the replayer thread."""
+    for _ in range(1000):
+        if not len(db.journal):
+            return
+        db._replay_next()
+    raise AssertionError(f"journal did not drain: {db.journal_metrics()}")
+
+def sheet(db, title="Registrations"):
+    return db.client.spreadsheet._sheets[title]
+
+def rejected(*args, **kwargs):
+    raise fake_sheets.api_error(400, "Invalid value", "INVALID_ARGUMENT")
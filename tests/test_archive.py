@@ -0,0 +1,50 @@
+import threading
+from datetime import date
+
+from conftest import replay_all, sheet
+
+def test_replayed_delete_during_rollover_loses_no_row(make_db, monkeypatch):
+    db = make_db(rows=30)
+    ws = sheet(db)
+    for row in ws._rows[16:]:
+        row[0] = "2025-09-02 08:00:00" # Rows 17+ belong to the new session
+    matrics = [r[3] for r in ws._rows[1:]]
+    first = matrics[0]
+    assert db.delete_member(first)[0] # Journaled, replayed while the rollover runs
+
+    replayer = []
+    read = ws.get_all_values
+    def read_then_replay():
+        rows = read()
+        # A replay landing between the read and the positional delete
+        replayer.append(threading.Thread(target=replay_all, args=(db,)))
+        replayer[0].start()
+        replayer[0].join(0.3)
+        return rows
+    monkeypatch.setattr(ws, "get_all_values", read_then_replay)
+
+    count, error = db.archive_session("24/25", "STEM(25/26)", date(2025, 9, 1))
+    replayer[0].join(5)
+
+    assert (count, error) == (15, None)
+    archived = [r[3] for r in db.client.spreadsheet._sheets["Archive 24/25"]._rows[1:]]
+    assert archived == matrics[:15]
+    assert [r[3] for r in ws._rows[1:]] == matrics[15:] # The delete found its row archived already
+
+def test_rollover_aborts_if_rows_moved(make_db, monkeypatch):
+    db = make_db(rows=30)
+    ws = sheet(db)
+    before = [list(r) for r in ws._rows]
+
+    read = ws.get_all_values
+    def read_then_edit():
+        rows = read()
+        del ws._rows[1] # Someone deletes a row in the sheet meanwhile
+        return rows
+    monkeypatch.setattr(ws, "get_all_values", read_then_edit)
+
+    count, error = db.archive_session("24/25", "STEM(25/26)")
+
+    assert count == 0 and error
+    assert ws._rows == before[:1] + before[2:] # Nothing else removed
+    assert "Archive 24/25" not in db.client.spreadsheet._sheets
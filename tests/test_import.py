@@ -0,0 +1,30 @@
+import threading
+
+import fake_sheets
+from conftest import replay_all, sheet
+
+def test_replayed_delete_during_bulk_add_keeps_rows_in_place(make_db, monkeypatch):
+    db = make_db(rows=20)
+    ws = sheet(db)
+    assert db.delete_member(list(db.student_cache)[3])[0] # Journaled, replayed during the import
+
+    rows = fake_sheets.synthetic_registrations(5, seed=9)
+    for i, row in enumerate(rows):
+        row[3] = f"IMP{i:03d}"
+
+    replayer = []
+    append = ws.append_rows
+    def append_then_replay(values, **kwargs):
+        resp = append(values, **kwargs)
+        # A replay landing between the append and its merge
+        replayer.append(threading.Thread(target=replay_all, args=(db,)))
+        replayer[-1].start()
+        replayer[-1].join(0.3)
+        return resp
+    monkeypatch.setattr(ws, "append_rows", append_then_replay)
+
+    assert db.bulk_add_members(rows, pace=0) == (5, None)
+    replayer[-1].join(5)
+
+    live = {r[3]: i for i, r in enumerate(ws._rows, start=1)}
+    assert {mat: db.sheet_row(mat) for mat in db.student_cache} == {mat: live[mat] for mat in db.student_cache}
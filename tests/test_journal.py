@@ -0,0 +1,34 @@
+from conftest import rejected, replay_all, sheet
+
+def test_dead_lettered_config_is_rolled_back(make_db, monkeypatch):
+    db = make_db()
+    assert not db.maintenance_mode
+    monkeypatch.setattr(db, "_replay_set_config", rejected)
+
+    assert db.set_maintenance(True)
+    assert db.maintenance_mode # Applied at once, before the replay
+    replay_all(db)
+
+    assert db.journal.dead == 1
+    assert not db.maintenance_mode
+
+def test_dead_lettered_admin_is_rolled_back(make_db, monkeypatch):
+    db = make_db()
+    monkeypatch.setattr(db, "_replay_add_admin", rejected)
+
+    assert db.add_admin(4242, "Someone", "SA:1")
+    assert db.is_admin(4242)
+    replay_all(db)
+
+    assert db.journal.dead == 1
+    assert not db.is_admin(4242)
+
+def test_replayed_config_reaches_the_sheet(make_db):
+    db = make_db()
+    db.set_maintenance(True)
+    replay_all(db)
+
+    rows = sheet(db, "system_config")._rows
+    assert ["maintenance_mode", "True"] in rows
+    db.refresh_system_config(force=True)
+    assert db.maintenance_mode
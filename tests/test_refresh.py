@@ -0,0 +1,71 @@
+import schema
+from conftest import replay_all, sheet
+
+def expire(db):
+    """Marks the cache due for a change probe (0 would mean "reload")."""
+    db.last_student_refresh = 1
+
+def probe(db):
+    expire(db)
+    loads = db.last_student_load
+    db._refresh_students(False)
+    return db.last_student_load != loads
+
+def test_own_writes_do_not_reload(make_db):
+    db = make_db()
+    first, second = list(db.student_cache)[:2]
+    db.set_statuses({first: schema.REJECTED})
+    db.delete_member(second)
+    replay_all(db)
+
+    assert not probe(db)
+    assert not probe(db)
+
+def test_outside_changes_reload(make_db):
+    db = make_db()
+    ws = sheet(db)
+    ws._rows[3][schema.COL_STATUS] = "Rejected" # Admin edits a status in the sheet
+    assert probe(db)
+    assert not probe(db)
+
+    ws._rows.append(list(ws._rows[5]))
+    ws._rows[-1][schema.COL_MATRIC] = "NEWREG1"
+    assert probe(db)
+    assert "NEWREG1" in db.student_cache
+
+def test_idle_poll_reads_nothing_but_the_probe(make_db):
+    db = make_db()
+    calls = db.client.spreadsheet.backend.calls
+    calls.clear()
+    for _ in range(5):
+        db.get_unprocessed_registrations() # Poller, within the TTL
+    assert sum(calls.values()) == 0
+
+    expire(db)
+    db.get_unprocessed_registrations() # Due: probes in the background
+    db._refresh_students(False)
+    assert calls["batch_get"] == 1
+
+def test_poller_sees_new_paid_registrations(make_db):
+    db = make_db()
+    ws = sheet(db)
+    row = list(ws._rows[5])
+    row[schema.COL_MATRIC], row[schema.COL_RECEIPT], row[schema.COL_STATUS] = "NEWREG2", "http://receipt", ""
+    ws._rows.append(row)
+    probe(db)
+
+    new = [reg for reg in db.get_unprocessed_registrations() if reg["data"][schema.COL_MATRIC] == "NEWREG2"]
+    assert [reg["row"] for reg in new] == [len(ws._rows)]
+
+    db.update_status(new[0]["row"], "✓", "NEWREG2")
+    assert not any(reg["data"][schema.COL_MATRIC] == "NEWREG2" for reg in db.get_unprocessed_registrations())
+
+def test_empty_sheet_reads_do_not_block_on_sheets(make_db):
+    db = make_db(rows=0, load=False)
+    sheet(db).add_rows(1) # Right after a full rollover: the header and one blank row
+    db.refresh_student_cache(force=True)
+    assert db.ready["students"] and not db.student_cache
+    calls = db.client.spreadsheet.backend.calls
+    calls.clear()
+    db.find_verification("I24000001")
+    assert sum(calls.values()) == 0
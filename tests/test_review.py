@@ -0,0 +1,15 @@
+import schema
+from conftest import replay_all
+
+def test_review_queue_includes_notified_rows(make_db):
+    db = make_db()
+    notified, pending, approved = list(db.student_cache)[:3]
+    db.set_statuses({notified: schema.NOTIFIED, pending: "", approved: schema.APPROVED})
+    replay_all(db)
+
+    queue = [mat for mat, _ in db.pending_members()]
+    assert notified in queue and pending in queue
+    assert approved not in queue
+
+    db.set_statuses({notified: schema.APPROVED})
+    assert notified not in [mat for mat, _ in db.pending_members()]
@@ -0,0 +1,31 @@
+import schema
+from search_index import SearchIndex
+
+def test_edits_update_the_index_in_place(make_db):
+    db = make_db(rows=200)
+    index = db.search_index()
+    mats = list(db.student_cache)
+    edited, gone = mats[10], mats[20]
+
+    db.set_statuses({edited: schema.REJECTED})
+    db.delete_member(gone)
+    db.add_member("Zulaikha Qistina Binti Hamdan", "NEW9001", "010101010101", "CS110")
+
+    assert db.search_index() is index # No rebuild
+    assert index.version == db.student_version
+    assert index.prefix(edited)[0][schema.COL_STATUS] == schema.REJECTED
+    assert index.prefix(gone) == []
+    assert [row[3] for row in index.prefix("NEW9001")] == ["NEW9001"]
+    assert index.fuzzy("zulaikha qistina hamdan", 1)[0][1][3] == "NEW9001"
+
+    # Same answers as an index built from scratch
+    fresh = SearchIndex(db.student_cache, db.student_version)
+    for query in ("ahmad", "nur aisyah", "siti binti", mats[30][:5]):
+        assert sorted(r[3] for _, r in index.fuzzy(query, 500)) == sorted(r[3] for _, r in fresh.fuzzy(query, 500))
+        assert sorted(r[3] for r in index.prefix(query, 500)) == sorted(r[3] for r in fresh.prefix(query, 500))
+
+def test_reload_rebuilds_the_index(make_db):
+    db = make_db()
+    index = db.search_index()
+    db.refresh_student_cache(force=True)
+    assert db.search_index() is not index
@@ -0,0 +1,31 @@
+import os
+import time
+
+import fake_sheets
+import schema
+
+def wait_for(path, timeout=5):
+    """The snapshot file is written in the background (workers.cpu)."""
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        assert time.time() < deadline, f"{path} never written"
+        time.sleep(0.02)
+
+def test_cold_start_from_snapshot_keeps_journaled_writes(make_db):
+    db = make_db()
+    wait_for(db.snapshot_path)
+    gone, rejected = list(db.student_cache)[:2]
+    assert db.delete_member(gone)[0]
+    db.set_statuses({rejected: schema.REJECTED})
+    assert len(db.journal) == 2 # Not in the sheet yet
+
+    # Restart while Sheets is down: the same journal, served from the snapshot file
+    down = fake_sheets.make_client(rows=0, error_rate=1.0)
+    db = make_db(client=down, load=False)
+    db.refresh_student_cache(force=True)
+
+    assert db.degraded and db.ready["students"]
+    assert gone not in db.student_cache
+    assert db.find_verification(gone) is None
+    row, _ = db.student_cache[rejected]
+    assert schema.normalize_status(schema.cell(row, schema.COL_STATUS)) == schema.REJECTED
@@ -0,0 +1,23 @@
+import schema
+from stats import MemberStats
+
+def row(status):
+    out = [""] * schema.ROW_WIDTH
+    out[schema.COL_TIMESTAMP], out[schema.COL_PROGRAM], out[schema.COL_STATUS] = "2025-09-01 08:00:00", "CS110", status
+    return out
+
+def test_normalize_status_keeps_notified_apart():
+    assert schema.normalize_status("✓") == schema.NOTIFIED
+    assert schema.normalize_status(" approved ") == schema.APPROVED
+    assert schema.normalize_status("rejected") == schema.REJECTED
+    assert schema.normalize_status("") == schema.PENDING
+    assert schema.normalize_status("whatever") == schema.PENDING
+    assert schema.decision(schema.NOTIFIED) == schema.PENDING
+
+def test_notified_rows_count_as_pending_not_verified():
+    stats = MemberStats()
+    for status in ("Approved", "✓", "✓", "", "Pending", "Rejected"):
+        stats.add(row(status))
+
+    summary = stats.freeze().summary()
+    assert (summary["total"], summary["verified"], summary["pending"], summary["rejected"]) == (6, 1, 4, 1)
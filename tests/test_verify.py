@@ -0,0 +1,24 @@
+import schema
+from conftest import replay_all, sheet
+
+def live_ids(db):
+    return {mat: db.find_verification(mat).member_id for mat in db.student_cache}
+
+def expected_ids(db):
+    prefix = db.config["member_id_prefix"]
+    return {r[3].strip().upper(): schema.member_id(prefix, i) for i, r in enumerate(sheet(db)._rows[1:], start=2)}
+
+def test_member_ids_follow_the_live_row_after_a_delete(make_db):
+    db = make_db(rows=40)
+    gone = list(db.student_cache)[5]
+    db.delete_member(gone)
+    replay_all(db)
+    assert db.add_member("New Member", "NEW001", "010101010101", "CS110")
+    replay_all(db)
+
+    ids = live_ids(db)
+    assert ids == expected_ids(db)
+    assert ids["NEW001"] == schema.member_id(db.config["member_id_prefix"], 41)
+
+    db.refresh_student_cache(force=True)
+    assert live_ids(db) == ids # A reload changes nothing
@@ -0,0 +1,110 @@
+# Dedicated Worker Pools
+#
+# Blocking work is split by workload class so one kind can't starve the others:
+#   sheets_read  - user-facing Sheets reads / cache refreshes
+#   sheets_write - appends, status updates, user logging (may back up, that's fine)
+#   cpu          - exports, index builds and other CPU-bound jobs
+# Sizes come from SHEETS_READ_WORKERS, SHEETS_WRITE_WORKERS and CPU_WORKERS.
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class Pool:
+    """A named, bounded thread pool that records queue depth and wait times.
+
+    await pool.run(fn, *args)   -> result (raises like fn)
+    pool.spawn(fn, *args)       -> fire-and-forget; the future is kept until done and
+                                   any exception is logged instead of silently dropped."""
+
+    def __init__(self, name, workers, samples=500):
+        self.name = name
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples) # Seconds from submit to start (recent jobs)
+        self._inflight = set() # Fire-and-forget futures we still owe a result check
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _wrap(self, fn, args, kwargs, submitted):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._waits.append(time.monotonic() - submitted)
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        return self._executor.submit(self._wrap, fn, args, kwargs, time.monotonic())
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def spawn(self, fn, *args, **kwargs):
+        future = self.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._inflight.add(future)
+        future.add_done_callback(lambda f: self._settle(f, fn))
+        return future
+
+    def _settle(self, future, fn):
+        with self._lock:
+            self._inflight.discard(future)
+        if not future.cancelled() and future.exception():
+            logger.error(f"❌ [{self.name}] Background {getattr(fn, '__name__', fn)} failed: {future.exception()!r}")
+
+    def metrics(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            snapshot = {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "inflight_background": len(self._inflight),
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+        pick = lambda pct: round(waits[min(len(waits) - 1, int(pct / 100 * len(waits)))] * 1000, 2) if waits else 0.0
+        snapshot.update(wait_p50_ms=pick(50), wait_p99_ms=pick(99), wait_max_ms=round(waits[-1] * 1000, 2) if waits else 0.0)
+        return snapshot
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+def _size(env_key, default):
+    try:
+        return max(1, int(os.getenv(env_key, default)))
+    except ValueError:
+        logger.error(f"⚠️ Error parsing {env_key}, using {default}")
+        return default
+
+sheets_read = Pool("sheets-read", _size("SHEETS_READ_WORKERS", 8))
+sheets_write = Pool("sheets-write", _size("SHEETS_WRITE_WORKERS", 2))
+cpu = Pool("cpu", _size("CPU_WORKERS", 2))
+
+POOLS = (sheets_read, sheets_write, cpu)
+
+def metrics():
+    """{pool name: metrics} for the /metrics endpoint."""
+    return {pool.name: pool.metrics() for pool in POOLS}